@@ -0,0 +1,88 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Compares bytes transferred and end-to-end time (request, decoding and
+JSON parsing) of identity and gzip encoded skale-admin payloads against
+a local stub server:
+
+    python -m benchmarks.api_compression --requests 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.stub_server import StubHandler, tcp_stub_server
+from tools.api_client import ApiClient
+
+
+PAYLOAD_SCHAINS = (10, 100, 1000, 10000)
+ROUTE = '/api/v1/health/schains'
+
+
+def compose_payload(schains_number):
+    checks = [
+        {
+            'name': f'test-schain-{i}',
+            'healthchecks': {
+                'data_dir': True, 'dkg': True, 'config': True,
+                'volume': True, 'firewall_rules': True, 'container': True,
+                'exit_code_ok': True, 'ima_container': True,
+                'rpc': i % 7 != 0, 'blocks': i % 11 != 0
+            }
+        }
+        for i in range(schains_number)
+    ]
+    return json.dumps({'status': 'ok', 'payload': checks}).encode()
+
+
+def measure(client, requests_number):
+    timings, wire_bytes = [], 0
+    for _ in range(requests_number):
+        start = time.perf_counter()
+        response = client.get('health', 'schains')
+        response.json()
+        timings.append(time.perf_counter() - start)
+        wire_bytes = response.raw.tell()
+    return wire_bytes, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"payload":>10}{"encoding":>10}{"wire bytes":>12}{"time":>12}')
+    with tcp_stub_server() as host:
+        for schains_number in PAYLOAD_SCHAINS:
+            payload = compose_payload(schains_number)
+            StubHandler.set_payload(ROUTE, payload)
+            for encoding in ('identity', 'gzip'):
+                client = ApiClient(host=host)
+                client.session.headers['Accept-Encoding'] = encoding
+                wire_bytes, median = measure(client, args.requests)
+                client.close()
+                print(f'{len(payload):>10}{encoding:>10}{wire_bytes:>12}'
+                      f'{median * 1000:>10.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Compares per-request latency of skale-admin TCP and unix socket transports
+against a local stub server:
+
+    python -m benchmarks.api_transport --requests 2000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.stub_server import tcp_stub_server, unix_stub_server
+from tools.api_client import ApiClient
+
+
+def measure(client, requests_number, warmup=50):
+    for _ in range(warmup):
+        client.get('node', 'info').content
+    latencies = []
+    for _ in range(requests_number):
+        start = time.perf_counter()
+        client.get('node', 'info').content
+        latencies.append(time.perf_counter() - start)
+    client.close()
+    return latencies
+
+
+def describe(latencies):
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)]
+    return {
+        'mean': statistics.mean(latencies),
+        'p50': percentile(0.5),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    results = {}
+    with tcp_stub_server() as host:
+        results['tcp'] = measure(ApiClient(host=host), args.requests)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, 'admin.sock')
+        with unix_stub_server(socket_path):
+            results['unix'] = measure(ApiClient(socket_path=socket_path),
+                                      args.requests)
+
+    print(f'{"transport":<10}' + ''.join(
+        f'{name:>10}' for name in ('mean', 'p50', 'p95', 'p99')))
+    for transport, latencies in results.items():
+        stats = describe(latencies)
+        print(f'{transport:<10}' + ''.join(
+            f'{value * 1000:>8.3f}ms' for value in stats.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Compares wall time and peak RSS of CLI process startup with lazily loaded
+subcommands against eager loading of every command module and heavy
+library, as CommandCollection used to do:
+
+    python -m benchmarks.cli_startup --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from main import LAZY_COMMANDS
+
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__))), 'main.py')
+HEAVY_MODULES = (
+    'docker', 'psutil', 'jinja2', 'requests', 'dateutil.parser', 'texttable',
+    'terminaltables', 'dotenv', 'readsettings', 'yaml'
+)
+COMMANDS = (
+    ('version',),
+    ('--help',),
+    ('logs', '--help'),
+    ('health', '--help'),
+    ('node', '--help'),
+    ('debug', 'api-stats')
+)
+EAGER_DRIVER = '''
+import importlib, runpy, sys
+for module in sys.argv[1].split(','):
+    importlib.import_module(module)
+sys.argv = sys.argv[2:]
+runpy.run_path(sys.argv[0], run_name='__main__')
+'''
+
+
+def eager_args(command):
+    modules = list(HEAVY_MODULES) + [
+        source.split(':')[0] for source in LAZY_COMMANDS.values()
+    ]
+    return ['-c', EAGER_DRIVER, ','.join(modules), MAIN_PATH, *command]
+
+
+def run(args, env):
+    """Returns wall time in seconds and peak RSS in MiB of the process"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, *args], env=env,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = status  # reaped above, Popen must not wait again
+    return time.perf_counter() - start, rusage.ru_maxrss / 1024
+
+
+def measure(args, env, runs):
+    results = [run(args, env) for _ in range(runs)]
+    return (statistics.median(r[0] for r in results),
+            statistics.median(r[1] for r in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f'{"command":<20}{"eager":>10}{"lazy":>10}'
+          f'{"eager RSS":>12}{"lazy RSS":>12}')
+    with tempfile.TemporaryDirectory() as home_dir:
+        env = dict(os.environ, HOME_DIR=home_dir)
+        for command in COMMANDS:
+            eager_time, eager_rss = measure(eager_args(command), env,
+                                            args.runs)
+            lazy_time, lazy_rss = measure([MAIN_PATH, *command], env,
+                                          args.runs)
+            print(f'{" ".join(command):<20}'
+                  f'{eager_time * 1000:>8.1f}ms{lazy_time * 1000:>8.1f}ms'
+                  f'{eager_rss:>9.1f}MiB{lazy_rss:>9.1f}MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Peak RSS of the CLI process and total time while a command prints a
+lot (like tar -zcvf of a large .skale): buffered
+subprocess.run (the previous run_cmd) vs the streaming executor.
+Each mode runs in a fresh interpreter so peaks don't mix:
+
+    python -m benchmarks.cmd_output --size-mb 200
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+
+WRITER = '''
+import sys
+line = b"./.skale/node_data/schains/" + b"x" * 90 + b"\\n"
+for _ in range({lines}):
+    sys.stdout.buffer.write(line)
+'''
+
+
+def run_mode(mode, lines):
+    from tools.executor import run_streaming
+    cmd = [sys.executable, '-c', WRITER.format(lines=lines)]
+    start = time.perf_counter()
+    if mode == 'buffered':
+        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    else:
+        run_streaming(cmd, log_output=False)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{elapsed:.3f} {rss:.1f}')
+
+
+def measure(mode, lines):
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.cmd_output',
+         '--mode', mode, '--lines', str(lines)],
+        check=True, stdout=subprocess.PIPE).stdout.decode()
+    elapsed, rss = out.split()
+    return float(elapsed), float(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size-mb', type=int, default=200)
+    parser.add_argument('--mode', choices=('buffered', 'streaming'))
+    parser.add_argument('--lines', type=int)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.lines)
+        return
+
+    lines = args.size_mb * 1000000 // 128
+    print(f'{"mode":>12}{"time, s":>10}{"peak RSS, MiB":>16}')
+    for mode in ('buffered', 'streaming'):
+        elapsed, rss = measure(mode, lines)
+        print(f'{mode:>12}{elapsed:>10.2f}{rss:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
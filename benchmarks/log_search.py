@@ -0,0 +1,101 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Time range queries over a generated CLI log: full scan vs the sparse
+index, the first index build is measured separately:
+
+    python -m benchmarks.log_search --size-mb 300
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tools.log_index import LogSearch, open_indexed
+from tools.log_reader import RecordFilter
+
+
+START = datetime(2021, 4, 1)
+QUERY_WINDOWS = ((0.5, 60), (0.9, 600), (0.99, 5))  # (position, seconds)
+
+
+def generate_log(path, size):
+    """Records 1 second apart with a traceback after every 50th"""
+    line = ' - core.node - INFO - ' + 'x' * 120 + '\n'
+    number = 0
+    with open(path, 'wb') as log_file:
+        while log_file.tell() < size:
+            chunk = []
+            for _ in range(1000):
+                timestamp = START + timedelta(seconds=number)
+                chunk.append(f'{timestamp:%Y-%m-%d %H:%M:%S},000{line}')
+                if number % 50 == 0:
+                    chunk.append('Traceback (most recent call last):\n')
+                number += 1
+            log_file.write(''.join(chunk).encode())
+    return number
+
+
+def full_scan(path, record_filter):
+    with open(path, 'rb') as log_file:
+        return sum(1 for _ in record_filter.filter(log_file))
+
+
+def indexed(path, index_dir, record_filter):
+    return sum(1 for _ in LogSearch(path, record_filter, index_dir))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size-mb', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'node-cli.log')
+        index_dir = os.path.join(tmp_dir, 'index')
+        records = generate_log(path, args.size_mb * 1024 * 1024)
+        (log_file, index), build_ms = timed(open_indexed, path, index_dir)
+        log_file.close()
+        print(f'Index build: {build_ms:.1f}ms, {len(index.entries)} entries')
+        print(f'{"query":>16}{"lines":>8}{"scan":>12}{"indexed":>12}')
+        for position, seconds in QUERY_WINDOWS:
+            since = START + timedelta(seconds=int(records * position))
+            record_filter = RecordFilter(
+                since=since, until=since + timedelta(seconds=seconds))
+            lines, scan_ms = timed(full_scan, path, record_filter)
+            record_filter = RecordFilter(
+                since=since, until=since + timedelta(seconds=seconds))
+            indexed_lines, indexed_ms = timed(indexed, path, index_dir,
+                                              record_filter)
+            assert indexed_lines == lines
+            print(f'{f"{position:.0%} +{seconds}s":>16}{lines:>8}'
+                  f'{scan_ms:>10.1f}ms{indexed_ms:>10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
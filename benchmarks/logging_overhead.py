@@ -0,0 +1,103 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Time spent by the logging thread per record: synchronous file handlers
+with every logger at DEBUG (the previous setup) vs the queued handler
+with per-logger levels. Records are a mix of own INFO/DEBUG ones and
+urllib3 DEBUG ones, as during skale-admin calls:
+
+    python -m benchmarks.logging_overhead --records 20000
+"""
+
+import argparse
+import logging
+import logging.handlers
+import os
+import tempfile
+import time
+
+from configs.cli_logger import LOG_LEVELS
+from tools import helper
+
+
+def emit(records):
+    core, urllib3 = logging.getLogger('core'), logging.getLogger('urllib3')
+    for number in range(records):
+        urllib3.debug('http://localhost:3009 "GET /api/v1/node/info '
+                      'HTTP/1.1" 200 %d', number)
+        if number % 2:
+            core.info('Node info: %s', {'status': 'ok', 'id': number})
+        else:
+            core.debug('Request %d done', number)
+
+
+def sync_setup(tmp_dir):
+    root = logging.getLogger()
+    for name, level in ((os.path.join(tmp_dir, 'sync.log'), logging.INFO),
+                        (os.path.join(tmp_dir, 'sync-debug.log'),
+                         logging.DEBUG)):
+        root.addHandler(helper.get_file_handler(name, level))
+
+
+def queued_setup(tmp_dir, log_format=None):
+    helper.LOG_FILEPATH = os.path.join(tmp_dir, 'queued.log')
+    helper.DEBUG_LOG_FILEPATH = os.path.join(tmp_dir, 'queued-debug.log')
+    helper.init_default_logger(log_format=log_format, levels=LOG_LEVELS)
+
+
+def teardown():
+    helper.stop_log_listener()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for name in LOG_LEVELS:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+def measure(setup, records, *args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        logging.getLogger().setLevel(logging.DEBUG)
+        setup(tmp_dir, *args)
+        start = time.perf_counter()
+        emit(records)
+        caller = time.perf_counter() - start
+        teardown()
+        total = time.perf_counter() - start
+    return caller, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+    calls = args.records * 2
+
+    print(f'{"setup":>16}{"caller, us/call":>18}{"with drain, us/call":>22}')
+    for name, setup, setup_args in (('sync', sync_setup, ()),
+                                    ('queued', queued_setup, ()),
+                                    ('queued json', queued_setup, ('json',))):
+        caller, total = measure(setup, args.records, *setup_args)
+        print(f'{name:>16}{caller / calls * 1e6:>18.2f}'
+              f'{total / calls * 1e6:>22.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Compares latency of CLI commands run in a fresh process (cold) and
+forwarded to the resident process (warm):
+
+    python -m benchmarks.resident --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.cli_startup import MAIN_PATH
+from configs import RESIDENT_ENV_VAR
+
+
+COMMANDS = (
+    ('version',),
+    ('logs', '--help'),
+    ('node', '--help'),
+    ('debug', 'api-stats')
+)
+
+
+def run(command, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAIN_PATH, *command], env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   check=True)
+    return time.perf_counter() - start
+
+
+def measure(command, env, runs):
+    return statistics.median(run(command, env) for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"command":<20}{"cold":>10}{"warm":>10}')
+    with tempfile.TemporaryDirectory() as home_dir:
+        cold_env = dict(os.environ, HOME_DIR=home_dir)
+        cold_env.pop(RESIDENT_ENV_VAR, None)
+        warm_env = dict(cold_env, **{RESIDENT_ENV_VAR: '1'})
+        run(('version',), warm_env)  # spawns the resident process
+        try:
+            for command in COMMANDS:
+                cold = measure(command, cold_env, args.runs)
+                warm = measure(command, warm_env, args.runs)
+                print(f'{" ".join(command):<20}'
+                      f'{cold * 1000:>8.1f}ms{warm * 1000:>8.1f}ms')
+        finally:
+            run(('resident', 'stop'), cold_env)
+
+
+if __name__ == '__main__':
+    main()
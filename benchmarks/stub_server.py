@@ -0,0 +1,110 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Minimal skale-admin imitation used by benchmarks"""
+
+import gzip
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are sent in one write, otherwise delayed ACK stalls
+    # every keep-alive TCP response for ~40ms
+    wbufsize = -1
+    payloads = {}
+    gzip_payloads = {}
+
+    @classmethod
+    def set_payload(cls, path, body):
+        """Payloads are compressed in advance, as static files would be"""
+        cls.payloads[path] = body
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as gzip_file:
+            gzip_file.write(body)
+        cls.gzip_payloads[path] = buffer.getvalue()
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        body = self.payloads.get(path)
+        if body is None:
+            body = json.dumps({'status': 'ok', 'payload': {}}).encode()
+        encoding = None
+        if path in self.gzip_payloads and \
+                'gzip' in self.headers.get('Accept-Encoding', ''):
+            body, encoding = self.gzip_payloads[path], 'gzip'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TCPStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def get_request(self):
+        conn, address = super().get_request()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        return conn, address
+
+
+class UnixStubServer(socketserver.ThreadingMixIn,
+                     socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@contextmanager
+def run_server(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def tcp_stub_server(handler=StubHandler):
+    with run_server(TCPStubServer(('127.0.0.1', 0), handler)) as server:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+
+
+@contextmanager
+def unix_stub_server(socket_path, handler=StubHandler):
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    with run_server(UnixStubServer(socket_path, handler)):
+        try:
+            yield socket_path
+        finally:
+            os.remove(socket_path)
@@ -0,0 +1,45 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import sys
+
+import click
+
+from configs import BATCH_MAX_WORKERS
+from core.batch import run_batch
+from tools.texts import Texts
+
+
+TEXTS = Texts()['batch']
+
+
+@click.group()
+def batch_cli():
+    pass
+
+
+@batch_cli.command('batch', help=TEXTS['help'])
+@click.argument('commands_file', type=click.File('r'), default='-')
+@click.option('--workers', '-w', type=click.IntRange(1, 32),
+              default=BATCH_MAX_WORKERS, show_default=True,
+              help=TEXTS['workers'])
+@click.pass_context
+def batch(ctx, commands_file, workers):
+    exit_code = run_batch(ctx.find_root().command, commands_file, workers)
+    if exit_code:
+        sys.exit(exit_code)
@@ -0,0 +1,56 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import click
+
+from core.debug import profile_command, show_api_stats
+from tools.texts import Texts
+
+
+TEXTS = Texts()['debug']
+
+
+@click.group()
+def debug_cli():
+    pass
+
+
+@debug_cli.group('debug', help=TEXTS['help'])
+def debug():
+    pass
+
+
+@debug.command('api-stats', help=TEXTS['api_stats']['help'])
+@click.option('--window', '-w', type=click.IntRange(min=1), default=60,
+              show_default=True, help=TEXTS['api_stats']['window'])
+@click.option('--format', '-f', type=click.Choice(['json', 'text']))
+def api_stats(window, format):
+    show_api_stats(window, format)
+
+
+@debug.command('profile', help=TEXTS['profile']['help'],
+               context_settings={'ignore_unknown_options': True})
+@click.option('--top', '-n', type=click.IntRange(min=1), default=20,
+              show_default=True, help=TEXTS['profile']['top'])
+@click.option('--sort', '-s', type=click.Choice(['tottime', 'cumulative']),
+              default='tottime', show_default=True,
+              help=TEXTS['profile']['sort'])
+@click.argument('command', nargs=-1, required=True, type=click.UNPROCESSED)
+def profile(top, sort, command):
+    profile_command(command, top, sort)
@@ -17,12 +17,35 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import re
 import sys
 
 import click
 from tools.helper import download_dump
-from configs.cli_logger import LOG_FILEPATH, DEBUG_LOG_FILEPATH
+from configs import DOWNLOAD_MAX_SEGMENTS
+from core.logs import show_cli_logs
 from tools.exit_codes import CLIExitCodes
+from tools.log_reader import LEVELS, parse_time
+
+
+class TimeType(click.ParamType):
+    name = 'time'
+
+    def convert(self, value, param, ctx):
+        try:
+            return parse_time(value)
+        except ValueError as err:
+            self.fail(str(err), param, ctx)
+
+
+TIME_TYPE = TimeType()
+
+
+def validate_pattern(ctx, param, value):
+    try:
+        return value and re.compile(value).pattern
+    except re.error as err:
+        raise click.BadParameter(f'invalid regular expression: {err}')
 
 
 @click.group()
@@ -37,10 +60,21 @@ def logs():
 
 @logs.command(help="Fetch the logs of the node-cli")
 @click.option('--debug', is_flag=True)
-def cli(debug):
-    filepath = DEBUG_LOG_FILEPATH if debug else LOG_FILEPATH
-    with open(filepath, 'r') as fin:
-        print(fin.read())
+@click.option('--lines', '-n', type=click.IntRange(min=0),
+              help='Show only the last N lines of the output')
+@click.option('--since', type=TIME_TYPE,
+              help='Show records since the time: "2021-04-01 10:00:00", '
+                   '2021-04-01 or relative 30s, 15m, 2h, 1d')
+@click.option('--until', type=TIME_TYPE,
+              help='Show records until the time, same formats as --since')
+@click.option('--level', '-l', type=click.Choice(LEVELS, case_sensitive=False),
+              help='Show records of this level and above')
+@click.option('--grep', '-g', 'pattern', callback=validate_pattern,
+              help='Show records matching the regular expression')
+@click.option('--follow', '-f', 'follow_logs', is_flag=True,
+              help='Keep printing new records, Ctrl-C to stop')
+def cli(debug, lines, since, until, level, pattern, follow_logs):
+    show_cli_logs(debug, lines, since, until, level, pattern, follow_logs)
 
 
 @logs.command(help="Dump all logs from the connected node")
@@ -50,9 +84,16 @@ def cli(debug):
     help='Dump logs only from specified container',
     default=None
 )
+@click.option(
+    '--segments',
+    '-s',
+    type=click.IntRange(1, DOWNLOAD_MAX_SEGMENTS),
+    default=1,
+    help='Download dump in several parallel ranged requests'
+)
 @click.argument('path')
-def dump(container, path):
-    res = download_dump(path, container)
+def dump(container, segments, path):
+    res = download_dump(path, container, segments=segments)
     if res:
         print(f'File {res} downloaded')
     else:
@@ -26,12 +26,13 @@ from core.node import (get_node_signature, init, restore,
                        register_node as register, update, backup, set_maintenance_mode_on,
                        set_maintenance_mode_off, turn_off, turn_on, get_node_info,
                        set_domain_name)
-from configs import DEFAULT_NODE_BASE_PORT
-from tools.helper import session_config, abort_if_false, safe_load_texts
+from core.status import show_status
+from configs import DEFAULT_NODE_BASE_PORT, STATUS_CALL_DEADLINE
+from tools.helper import session_config, abort_if_false
+from tools.texts import Texts
 
 
-config = session_config()
-TEXTS = safe_load_texts()
+TEXTS = Texts()
 
 
 class UrlType(click.ParamType):
@@ -81,6 +82,25 @@ def node_info(format):
     get_node_info(config, format)
 
 
+def validate_deadline(ctx, param, value):
+    if value <= 0:
+        raise click.BadParameter('should be greater than 0')
+    return value
+
+
+@node.command('status', help="Combined report from all node info routes")
+@click.option('--format', '-f', type=click.Choice(['json', 'text']))
+@click.option(
+    '--deadline',
+    default=STATUS_CALL_DEADLINE,
+    type=float,
+    callback=validate_deadline,
+    help='Deadline for each API call in seconds'
+)
+def node_status(format, deadline):
+    show_status(format, deadline)
+
+
 @node.command('register', help="Register current node in the SKALE Manager")
 @click.option(
     '--name', '-n',
@@ -136,8 +156,13 @@ def register_node(name, ip, port, domain, gas_limit, gas_price, skip_dry_run):
     is_flag=True,
     help="Dry run node init (don't setup containers)"
 )
-def init_node(env_file, dry_run):
-    init(env_file, dry_run)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Skip the steps completed by the failed init'
+)
+def init_node(env_file, dry_run, resume):
+    init(env_file, dry_run, resume=resume)
 
 
 @node.command('update', help='Update node from .env file')
@@ -146,12 +171,23 @@ def init_node(env_file, dry_run):
     help='Run all sChains in the snapshot download mode',
     is_flag=True
 )
+@click.option(
+    '--prefetch-only',
+    help='Only prepare configs, images and files, keep the node running',
+    is_flag=True
+)
+@click.option(
+    '--resume',
+    help='Skip the steps completed by the failed or prefetch-only update',
+    is_flag=True
+)
 @click.option('--yes', is_flag=True, callback=abort_if_false,
               expose_value=False,
               prompt='Are you sure you want to update SKALE node software?')
 @click.argument('env_file')
-def update_node(sync_schains, env_file):
-    update(env_file, sync_schains)
+def update_node(sync_schains, prefetch_only, resume, env_file):
+    update(env_file, sync_schains, prefetch_only=prefetch_only,
+           resume=resume)
 
 
 @node.command('signature', help='Get node signature for given validator id')
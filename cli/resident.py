@@ -0,0 +1,57 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import click
+
+from configs import RESIDENT_IDLE_TIMEOUT
+from core.resident import serve, show_status, stop
+from tools.texts import Texts
+
+
+TEXTS = Texts()['resident']
+
+
+@click.group()
+def resident_cli():
+    pass
+
+
+@resident_cli.group('resident', help=TEXTS['help'])
+def resident():
+    pass
+
+
+@resident.command('serve', help=TEXTS['serve']['help'])
+@click.option('--idle-timeout', type=click.IntRange(min=1),
+              default=RESIDENT_IDLE_TIMEOUT, show_default=True,
+              help=TEXTS['serve']['idle_timeout'])
+@click.pass_context
+def resident_serve(ctx, idle_timeout):
+    serve(ctx.find_root().command, idle_timeout)
+
+
+@resident.command('stop', help=TEXTS['stop']['help'])
+def resident_stop():
+    stop()
+
+
+@resident.command('status', help=TEXTS['status']['help'])
+@click.option('--format', '-f', type=click.Choice(['json', 'text']))
+def resident_status(format):
+    show_status(format)
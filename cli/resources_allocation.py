@@ -22,10 +22,10 @@ import click
 
 from core.resources import (get_resource_allocation_info,
                             generate_resource_allocation_config)
-from tools.helper import session_config, abort_if_false, safe_load_texts
+from tools.helper import abort_if_false
+from tools.texts import Texts
 
-config = session_config()
-TEXTS = safe_load_texts()
+TEXTS = Texts()
 
 
 @click.group()
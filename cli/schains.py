@@ -20,6 +20,7 @@
 import click
 
 from tools.helper import abort_if_false
+from tools.json_stream import compile_path
 from core.schains import (
     describe,
     get_schain_firewall_rules,
@@ -30,6 +31,16 @@ from core.schains import (
 )
 
 
+class JsonPathType(click.ParamType):
+    name = 'path'
+
+    def convert(self, value, param, ctx):
+        try:
+            return compile_path(value)
+        except ValueError as err:
+            self.fail(str(err), param, ctx)
+
+
 @click.group()
 def schains_cli() -> None:
     pass
@@ -57,8 +68,13 @@ def dkg(all_: bool) -> None:
 
 @schains.command('config', help="sChain config")
 @click.argument('schain_name')
-def get_schain_config(schain_name: str) -> None:
-    show_config(schain_name)
+@click.option(
+    '--path', '-p', 'selector',
+    type=JsonPathType(),
+    help='Print only values matching the path, e.g. skaleConfig.sChain.nodes[*].ip'
+)
+def get_schain_config(schain_name: str, selector: tuple) -> None:
+    show_config(schain_name, selector)
 
 
 @schains.command('show-rules', help='Show schain firewall rules')
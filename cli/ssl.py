@@ -18,14 +18,14 @@
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import click
-from terminaltables import SingleTable
 
+from core.print_formatters import print_ssl_status
 from tools.exit_codes import CLIExitCodes
-from tools.helper import (get_request, safe_load_texts, upload_certs,
-                          error_exit)
+from tools.helper import get_request, upload_certs, error_exit
+from tools.texts import Texts
 
 
-TEXTS = safe_load_texts()
+TEXTS = Texts()
 BLUEPRINT_NAME = 'ssl'
 
 
@@ -46,16 +46,7 @@ def status():
         method='status'
     )
     if status == 'ok':
-        if payload.get('is_empty'):
-            print(TEXTS['ssl']['no_cert'])
-        else:
-            table_data = [
-                ['Issued to', payload['issued_to']],
-                ['Expiration date', payload['expiration_date']]
-            ]
-            table = SingleTable(table_data)
-            print('SSL certificates status:')
-            print(table.table)
+        print_ssl_status(payload)
     else:
         error_exit(payload, exit_code=CLIExitCodes.BAD_API_RESPONSE)
 
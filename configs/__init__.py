@@ -61,14 +61,14 @@ else:
     PARDIR = os.path.join(sys._MEIPASS, 'data')
 
 TEXT_FILE = os.path.join(PARDIR, 'text.yml')
+TEXT_CACHE_FILE = os.path.join(PARDIR, 'text.yml.cache')
 DATAFILES_FOLDER = os.path.join(PARDIR, 'datafiles')
 
 THIRDPARTY_FOLDER_PATH = os.path.join(DATAFILES_FOLDER, 'third_party')
 
-INSTALL_SCRIPT = os.path.join(DATAFILES_FOLDER, 'install.sh')
+HELPER_SCRIPT = os.path.join(DATAFILES_FOLDER, 'helper.sh')
 BACKUP_INSTALL_SCRIPT = os.path.join(DATAFILES_FOLDER, 'backup-install.sh')
 UNINSTALL_SCRIPT = os.path.join(DATAFILES_FOLDER, 'uninstall.sh')
-UPDATE_SCRIPT = os.path.join(DATAFILES_FOLDER, 'update.sh')
 TURN_OFF_SCRIPT = os.path.join(DATAFILES_FOLDER, 'turn-off.sh')
 TURN_ON_SCRIPT = os.path.join(DATAFILES_FOLDER, 'turn-on.sh')
 REDIS_DATA_PATH = os.path.join(NODE_DATA_PATH, 'redis-data')
@@ -81,6 +81,42 @@ LONG_LINE = '-' * 50
 ADMIN_PORT = 3007
 ADMIN_HOST = 'localhost'
 DEFAULT_URL_SCHEME = 'http://'
+ADMIN_SOCKET_PATH = os.getenv('ADMIN_SOCKET_PATH') or \
+    os.path.join(NODE_DATA_PATH, 'skale-admin.sock')
+
+API_RETRIES = 3
+API_BACKOFF_FACTOR = 0.3
+API_POOL_MAXSIZE = 10
+API_CACHE_PATH = os.path.join(SKALE_DIR, '.skale-cli-cache')
+
+STATUS_CALL_DEADLINE = 10
+
+ADMIN_PROBE_TIMEOUT = 0.05
+CIRCUIT_STATE_FILEPATH = os.path.join(SKALE_DIR, '.skale-cli-circuit')
+CIRCUIT_OPEN_PERIOD = 5
+
+RESIDENT_ENV_VAR = 'SKALE_CLI_RESIDENT'
+RESIDENT_SOCKET_PATH = os.path.join(SKALE_DIR, '.skale-cli-resident.sock')
+RESIDENT_IDLE_TIMEOUT = 15 * 60
+RESIDENT_SPAWN_TIMEOUT = 10
+
+BATCH_MAX_WORKERS = 8
+
+PROFILE_ENV_VAR = 'SKALE_CLI_PROFILE'
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_ATTEMPTS = 5
+DOWNLOAD_MAX_SEGMENTS = 8
+DOWNLOAD_PROGRESS_INTERVAL = 0.5
+
+CMD_OUTPUT_TAIL_LINES = 200
+CMD_OUTPUT_LINE_LIMIT = 64 * 1024
+CMD_TERMINATE_TIMEOUT = 10
+SHORT_CMD_TIMEOUT = 60
+SHOW_CMD_OUTPUT_ENV_VAR = 'SKALE_CLI_SHOW_CMD_OUTPUT'
+
+STEPS_MAX_WORKERS = 6
+FILE_DOWNLOAD_TIMEOUT = 60
 
 DEFAULT_NODE_BASE_PORT = 10000
 
@@ -92,10 +128,42 @@ MYSQL_BACKUP_PATH = os.path.join(MYSQL_BACKUP_FOLDER, MYSQL_BACKUP_FILE_NAME)
 MYSQL_BACKUP_CONTAINER_PATH = os.path.join(MYSQL_BACKUP_CONTAINER_FOLDER,
                                            MYSQL_BACKUP_FILE_NAME)
 
-TM_INIT_TIMEOUT = 20
-RESTORE_SLEEP_TIMEOUT = 20
-
-MANAGER_CONTRACTS_FILEPATH = os.path.join(CONTRACTS_PATH, 'manager.json')
-IMA_CONTRACTS_FILEPATH = os.path.join(CONTRACTS_PATH, 'ima.json')
+MYSQL_CONTAINER_NAME = 'skale_mysql'
+MYSQL_SERVICE = 'mysql'
+# docker-compose services, the same as BASE_SERVICES in datafiles/helper.sh
+BASE_SERVICES = (
+    'transaction-manager', 'skale-admin', 'skale-api', MYSQL_SERVICE, 'sla',
+    'bounty', 'nginx', 'watchdog', 'filebeat'
+)
+NODE_READY_TIMEOUT = 300
+
+DYNAMIC_CONTAINER_PREFIXES = ('skale_schain_', 'skale_ima_')
+CONTAINER_STOP_TIMEOUT = 40
+TEARDOWN_MAX_WORKERS = 8
+TEARDOWN_WORKERS_ENV_VAR = 'SKALE_CLI_TEARDOWN_WORKERS'
+READINESS_INITIAL_INTERVAL = 0.5
+READINESS_MAX_INTERVAL = 5
+
+MANAGER_CONTRACTS_FILENAME = 'manager.json'
+MANAGER_CONTRACTS_FILEPATH = os.path.join(CONTRACTS_PATH,
+                                          MANAGER_CONTRACTS_FILENAME)
+IMA_CONTRACTS_FILENAME = 'ima.json'
+IMA_CONTRACTS_FILEPATH = os.path.join(CONTRACTS_PATH, IMA_CONTRACTS_FILENAME)
+
+FILESTORAGE_INFO_FILENAME = 'filestorage_info.json'
+FILESTORAGE_INFO_FILEPATH = os.path.join(CONTAINER_CONFIG_PATH,
+                                         FILESTORAGE_INFO_FILENAME)
+FILESTORAGE_ARTIFACTS_FILENAME = 'filestorage_artifacts.json'
+FILESTORAGE_ARTIFACTS_FILEPATH = os.path.join(NODE_DATA_PATH,
+                                              FILESTORAGE_ARTIFACTS_FILENAME)
+
+# new configs, images and files are prepared here while the node is running
+UPDATE_STAGING_PATH = os.path.join(SKALE_DIR, '.update-staging')
+STAGED_CONFIG_PATH = os.path.join(UPDATE_STAGING_PATH, 'config')
+STAGED_FILES_PATH = os.path.join(UPDATE_STAGING_PATH, 'files')
+PREVIOUS_CONFIG_PATH = os.path.join(UPDATE_STAGING_PATH, 'previous-config')
 
 META_FILEPATH = os.path.join(NODE_DATA_PATH, 'meta.json')
+# completed install and update steps, used by --resume
+STEPS_CHECKPOINTS_FILEPATH = os.path.join(NODE_DATA_PATH,
+                                          'steps-checkpoints.json')
@@ -21,12 +21,39 @@ import os
 from configs import SKALE_DIR
 
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# text or json (one JSON object per line)
+LOG_FORMAT_ENV_VAR = 'SKALE_CLI_LOG_FORMAT'
+
+# chatty third-party loggers are kept out of the debug log, levels can be
+# overridden with SKALE_CLI_LOG_LEVELS=urllib3=DEBUG,docker=WARNING
+LOG_LEVELS = {
+    'urllib3': 'INFO',
+    'docker': 'INFO',
+    'dotenv': 'WARNING'
+}
+LOG_LEVELS_ENV_VAR = 'SKALE_CLI_LOG_LEVELS'
 
 LOG_FILE_SIZE_MB = 300
 LOG_FILE_SIZE_BYTES = LOG_FILE_SIZE_MB * 1000000
 
-LOG_BACKUP_COUNT = 1
+# rotated segments are compressed in background, the oldest ones are
+# removed when there are more than LOG_BACKUP_COUNT of them or they take
+# more than LOG_BACKUPS_MAX_BYTES
+LOG_BACKUP_COUNT = 10
+LOG_BACKUPS_MAX_BYTES = 100 * 1000000
+LOG_COMPRESSION = 'gzip'  # or zstd, needs zstandard package
 LOG_DIRNAME = '.skale-cli-log'
 LOG_DATA_PATH = os.path.join(SKALE_DIR, LOG_DIRNAME)
 LOG_FILEPATH = os.path.join(LOG_DATA_PATH, 'node-cli.log')
 DEBUG_LOG_FILEPATH = os.path.join(LOG_DATA_PATH, 'debug-node-cli.log')
+
+LOG_READ_BLOCK_SIZE = 64 * 1024
+LOG_FOLLOW_INTERVAL = 0.5
+LOG_INDEX_PATH = os.path.join(LOG_DATA_PATH, '.index')
+LOG_INDEX_INTERVAL = 1024 * 1024
+
+API_STATS_FILEPATH = os.path.join(LOG_DATA_PATH, 'api-stats.tsv')
+API_STATS_FILE_SIZE_BYTES = 2 * 1000000
+
+PROFILE_DATA_PATH = os.path.join(LOG_DATA_PATH, 'profiles')
+PROFILE_KEEP = 20
@@ -1,5 +1,4 @@
 import os
-from dotenv import load_dotenv
 
 
 base_params = {
@@ -39,6 +38,7 @@ def absent_params(params):
 
 
 def get_params(env_filepath):
+    from dotenv import load_dotenv
     load_dotenv(dotenv_path=env_filepath)
     params = base_params.copy()
     params.update(optional_params)
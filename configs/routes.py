@@ -35,6 +35,59 @@ ROUTES = {
     }
 }
 
+DEFAULT_CONNECT_TIMEOUT = 3
+DEFAULT_READ_TIMEOUT = 30
+
+# (connect, read) timeouts in seconds for routes that are slower than default
+ROUTE_TIMEOUTS = {
+    'logs/dump': (DEFAULT_CONNECT_TIMEOUT, 900),
+    'node/register': (DEFAULT_CONNECT_TIMEOUT, 300),
+    'node/maintenance-on': (DEFAULT_CONNECT_TIMEOUT, 300),
+    'node/maintenance-off': (DEFAULT_CONNECT_TIMEOUT, 300),
+    'node/set-domain-name': (DEFAULT_CONNECT_TIMEOUT, 300),
+    'node/exit/start': (DEFAULT_CONNECT_TIMEOUT, 300),
+    'schains/dkg-statuses': (DEFAULT_CONNECT_TIMEOUT, 60),
+    'health/schains': (DEFAULT_CONNECT_TIMEOUT, 60),
+    'ssl/upload': (DEFAULT_CONNECT_TIMEOUT, 60),
+    'wallet/send-eth': (DEFAULT_CONNECT_TIMEOUT, 300)
+}
+
+
+# seconds during which cached response is served without a request
+ROUTE_CACHE_TTL = {
+    'node/info': 30,
+    'schains/list': 60,
+    'schains/get': 60,
+    'schains/config': 300,
+    'schains/dkg-statuses': 30,
+    'ssl/status': 300
+}
+
+# cached routes that are dropped after a mutating request
+ROUTE_INVALIDATES = {
+    'node/register': ['node/info'],
+    'node/maintenance-on': ['node/info'],
+    'node/maintenance-off': ['node/info'],
+    'node/set-domain-name': ['node/info'],
+    'node/exit/start': ['node/info'],
+    'schains/repair': ['schains/list', 'schains/get', 'schains/config',
+                       'schains/dkg-statuses'],
+    'ssl/upload': ['ssl/status']
+}
+
+# read-only routes without required params, queried by < skale node status >
+STATUS_ROUTES = [
+    ('node', 'info'),
+    ('node', 'exit/status'),
+    ('wallet', 'info'),
+    ('health', 'containers'),
+    ('health', 'schains'),
+    ('health', 'sgx'),
+    ('schains', 'list'),
+    ('schains', 'dkg-statuses'),
+    ('ssl', 'status')
+]
+
 
 class RouteNotFoundException(Exception):
     """Raised when requested route is not found in provided API version"""
@@ -52,6 +105,13 @@ def get_route(blueprint, method, api_version=CURRENT_API_VERSION, check=True):
     return route
 
 
+def get_route_timeout(blueprint, method):
+    return ROUTE_TIMEOUTS.get(
+        f'{blueprint}/{method}',
+        (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    )
+
+
 def get_all_available_routes(api_version=CURRENT_API_VERSION):
     routes = ROUTES[api_version]
     return [get_route(blueprint, method, api_version) for blueprint in routes
@@ -0,0 +1,264 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Runs many CLI commands in one process, so they share the API client,
+config, texts and caches. Consecutive read-only commands run
+concurrently, any other command waits for them and runs alone.
+Results are printed as NDJSON in the order of the commands
+"""
+
+import io
+import json
+import logging
+import re
+import shlex
+import sys
+import threading
+import time
+import traceback
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from configs import BATCH_MAX_WORKERS
+from tools.exit_codes import CLIExitCodes
+from tools.helper import exit_code_of
+
+
+logger = logging.getLogger(__name__)
+
+READ_COMMANDS = frozenset([
+    ('version',), ('info',),
+    ('debug', 'api-stats'),
+    ('exit', 'status'),
+    ('health', 'containers'), ('health', 'schains'), ('health', 'sgx'),
+    ('logs', 'cli'),
+    ('node', 'info'), ('node', 'signature'), ('node', 'status'),
+    ('resources-allocation', 'show'),
+    ('schains', 'config'), ('schains', 'dkg'), ('schains', 'info'),
+    ('schains', 'ls'), ('schains', 'show-rules'),
+    ('ssl', 'status'),
+    ('validate', 'abi'),
+    ('wallet', 'info')
+])
+NOT_BATCHED = ('batch', 'resident')
+# they never finish, so the batch wouldn't either
+FOLLOW_COMMANDS = frozenset([('logs', 'cli')])
+SHORT_FLAGS_RE = re.compile(r'-[a-zA-Z]+')
+
+BatchCommand = namedtuple('BatchCommand', ['line', 'id', 'args', 'error'])
+
+
+def parse_line(number, line):
+    """
+    Line is either shell-like argv or JSON: array of args or
+    {"args": [...], "id": ...} object, id is returned with the result
+    """
+    command_id = None
+    try:
+        if line[0] in '[{':
+            data = json.loads(line)
+            if isinstance(data, dict):
+                command_id = data.get('id')
+                data = data['args']
+            args = data
+        else:
+            args = shlex.split(line)
+        if not isinstance(args, list) or \
+                not all(isinstance(arg, str) for arg in args):
+            raise ValueError('args should be a list of strings')
+    except (ValueError, KeyError) as err:
+        return BatchCommand(number, command_id, [],
+                            f'Malformed command: {err}')
+    if args and args[0].startswith('-'):
+        # they would change the API client shared by running commands
+        return BatchCommand(number, command_id, args,
+                            'Global options should be passed to batch')
+    if args and args[0] in NOT_BATCHED:
+        return BatchCommand(number, command_id, args,
+                            f'{args[0]} can\'t be run in batch')
+    if is_follow_command(args):
+        return BatchCommand(number, command_id, args,
+                            '--follow can\'t be used in batch')
+    return BatchCommand(number, command_id, args, None)
+
+
+def parse_commands(lines):
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield parse_line(number, line)
+
+
+def is_follow_command(args):
+    if tuple(args[:2]) not in FOLLOW_COMMANDS:
+        return False
+    return any(arg == '--follow' or
+               SHORT_FLAGS_RE.fullmatch(arg) and 'f' in arg
+               for arg in args[2:])
+
+
+def is_read_command(args):
+    words = tuple(arg for arg in args[:2] if not arg.startswith('-'))
+    return words in READ_COMMANDS or words[:1] in READ_COMMANDS
+
+
+class ThreadLocalStream(io.TextIOBase):
+    """Sends writes of the capturing thread into its own buffer"""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    @property
+    def captured(self):
+        return getattr(self.local, 'buffer', None)
+
+    @property
+    def target(self):
+        return self.captured or self.default
+
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        return self.local.buffer
+
+    def bind(self, buffer):
+        self.local.buffer = buffer
+
+    def release(self):
+        self.local.buffer = None
+
+    @property
+    def encoding(self):
+        return 'utf-8'
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+
+class BatchRunner:
+    def __init__(self, command, workers=BATCH_MAX_WORKERS, out=None):
+        self.command = command
+        self.workers = workers
+        self.out = out or sys.stdout
+        self.stdout = ThreadLocalStream(sys.stdout)
+        self.stderr = ThreadLocalStream(sys.stderr)
+        self.failed = 0
+
+    def run_command(self, item):
+        result = {'line': item.line, 'args': item.args}
+        if item.id is not None:
+            result['id'] = item.id
+        if item.error:
+            result.update(exit_code=CLIExitCodes.FAILURE.value, stdout='',
+                          stderr=item.error, duration=0)
+            return result
+        stdout, stderr = self.stdout.capture(), self.stderr.capture()
+        logger.info(f'batch cmd: {" ".join(item.args)}')
+        start = time.perf_counter()
+        try:
+            self.command.main(args=item.args, prog_name='skale')
+            exit_code = 0
+        except SystemExit as exc:
+            exit_code = exit_code_of(exc.code)
+        except Exception as err:
+            logger.exception(f'Batch command {item.args} failed')
+            print(f'Command execution failed with {err}', file=stderr)
+            traceback.print_exc(file=stderr)
+            exit_code = CLIExitCodes.FAILURE.value
+        finally:
+            self.stdout.release()
+            self.stderr.release()
+        result.update(exit_code=exit_code, stdout=stdout.getvalue(),
+                      stderr=stderr.getvalue(),
+                      duration=round(time.perf_counter() - start, 3))
+        return result
+
+    @contextmanager
+    def threads_inherit_capture(self):
+        """
+        Threads started by a command (status calls, teardown and step
+        workers) write into the buffers of the command too
+        """
+        start = threading.Thread.start
+        streams = (self.stdout, self.stderr)
+
+        def start_captured(thread):
+            buffers = [stream.captured for stream in streams]
+            if any(buffer is not None for buffer in buffers):
+                run = thread.run
+
+                def run_captured():
+                    for stream, buffer in zip(streams, buffers):
+                        stream.bind(buffer)
+                    run()
+                thread.run = run_captured
+            return start(thread)
+
+        threading.Thread.start = start_captured
+        try:
+            yield
+        finally:
+            threading.Thread.start = start
+
+    def emit(self, pending, wait=False):
+        while pending and (wait or pending[0].done()):
+            result = pending.popleft().result()
+            if result['exit_code']:
+                self.failed += 1
+            self.out.write(json.dumps(result) + '\n')
+            self.out.flush()
+
+    def run(self, commands):
+        """Returns number of failed commands"""
+        streams = sys.stdin, sys.stdout, sys.stderr
+        # commands must not read batch input, so prompts are aborted
+        sys.stdin, sys.stdout, sys.stderr = \
+            io.StringIO(), self.stdout, self.stderr
+        pending = deque()
+        try:
+            with self.threads_inherit_capture(), \
+                    ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for item in commands:
+                    if item.error is None and not is_read_command(item.args):
+                        self.emit(pending, wait=True)
+                        future = Future()
+                        future.set_result(self.run_command(item))
+                    else:
+                        future = executor.submit(self.run_command, item)
+                    pending.append(future)
+                    self.emit(pending)
+                self.emit(pending, wait=True)
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = streams
+        return self.failed
+
+
+def run_batch(command, commands_file, workers=BATCH_MAX_WORKERS):
+    """Returns the batch exit code, failure if any command failed"""
+    runner = BatchRunner(command, workers)
+    failed = runner.run(parse_commands(commands_file))
+    return CLIExitCodes.FAILURE if failed else CLIExitCodes.SUCCESS
@@ -0,0 +1,77 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from configs import PROFILE_ENV_VAR, RESIDENT_ENV_VAR
+from core.print_formatters import print_api_stats
+from tools.api_stats import ApiStats, summarize
+from tools.exit_codes import CLIExitCodes
+from tools.helper import error_exit
+from tools.profiler import FULL, profile_prefix
+from tools.texts import Texts
+
+
+TEXTS = Texts()['debug']
+
+
+def show_api_stats(window=60, format=None):
+    records = ApiStats().load(since=time.time() - window * 60)
+    summary = summarize(records)
+    if format == 'json':
+        print(json.dumps(summary))
+    elif not summary:
+        print(TEXTS['api_stats']['no_records'].format(window))
+    else:
+        print_api_stats(summary)
+
+
+def compose_cli_cmd(args):
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, *args]
+    return [sys.executable, os.path.abspath(sys.argv[0]), *args]
+
+
+def print_hotspots(stats_path, top, sort):
+    import pstats
+    stats = pstats.Stats(stats_path, stream=sys.stdout)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+
+def profile_command(args, top=20, sort='tottime'):
+    """
+    Runs the command in a new process, so imports are profiled too,
+    then prints hotspots from its cProfile dump
+    """
+    env = dict(os.environ)
+    env[PROFILE_ENV_VAR] = FULL
+    env.pop(RESIDENT_ENV_VAR, None)
+    process = subprocess.Popen(compose_cli_cmd(args), env=env)
+    exit_code = process.wait()
+    stats_path = profile_prefix(process.pid) + '.prof'
+    if not os.path.isfile(stats_path):
+        error_exit(TEXTS['profile']['no_stats'].format(stats_path))
+    print_hotspots(stats_path, top, sort)
+    print(f'Profile files: {profile_prefix(process.pid)}.*')
+    if exit_code:
+        sys.exit(exit_code if exit_code > 0 else CLIExitCodes.FAILURE.value)
@@ -18,11 +18,11 @@
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import json
-from terminaltables import SingleTable
 
 from core.print_formatters import (
     print_containers,
-    print_schains_healthchecks
+    print_schains_healthchecks,
+    print_sgx_info
 )
 from tools.helper import error_exit, get_request
 from tools.exit_codes import CLIExitCodes
@@ -66,15 +66,6 @@ def get_sgx_info():
         method='sgx'
     )
     if status == 'ok':
-        data = payload
-        table_data = [
-            ['SGX info', ''],
-            ['Server URL', data['sgx_server_url']],
-            ['SGXWallet Version', data['sgx_wallet_version']],
-            ['Node SGX keyname', data['sgx_keyname']],
-            ['Status', data['status_name']]
-        ]
-        table = SingleTable(table_data)
-        print(table.table)
+        print_sgx_info(payload)
     else:
         error_exit(payload, exit_code=CLIExitCodes.BAD_API_RESPONSE)
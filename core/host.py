@@ -37,9 +37,10 @@ from core.print_formatters import print_abi_validation_errors
 from configs.resource_allocation import (DISK_MOUNTPOINT_FILEPATH,
                                          SGX_SERVER_URL_FILEPATH)
 
-from tools.helper import safe_load_texts, validate_abi
+from tools.helper import validate_abi
+from tools.texts import Texts
 
-TEXTS = safe_load_texts()
+TEXTS = Texts()
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,334 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Install and update procedures as graphs of steps. Shell parts are the
+functions from datafiles/helper.sh, downloads are done in Python.
+Independent steps (ABI and artifacts downloads, images pull,
+docker-lvmpy install) run concurrently. Completed steps are checkpointed,
+so a failed procedure can be resumed
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+
+from cli.info import VERSION
+from configs import (CONTAINER_CONFIG_PATH, CONTRACTS_PATH, HELPER_SCRIPT,
+                     FILESTORAGE_ARTIFACTS_FILENAME,
+                     FILESTORAGE_ARTIFACTS_FILEPATH, FILESTORAGE_INFO_FILENAME,
+                     FILESTORAGE_INFO_FILEPATH, IMA_CONTRACTS_FILENAME,
+                     IMA_CONTRACTS_FILEPATH, MANAGER_CONTRACTS_FILENAME,
+                     MANAGER_CONTRACTS_FILEPATH, NODE_DATA_PATH,
+                     PREVIOUS_CONFIG_PATH, SKALE_DIR, STAGED_CONFIG_PATH,
+                     STAGED_FILES_PATH, STEPS_CHECKPOINTS_FILEPATH)
+from core.host import get_flask_secret_key
+from core.teardown import remove_dynamic_containers
+from tools.checkpoints import Checkpoints
+from tools.dag import Step, completed_earlier, run_steps
+from tools.helper import download_file, read_json, run_cmd
+
+
+logger = logging.getLogger(__name__)
+
+CONFIGS = 'container configs'
+MANAGER_ABI = 'manager ABI'
+IMA_ABI = 'IMA ABI'
+ARTIFACTS = 'filestorage artifacts'
+FILEBEAT = 'filebeat config'
+FLASK = 'flask secret key'
+IPTABLES = 'iptables'
+LVMPY = 'docker-lvmpy'
+IMAGES = 'images'
+CONTAINERS = 'containers'
+COMPOSE_REMOVAL = 'compose containers removal'
+DYNAMIC_REMOVAL = 'sChain and IMA containers removal'
+CONFIGS_STAGING = 'container configs staging'
+LVMPY_FETCH = 'docker-lvmpy fetch'
+STAGED_FILES = 'staged files'
+
+PREFETCH_STEPS = (CONFIGS_STAGING, IMAGES, MANAGER_ABI, IMA_ABI, ARTIFACTS,
+                  LVMPY_FETCH)
+
+CONFIGS_HEAD_TIMEOUT = 60
+
+
+def compose_helper_cmd(*functions, cwd=SKALE_DIR):
+    return [
+        'bash', '-c',
+        f'set -e; source "{HELPER_SCRIPT}"; cd "{cwd}"; ' + '; '.join(
+            functions)
+    ]
+
+
+def script_env(env):
+    return {
+        'CONFIG_DIR': CONTAINER_CONFIG_PATH,
+        'CONTRACTS_DIR': CONTRACTS_PATH,
+        'NODE_DATA_DIR': NODE_DATA_PATH,
+        **env
+    }
+
+
+def helper_step(name, env, *functions, requires=(), cwd=SKALE_DIR):
+    cmd = compose_helper_cmd(*functions, cwd=cwd)
+    full_env = script_env(env)
+    return Step(name, lambda: run_cmd(cmd, env=full_env), requires=requires,
+                inputs={'cmd': cmd, 'env': full_env})
+
+
+def download_step(name, url, filepath, requires=()):
+    return Step(name, lambda: download_file(url, filepath), requires=requires,
+                inputs={'url': url}, outputs=[filepath])
+
+
+def download_filestorage_artifacts():
+    url = read_json(FILESTORAGE_INFO_FILEPATH)['artifacts_url']
+    download_file(url, FILESTORAGE_ARTIFACTS_FILEPATH)
+
+
+def run_containers(env):
+    """Secret key is generated by the flask step, so it's read on start"""
+    env = {**env, 'FLASK_SECRET_KEY': get_flask_secret_key()}
+    cmd = compose_helper_cmd('up_compose', cwd=CONTAINER_CONFIG_PATH)
+    run_cmd(cmd, env=script_env(env))
+
+
+def compose_init_steps(env, dry_run=False):
+    steps = [
+        helper_step(CONFIGS, env, 'update_container_configs',
+                    'link_env_file'),
+        download_step(MANAGER_ABI, env['MANAGER_CONTRACTS_ABI_URL'],
+                      MANAGER_CONTRACTS_FILEPATH),
+        download_step(IMA_ABI, env['IMA_CONTRACTS_ABI_URL'],
+                      IMA_CONTRACTS_FILEPATH),
+        Step(ARTIFACTS, download_filestorage_artifacts, requires=[CONFIGS],
+             outputs=[FILESTORAGE_ARTIFACTS_FILEPATH]),
+        helper_step(FILEBEAT, env, 'configure_filebeat', requires=[CONFIGS]),
+        helper_step(FLASK, env, 'configure_flask'),
+        helper_step(IPTABLES, env, 'iptables_configure')
+    ]
+    if not dry_run:
+        prepared = [step.name for step in steps]
+        steps.extend([
+            helper_step(LVMPY, env, 'docker_lvmpy_install'),
+            helper_step(IMAGES, env, 'prepare_images', requires=[CONFIGS]),
+            Step(CONTAINERS, lambda: run_containers(env),
+                 requires=prepared + [LVMPY, IMAGES], inputs=env)
+        ])
+    return steps
+
+
+def stage_file(url, filename):
+    os.makedirs(STAGED_FILES_PATH, exist_ok=True)
+    download_file(url, os.path.join(STAGED_FILES_PATH, filename))
+
+
+def stage_file_step(name, url, filename):
+    return Step(name, lambda: stage_file(url, filename), inputs={'url': url},
+                outputs=[os.path.join(STAGED_FILES_PATH, filename)])
+
+
+def stage_filestorage_artifacts():
+    info_path = os.path.join(STAGED_CONFIG_PATH, FILESTORAGE_INFO_FILENAME)
+    stage_file(read_json(info_path)['artifacts_url'],
+               FILESTORAGE_ARTIFACTS_FILENAME)
+
+
+def staged_files():
+    """Staged file paths with the paths they are moved to"""
+    return [
+        (os.path.join(STAGED_FILES_PATH, filename), filepath)
+        for filename, filepath in (
+            (MANAGER_CONTRACTS_FILENAME, MANAGER_CONTRACTS_FILEPATH),
+            (IMA_CONTRACTS_FILENAME, IMA_CONTRACTS_FILEPATH),
+            (FILESTORAGE_ARTIFACTS_FILENAME, FILESTORAGE_ARTIFACTS_FILEPATH)
+        )
+    ]
+
+
+def move_staged_files(env):
+    """
+    Old contracts are backed up first, as before the update. Files moved
+    by the interrupted run are left as they are, the backup is done only
+    if nothing is moved yet
+    """
+    staged = staged_files()
+    pending = [(path, filepath) for path, filepath in staged
+               if os.path.isfile(path)]
+    if len(pending) == len(staged):
+        run_cmd(compose_helper_cmd('backup_old_contracts'),
+                env=script_env(env))
+    else:
+        logger.info(f'{len(staged) - len(pending)} staged files are moved '
+                    'by the previous run')
+    for path, filepath in pending:
+        os.replace(path, filepath)
+
+
+def swap_staged_configs():
+    """
+    Staged checkout replaces the current one by renames, it's in the same
+    filesystem. The interrupted run may leave the configs swapped (no
+    staged checkout) or half swapped (no current checkout)
+    """
+    current = os.path.isdir(CONTAINER_CONFIG_PATH)
+    staged = os.path.isdir(STAGED_CONFIG_PATH)
+    if current and not staged:
+        logger.info('Staged container configs are swapped by the previous run')
+        return
+    if not staged:
+        raise FileNotFoundError(
+            f'Neither {CONTAINER_CONFIG_PATH} nor {STAGED_CONFIG_PATH} '
+            'exist, container configs should be staged again')
+    if current:
+        if os.path.isdir(PREVIOUS_CONFIG_PATH):
+            shutil.rmtree(PREVIOUS_CONFIG_PATH)
+        os.rename(CONTAINER_CONFIG_PATH, PREVIOUS_CONFIG_PATH)
+    else:
+        logger.info('Finishing container configs swap of the previous run')
+    os.rename(STAGED_CONFIG_PATH, CONTAINER_CONFIG_PATH)
+    shutil.rmtree(PREVIOUS_CONFIG_PATH, ignore_errors=True)
+
+
+def configs_head(source_dir, stream):
+    """
+    Commit the staged checkout is made from: HEAD of the local source
+    dir, or the stream head in the origin of the current checkout. Stream
+    not found among the remote refs is a commit itself. None if it can't
+    be resolved, so the staged checkout isn't reused
+    """
+    if source_dir:
+        cmd = ['git', '-C', source_dir, 'rev-parse', 'HEAD']
+    else:
+        cmd = ['git', '-C', CONTAINER_CONFIG_PATH, 'ls-remote', 'origin',
+               stream]
+    try:
+        res = run_cmd(cmd, timeout=CONFIGS_HEAD_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        logger.warning('Failed to resolve container configs head',
+                       exc_info=True)
+        return None
+    lines = res.stdout.decode('utf-8', errors='replace').split()
+    if source_dir:
+        return lines[0] if lines else None
+    return lines[0] if lines else stream
+
+
+def compose_prefetch_steps(env):
+    """New configs, images and files, while the old containers are running"""
+    staging_env = {
+        **env,
+        'STAGED_CONFIG_DIR': STAGED_CONFIG_PATH
+    }
+    images_env = {
+        **env,
+        'CONFIG_DIR': STAGED_CONFIG_PATH,
+        # images built from the staged configs get the usual names
+        'COMPOSE_PROJECT_NAME': os.path.basename(CONTAINER_CONFIG_PATH)
+    }
+    staging_step = helper_step(CONFIGS_STAGING, staging_env,
+                               'fetch_container_configs',
+                               'stage_container_configs')
+    # branch moves on, staged checkout of the older head isn't reused
+    staging_step.inputs['head'] = configs_head(
+        env.get('CONTAINER_CONFIGS_DIR', ''),
+        env.get('CONTAINER_CONFIGS_STREAM', ''))
+    return [
+        staging_step,
+        helper_step(IMAGES, images_env, 'prepare_images',
+                    requires=[CONFIGS_STAGING]),
+        stage_file_step(MANAGER_ABI, env['MANAGER_CONTRACTS_ABI_URL'],
+                        MANAGER_CONTRACTS_FILENAME),
+        stage_file_step(IMA_ABI, env['IMA_CONTRACTS_ABI_URL'],
+                        IMA_CONTRACTS_FILENAME),
+        Step(ARTIFACTS, stage_filestorage_artifacts,
+             requires=[CONFIGS_STAGING],
+             outputs=[os.path.join(STAGED_FILES_PATH,
+                                   FILESTORAGE_ARTIFACTS_FILENAME)]),
+        helper_step(LVMPY_FETCH, env, 'fetch_docker_lvmpy_sources')
+    ]
+
+
+def compose_update_steps(env, prefetch_only=False):
+    """
+    Node containers are removed only when everything is prefetched. After
+    that staged files and configs are moved into place without network
+    access, only docker-lvmpy update may still fetch its sources
+    """
+    steps = compose_prefetch_steps(env)
+    if prefetch_only:
+        return steps
+    prefetched = [step.name for step in steps]
+    return steps + [
+        helper_step(COMPOSE_REMOVAL, env, 'remove_compose_containers',
+                    requires=prefetched),
+        Step(DYNAMIC_REMOVAL, remove_dynamic_containers,
+             requires=[COMPOSE_REMOVAL]),
+        Step(STAGED_FILES, lambda: move_staged_files(env),
+             requires=[COMPOSE_REMOVAL, MANAGER_ABI, IMA_ABI, ARTIFACTS],
+             outputs=[filepath for _, filepath in staged_files()]),
+        helper_step(LVMPY, env, 'docker_lvmpy_update',
+                    requires=[DYNAMIC_REMOVAL]),
+        Step(CONFIGS, swap_staged_configs, requires=[COMPOSE_REMOVAL]),
+        helper_step(CONTAINERS, env, 'up_compose',
+                    requires=[DYNAMIC_REMOVAL, STAGED_FILES, LVMPY, CONFIGS],
+                    cwd=CONTAINER_CONFIG_PATH)
+    ]
+
+
+def downtime_start(report):
+    """
+    Monotonic time when node containers removal started, None if they
+    were removed by the resumed run
+    """
+    started = report.results[COMPOSE_REMOVAL].started
+    return None if started is None else report.start + started
+
+
+def compose_checkpoints(procedure, env, resume=False, kept=()):
+    key = {
+        'procedure': procedure,
+        'version': VERSION,
+        'config_stream': env['CONTAINER_CONFIGS_STREAM']
+    }
+    return Checkpoints(key, path=STEPS_CHECKPOINTS_FILEPATH, resume=resume,
+                       kept=kept)
+
+
+def compose_update_checkpoints(env, resume=False):
+    """Prefetched steps are skipped by the update even without resume"""
+    return compose_checkpoints('update', env, resume=resume,
+                               kept=PREFETCH_STEPS)
+
+
+def reused_prefetch_steps(steps, checkpoints):
+    """Prefetched steps the update won't run again"""
+    completed = completed_earlier(steps, checkpoints)
+    return [name for name in PREFETCH_STEPS if name in completed]
+
+
+def run_node_steps(steps, checkpoints=None):
+    from core.print_formatters import print_steps_report
+    from tools.executor import terminate_running
+    report = run_steps(steps, on_interrupt=terminate_running,
+                       checkpoints=checkpoints)
+    print_steps_report(report)
+    return report
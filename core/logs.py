@@ -0,0 +1,82 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import sys
+from collections import deque
+
+from configs.cli_logger import DEBUG_LOG_FILEPATH, LOG_FILEPATH, LOG_INDEX_PATH
+from tools.helper import error_exit
+from tools.log_index import LogSearch
+from tools.log_reader import RecordFilter, follow, tail_offset
+
+
+def write_lines(lines, out=None):
+    out = out or sys.stdout
+    for line in lines:
+        out.write(line.decode('utf-8', errors='replace'))
+
+
+def print_log_tail(filepath, lines=None):
+    """Prints the whole log or its last lines, returns the end offset"""
+    with open(filepath, 'rb') as log_file:
+        if lines is not None:
+            log_file.seek(tail_offset(log_file, lines))
+        write_lines(iter(log_file.readline, b''))
+        return log_file.tell()
+
+
+def print_log_search(filepath, record_filter, lines=None):
+    """Prints matching records from the log and its backups"""
+    search = LogSearch(filepath, record_filter, LOG_INDEX_PATH)
+    records = iter(search)
+    if lines is not None:
+        records = deque(records, maxlen=lines)
+    write_lines(records)
+    return search.offset
+
+
+def follow_log(filepath, offset, record_filter):
+    lines = follow(filepath, offset, yield_idle=True)
+    try:
+        for line in record_filter.filter(lines):
+            write_lines([line])
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lines.close()
+
+
+def show_cli_logs(debug=False, lines=None, since=None, until=None,
+                  level=None, pattern=None, follow_logs=False):
+    """
+    Prints the log (or its last lines, or the matching records) without
+    loading the whole file, then optionally follows it
+    """
+    filepath = DEBUG_LOG_FILEPATH if debug else LOG_FILEPATH
+    if not os.path.isfile(filepath):
+        error_exit(f'Log file {filepath} is not found')
+    record_filter = RecordFilter(since, until, level, pattern)
+    if record_filter.is_empty:
+        offset = print_log_tail(filepath, lines)
+    else:
+        offset = print_log_search(filepath, record_filter, lines)
+    if follow_logs and not record_filter.done:
+        follow_log(filepath, offset, record_filter)
@@ -2,7 +2,8 @@ import logging
 import subprocess
 import shlex
 
-from configs import MYSQL_BACKUP_CONTAINER_PATH, MYSQL_BACKUP_PATH
+from configs import (MYSQL_BACKUP_CONTAINER_PATH, MYSQL_BACKUP_PATH,
+                     MYSQL_CONTAINER_NAME)
 from tools.helper import run_cmd, extract_env_params
 
 
@@ -11,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 def run_mysql_cmd(cmd, env_filepath):
     mysql_creds_str = mysql_creds_for_cmd(env_filepath)
-    cmd_str = f'docker exec -t skale_mysql bash -c "{cmd} {mysql_creds_str}"'
+    cmd_str = f'docker exec -t {MYSQL_CONTAINER_NAME} bash -c "{cmd} {mysql_creds_str}"'
     cmd = shlex.split(cmd_str)
     return run_cmd(cmd, secure=True)
 
@@ -25,22 +25,27 @@ import subprocess
 import time
 from enum import Enum
 
-import docker
-
 from cli.info import VERSION
-from configs import (SKALE_DIR, INSTALL_SCRIPT, UNINSTALL_SCRIPT,
+from configs import (SKALE_DIR, UNINSTALL_SCRIPT,
                      BACKUP_INSTALL_SCRIPT,
-                     UPDATE_SCRIPT, DATAFILES_FOLDER, INIT_ENV_FILEPATH,
-                     BACKUP_ARCHIVE_NAME, HOME_DIR, RESTORE_SLEEP_TIMEOUT,
-                     TURN_OFF_SCRIPT, TURN_ON_SCRIPT, TM_INIT_TIMEOUT)
+                     DATAFILES_FOLDER, INIT_ENV_FILEPATH,
+                     BACKUP_ARCHIVE_NAME, HOME_DIR, MYSQL_SERVICE,
+                     STEPS_CHECKPOINTS_FILEPATH, TURN_OFF_SCRIPT,
+                     TURN_ON_SCRIPT, UPDATE_STAGING_PATH)
 from configs.cli_logger import LOG_DIRNAME
 
 from core.mysql_backup import create_mysql_backup, restore_mysql_backup
+from core.install import (compose_checkpoints, compose_helper_cmd,
+                          compose_init_steps, compose_update_checkpoints,
+                          compose_update_steps, downtime_start,
+                          reused_prefetch_steps, run_node_steps)
 from core.host import (is_node_inited, prepare_host,
                        save_env_params, get_flask_secret_key)
 from core.print_formatters import print_node_cmd_error, print_node_info
+from core.readiness import wait_for_node
 from tools.helper import error_exit, get_request, post_request
 from core.resources import update_resource_allocation
+from core.teardown import TeardownError, remove_dynamic_containers
 from tools.meta import update_meta
 from tools.helper import run_cmd, extract_env_params
 from tools.texts import Texts
@@ -49,7 +54,6 @@ from tools.exit_codes import CLIExitCodes
 logger = logging.getLogger(__name__)
 TEXTS = Texts()
 
-BASE_CONTAINERS_AMOUNT = 5
 BLUEPRINT_NAME = 'node'
 
 
@@ -94,8 +98,9 @@ def register_node(config, name, p2p_ip,
         error_exit(error_msg, exit_code=CLIExitCodes.BAD_API_RESPONSE)
 
 
-def init(env_filepath, dry_run=False):
-    if is_node_inited():
+def init(env_filepath, dry_run=False, resume=False):
+    if is_node_inited() and not (
+            resume and os.path.isfile(STEPS_CHECKPOINTS_FILEPATH)):
         print(TEXTS['node']['already_inited'])
         return
     env_params = extract_env_params(env_filepath)
@@ -107,23 +112,28 @@ def init(env_filepath, dry_run=False):
         env_params['SGX_SERVER_URL']
     )
     update_meta(VERSION, env_params['CONTAINER_CONFIGS_STREAM'])
-    dry_run = 'yes' if dry_run else ''
     env = {
         'SKALE_DIR': SKALE_DIR,
         'DATAFILES_FOLDER': DATAFILES_FOLDER,
-        'DRY_RUN': dry_run,
+        'DRY_RUN': 'yes' if dry_run else '',
         **env_params
     }
-    try:
-        run_cmd(['bash', INSTALL_SCRIPT], env=env)
-    except Exception:
-        error_msg = 'Install script process errored'
-        logger.exception(error_msg)
+    checkpoints = compose_checkpoints('init', env, resume=resume)
+    report = run_node_steps(compose_init_steps(env, dry_run=dry_run),
+                            checkpoints=checkpoints)
+    if not report.ok:
+        error_msg = 'Install procedure errored'
+        logger.error(error_msg)
         error_exit(error_msg, exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
-    print('Waiting for transaction manager initialization ...')
-    time.sleep(TM_INIT_TIMEOUT)
-    if not is_base_containers_alive():
-        error_exit('Containers are not running', exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
+    checkpoints.clear()
+    if not dry_run:
+        print('Waiting for transaction manager initialization ...')
+        report = wait_for_node()
+        if not report.ok:
+            error_exit(
+                f'Node components are not ready: {report.describe_lagging()}',
+                exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR
+            )
     logger.info('Generating resource allocation file ...')
     update_resource_allocation()
     print('Init procedure finished')
@@ -136,8 +146,10 @@ def restore(backup_path, env_filepath):
     save_env_params(env_filepath)
     if not run_restore_script(backup_path, env_params):
         return
-    time.sleep(RESTORE_SLEEP_TIMEOUT)
-    if not restore_mysql_backup(env_filepath):
+    report = wait_for_node(services=(MYSQL_SERVICE,), admin_api=False)
+    if not report.ok:
+        print(f'MySQL is not ready: {report.describe_lagging()}')
+    if not report.ok or not restore_mysql_backup(env_filepath):
         print('WARNING: MySQL data restoring failed. '
               'Check < skale logs cli > for more information')
     print('Node is restored from backup')
@@ -162,17 +174,36 @@ def run_restore_script(backup_path, env_params) -> bool:
 
 
 def purge():
+    """
+    Containers are removed as by turn-off, with the docker access of the
+    CLI user: node containers first, so skale-admin can't start new
+    sChains, then sChain and IMA ones. Only the uninstall script, which
+    removes the node files, is run with sudo
+    """
     # todo: check that node is installed
+    try:
+        run_cmd(compose_helper_cmd('remove_compose_containers'),
+                env={'SKALE_DIR': SKALE_DIR})
+    except Exception:
+        error_msg = 'Node containers removal failed'
+        logger.exception(error_msg)
+        error_exit(error_msg, exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
+    try:
+        remove_dynamic_containers()
+    except TeardownError as err:
+        logger.error(err)
+        error_exit(str(err), exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
     run_cmd(['sudo', 'bash', UNINSTALL_SCRIPT])
     print('Success')
 
 
-def get_inited_node_env(env_filepath, sync_schains):
+def get_inited_node_env(env_filepath, sync_schains, save=True):
     if env_filepath is not None:
         env_params = extract_env_params(env_filepath)
         if env_params is None:
             return
-        save_env_params(env_filepath)
+        if save:
+            save_env_params(env_filepath)
     else:
         env_params = extract_env_params(INIT_ENV_FILEPATH)
     flask_secret_key = get_flask_secret_key()
@@ -187,13 +218,54 @@ def get_inited_node_env(env_filepath, sync_schains):
     return env
 
 
-def update(env_filepath, sync_schains):
+def prefetch_update(env_filepath, sync_schains, resume=False):
+    """
+    Prepares the update without touching the running node, completed
+    steps are skipped by the following update
+    """
+    print('Prefetching the update...')
+    env = get_inited_node_env(env_filepath, sync_schains, save=False)
+    if env is None:
+        return
+    report = run_node_steps(
+        compose_update_steps(env, prefetch_only=True),
+        checkpoints=compose_update_checkpoints(env, resume=resume)
+    )
+    if not report.ok:
+        logger.error('Update prefetch errored')
+        print_node_cmd_error()
+        return
+    print('Update is prefetched, node update will start with the teardown')
+
+
+def update(env_filepath, sync_schains, prefetch_only=False, resume=False):
     if not is_node_inited():
         print(TEXTS['node']['not_inited'])
         return
+    if prefetch_only:
+        prefetch_update(env_filepath, sync_schains, resume=resume)
+        return
 
     print('Updating the node...')
-    env = get_inited_node_env(env_filepath, sync_schains)
+    env = get_inited_node_env(env_filepath, sync_schains, save=False)
+    if env is None:
+        return
+    checkpoints = compose_update_checkpoints(env, resume=resume)
+    if checkpoints.interrupted and not resume:
+        error_exit(
+            [
+                'Previous update was interrupted after these steps: ' +
+                ', '.join(checkpoints.interrupted),
+                'Run < skale node update --resume > to continue it'
+            ],
+            exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR
+        )
+    steps = compose_update_steps(env)
+    reused = reused_prefetch_steps(steps, checkpoints)
+    if reused:
+        print('Reusing steps prefetched earlier: ' + ', '.join(reused))
+    if env_filepath is not None:
+        save_env_params(env_filepath)
     prepare_host(
         env_filepath,
         env['DISK_MOUNTPOINT'],
@@ -201,17 +273,23 @@ def update(env_filepath, sync_schains):
         allocation=True
     )
     update_meta(VERSION, env['CONTAINER_CONFIGS_STREAM'])
-    try:
-        run_cmd(['bash', UPDATE_SCRIPT], env=env)
-    except Exception:
-        logger.exception('Update script process errored')
+    report = run_node_steps(steps, checkpoints=checkpoints)
+    if not report.ok:
+        logger.error('Update procedure errored')
         print_node_cmd_error()
         return
+    checkpoints.clear()
+    teardown_start = downtime_start(report)
     print('Waiting for transaction manager initialization ...')
-    time.sleep(TM_INIT_TIMEOUT)
-    if not is_base_containers_alive():
+    report = wait_for_node()
+    if not report.ok:
+        print(f'Node components are not ready: {report.describe_lagging()}')
         print_node_cmd_error()
         return
+    if teardown_start is not None:
+        downtime = time.monotonic() - teardown_start
+        logger.info(f'Update downtime: {downtime:.1f}s')
+        print(f'Node was down for {downtime:.1f}s')
     print('Update procedure finished')
 
 
@@ -250,9 +328,11 @@ def get_backup_filepath(base_path):
 def create_backup_archive(backup_filepath):
     print('Creating backup archive...')
     log_skale_path = os.path.join('.skale', LOG_DIRNAME)
+    staging_path = os.path.join('.skale',
+                                os.path.basename(UPDATE_STAGING_PATH))
     cmd = shlex.split(
         f'tar -zcvf {backup_filepath} -C {HOME_DIR} '
-        f'--exclude {log_skale_path} .skale'
+        f'--exclude {log_skale_path} --exclude {staging_path} .skale'
     )
     try:
         run_cmd(cmd)
@@ -306,6 +386,11 @@ def run_turn_off_script():
         error_msg = 'Turning off failed'
         logger.exception(error_msg)
         error_exit(error_msg, exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
+    try:
+        remove_dynamic_containers()
+    except TeardownError as err:
+        logger.error(err)
+        error_exit(str(err), exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
     print('Node was successfully turned off')
 
 
@@ -319,7 +404,10 @@ def run_turn_on_script(sync_schains, env_filepath):
         logger.exception(error_msg)
         error_exit(error_msg, exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
     print('Waiting for transaction manager initialization ...')
-    time.sleep(TM_INIT_TIMEOUT)
+    report = wait_for_node()
+    if not report.ok:
+        error_exit(f'Node components are not ready: {report.describe_lagging()}',
+                   exit_code=CLIExitCodes.SCRIPT_EXECUTION_ERROR)
     print('Node was successfully turned on')
 
 
@@ -341,15 +429,6 @@ def turn_on(maintenance_off, sync_schains, env_file):
         set_maintenance_mode_off()
 
 
-def is_base_containers_alive():
-    dclient = docker.from_env()
-    containers = dclient.containers.list()
-    skale_containers = list(filter(
-        lambda c: c.name.startswith('skale_'), containers
-    ))
-    return len(skale_containers) >= BASE_CONTAINERS_AMOUNT
-
-
 def get_node_info(config, format):
     status, payload = get_request(
         blueprint=BLUEPRINT_NAME,
@@ -20,17 +20,18 @@
 import os
 import json
 import datetime
-import texttable
-from dateutil import parser
 
 import inspect
 
 from configs import LONG_LINE
 from configs.cli_logger import DEBUG_LOG_FILEPATH
+from tools import profiler
 from tools.texts import Texts
 
 TEXTS = Texts()
 
+STEP_ERROR_LINES = 10
+
 
 def print_wallet_info(wallet):
     print(inspect.cleandoc(f'''
@@ -52,6 +53,7 @@ def get_tty_width():
 
 class Formatter(object):
     def table(self, headers, rows):
+        import texttable
         table = texttable.Texttable(max_width=get_tty_width())
         table.set_cols_dtype(['t' for h in headers])
         table.add_rows([headers] + rows)
@@ -66,6 +68,7 @@ def format_date(date):
 
 
 def print_containers(containers):
+    from dateutil import parser
     headers = [
         'Name',
         'Status',
@@ -258,6 +261,84 @@ def print_abi_validation_errors(info: list, raw: bool = False) -> None:
         print(Formatter().table(headers, rows))
 
 
+def print_sgx_info(data):
+    from terminaltables import SingleTable
+    table_data = [
+        ['SGX info', ''],
+        ['Server URL', data['sgx_server_url']],
+        ['SGXWallet Version', data['sgx_wallet_version']],
+        ['Node SGX keyname', data['sgx_keyname']],
+        ['Status', data['status_name']]
+    ]
+    table = SingleTable(table_data)
+    print(table.table)
+
+
+def print_ssl_status(payload):
+    if payload.get('is_empty'):
+        print(TEXTS['ssl']['no_cert'])
+    else:
+        from terminaltables import SingleTable
+        table_data = [
+            ['Issued to', payload['issued_to']],
+            ['Expiration date', payload['expiration_date']]
+        ]
+        table = SingleTable(table_data)
+        print('SSL certificates status:')
+        print(table.table)
+
+
+def print_api_stats(summary):
+    headers = [
+        'Route',
+        'Calls',
+        'Errors',
+        'Retries',
+        'p50, ms',
+        'p95, ms',
+        'p99, ms',
+        'TTFB p50, ms',
+        'Avg bytes'
+    ]
+    rows = [
+        [
+            stats['route'],
+            stats['calls'],
+            stats['errors'],
+            stats['retries'],
+            f"{stats['p50']:.1f}",
+            f"{stats['p95']:.1f}",
+            f"{stats['p99']:.1f}",
+            f"{stats['ttfb_p50']:.1f}",
+            stats['avg_bytes']
+        ]
+        for stats in summary
+    ]
+    print(Formatter().table(headers, rows))
+
+
+def print_steps_report(report):
+    headers = ['Step', 'Status', 'Started, s', 'Time, s']
+    rows = [
+        [
+            result.name,
+            result.status,
+            f'{result.started:.1f}' if result.started is not None else '',
+            f'{result.duration:.1f}' if result.duration is not None else ''
+        ]
+        for result in report.results.values()
+    ]
+    print(Formatter().table(headers, rows))
+    print(f'Total: {report.elapsed:.1f}s, '
+          f'{report.sequential_time:.1f}s if run one by one')
+    for result in report.failed:
+        print(f'{result.name} failed: {result.error}')
+        stderr = getattr(result.error, 'stderr', None)
+        if stderr:
+            lines = stderr.decode('utf-8', errors='replace').splitlines()
+            print('\n'.join(lines[-STEP_ERROR_LINES:]))
+
+
 def print_node_cmd_error():
     print(TEXTS['node']['cmd_failed'].format(DEBUG_LOG_FILEPATH))
 
@@ -288,3 +369,6 @@ def print_err_response(error_payload):
     print(error_msg)
     print(LONG_LINE)
     print(f'You can find more info in {DEBUG_LOG_FILEPATH}')
+
+
+profiler.instrument(globals(), 'print_', 'render')
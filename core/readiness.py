@@ -0,0 +1,103 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Readiness checks of node components started by install, update,
+turn-on and restore scripts
+"""
+
+import logging
+
+from configs import (BASE_SERVICES, MYSQL_CONTAINER_NAME, NODE_READY_TIMEOUT,
+                     READINESS_INITIAL_INTERVAL, READINESS_MAX_INTERVAL)
+from tools.readiness import Check, wait_ready
+
+
+logger = logging.getLogger(__name__)
+
+COMPOSE_SERVICE_LABEL = 'com.docker.compose.service'
+ADMIN_API_CHECK = 'admin API'
+MYSQL_CHECK = 'MySQL'
+
+
+class NodeProbes:
+    """Docker client is created on the first probe, and again if it failed"""
+
+    def __init__(self):
+        self.client = None
+
+    def docker_client(self):
+        if self.client is None:
+            import docker
+            self.client = docker.from_env()
+        return self.client
+
+    def service(self, name):
+        """
+        Compose service is ready when its container is running and
+        healthy, if it has a healthcheck
+        """
+        containers = self.docker_client().containers.list(
+            all=True, filters={'label': f'{COMPOSE_SERVICE_LABEL}={name}'})
+        if not containers:
+            return False, 'not created'
+        state = containers[0].attrs['State']
+        health = (state.get('Health') or {}).get('Status')
+        ready = state['Status'] == 'running' and health in (None, 'healthy')
+        return ready, f'{state["Status"]}, {health}' if health \
+            else state['Status']
+
+    def admin_api(self):
+        from tools.api_client import get_api_client
+        client = get_api_client()
+        if not client.probe():
+            return False, 'not accepting connections'
+        if client.breaker:
+            # it could be opened while skale-admin was restarting
+            client.breaker.close()
+        return True, 'accepting connections'
+
+    def mysql(self):
+        # exit code is 0 if server is up, even if access is denied
+        container = self.docker_client().containers.get(MYSQL_CONTAINER_NAME)
+        result = container.exec_run(['mysqladmin', 'ping', '--silent'])
+        if result.exit_code:
+            return False, 'not responding'
+        return True, 'responding'
+
+
+def compose_checks(services=BASE_SERVICES, admin_api=True, mysql=True):
+    probes = NodeProbes()
+    checks = [Check(name, lambda name=name: probes.service(name))
+              for name in services]
+    if admin_api:
+        checks.append(Check(ADMIN_API_CHECK, probes.admin_api))
+    if mysql:
+        checks.append(Check(MYSQL_CHECK, probes.mysql))
+    return checks
+
+
+def wait_for_node(services=BASE_SERVICES, admin_api=True, mysql=True,
+                  timeout=NODE_READY_TIMEOUT):
+    return wait_ready(
+        compose_checks(services, admin_api=admin_api, mysql=mysql),
+        timeout,
+        initial_interval=READINESS_INITIAL_INTERVAL,
+        max_interval=READINESS_MAX_INTERVAL
+    )
@@ -0,0 +1,61 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+
+from tools.exit_codes import CLIExitCodes
+from tools.helper import error_exit
+from tools.resident import ResidentError, ResidentServer
+from tools.resident_client import ResidentUnavailable, send_control
+from tools.texts import Texts
+
+
+TEXTS = Texts()['resident']
+
+
+def serve(command, idle_timeout):
+    server = ResidentServer(command, idle_timeout=idle_timeout)
+    try:
+        server.serve_forever()
+    except ResidentError as err:
+        error_exit(str(err), exit_code=CLIExitCodes.FAILURE)
+
+
+def stop():
+    try:
+        send_control('stop')
+    except ResidentUnavailable:
+        print(TEXTS['not_running'])
+        return
+    print(TEXTS['stop']['stopped'])
+
+
+def show_status(format=None):
+    try:
+        status = send_control('status')
+    except ResidentUnavailable:
+        if format == 'json':
+            print(json.dumps({'running': False}))
+        else:
+            print(TEXTS['not_running'])
+        return
+    if format == 'json':
+        print(json.dumps({'running': True, **status}))
+    else:
+        print(TEXTS['status']['info'].format(**status))
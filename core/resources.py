@@ -22,11 +22,9 @@ import logging
 import subprocess
 from time import sleep
 
-import psutil
-
 from tools.schain_types import SchainTypes
 from tools.helper import write_json, read_json, run_cmd, format_output, safe_load_yml
-from configs import ALLOCATION_FILEPATH
+from configs import ALLOCATION_FILEPATH, SHORT_CMD_TIMEOUT
 from configs.resource_allocation import (
     RESOURCE_ALLOCATION_FILEPATH, TIMES, TIMEOUT,
     TEST_DIVIDER, SMALL_DIVIDER, MEDIUM_DIVIDER, LARGE_DIVIDER,
@@ -134,6 +132,7 @@ def update_resource_allocation() -> None:
 
 
 def get_available_memory():
+    import psutil
     memory = []
     for _ in range(0, TIMES):
         mem_info = psutil.virtual_memory()
@@ -143,6 +142,7 @@ def get_available_memory():
 
 
 def get_total_memory():
+    import psutil
     memory = []
     for _ in range(0, TIMES):
         mem_info = psutil.virtual_memory()
@@ -175,7 +175,7 @@ def get_disk_alloc():
     disk_path = get_disk_path()
     try:
         disk_size = get_disk_size(disk_path)
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         raise Exception(
             "Couldn't get disk size, check disk mountpoint option."
         )
@@ -185,7 +185,7 @@ def get_disk_alloc():
 
 def get_disk_size(disk_path):
     disk_size_cmd = construct_disk_size_cmd(disk_path)
-    res = run_cmd(disk_size_cmd, shell=True)
+    res = run_cmd(disk_size_cmd, shell=True, timeout=SHORT_CMD_TIMEOUT)
     stdout, stderr = format_output(res)
     return int(stdout)
 
@@ -195,7 +195,8 @@ def construct_disk_size_cmd(disk_path):
 
 
 def check_is_partition(disk_path):
-    res = run_cmd(['blkid', disk_path])
+    res = run_cmd(['blkid', disk_path], timeout=SHORT_CMD_TIMEOUT,
+                  detached=True)
     output = str(res.stdout)
     if 'PARTUUID' in output:
         return True
@@ -1,8 +1,15 @@
+import json
 import logging
-import pprint
+import sys
+import tempfile
 
-from tools.helper import get_request, post_request, error_exit
+from tools.api_client import get_api_client
+from tools.circuit_breaker import AdminUnavailable
+from tools.helper import (get_request, post_request, error_exit,
+                          admin_unavailable_exit, DEFAULT_ERROR_DATA)
 from tools.exit_codes import CLIExitCodes
+from tools.json_stream import (build_value, iter_events, iter_subtree,
+                               select, write_events)
 from core.print_formatters import (
     print_dkg_statuses,
     print_firewall_rules,
@@ -15,6 +22,9 @@ logger = logging.getLogger(__name__)
 
 BLUEPRINT_NAME = 'schains'
 
+CONFIG_BUFFER_MEMORY = 8 * 1024 * 1024
+CONFIG_BUFFER_CHUNK_SIZE = 64 * 1024
+
 
 def get_schain_firewall_rules(schain: str) -> None:
     status, payload = get_request(
@@ -56,16 +66,72 @@ def show_dkg_info(all_: bool = False) -> None:
         error_exit(payload, exit_code=CLIExitCodes.BAD_API_RESPONSE)
 
 
-def show_config(name: str) -> None:
-    status, payload = get_request(
-        blueprint=BLUEPRINT_NAME,
-        method='config',
-        params={'schain_name': name}
-    )
-    if status == 'ok':
-        pprint.pprint(payload)
+def buffer_events(events):
+    """Writes events into a temporary file, it's kept in memory if small"""
+    buffered = tempfile.SpooledTemporaryFile(
+        max_size=CONFIG_BUFFER_MEMORY, mode='w+', encoding='utf-8')
+    write_events(events, buffered)
+    buffered.seek(0)
+    return buffered
+
+
+def buffered_payload_events(buffered):
+    chunks = iter(
+        lambda: buffered.read(CONFIG_BUFFER_CHUNK_SIZE).encode('utf-8'), b'')
+    for path, event, value in iter_events(chunks):
+        yield ('payload',) + path, event, value
+
+
+def show_config(name: str, selector: tuple = None) -> None:
+    """
+    Streams config from the response without loading it into memory.
+    If selector is given only matching values are printed, one per line.
+    Config is printed only after the ok status, if the status comes
+    after the payload, the payload is buffered till then
+    """
+    status, error_payload, buffered = None, None, None
+    try:
+        with get_api_client().stream(
+            blueprint=BLUEPRINT_NAME,
+            method='config',
+            params={'schain_name': name}
+        ) as body:
+            events = iter_events(body)
+            for path, event, value in events:
+                if path == ('status',):
+                    status = value
+                elif path == ('payload',) and event != 'map_key':
+                    subtree = iter_subtree((path, event, value), events)
+                    if event == 'start_map' and status == 'ok':
+                        print_config_events(subtree, selector)
+                    elif event == 'start_map' and status is None:
+                        buffered = buffer_events(subtree)
+                    else:
+                        error_payload = build_value(subtree)
+            body.ok = status == 'ok'
+        if buffered is not None:
+            with buffered:
+                payload_events = buffered_payload_events(buffered)
+                if status == 'ok':
+                    print_config_events(payload_events, selector)
+                else:
+                    error_payload = build_value(payload_events)
+    except AdminUnavailable as err:
+        admin_unavailable_exit(err)
+    except Exception as err:
+        logger.error('Request failed', exc_info=err)
+        status, error_payload = 'error', DEFAULT_ERROR_DATA['payload']
+    if status != 'ok':
+        error_exit(error_payload, exit_code=CLIExitCodes.BAD_API_RESPONSE)
+
+
+def print_config_events(events, selector: tuple = None) -> None:
+    config_events = ((path[1:], event, value) for path, event, value in events)
+    if selector is None:
+        write_events(config_events, sys.stdout)
     else:
-        error_exit(payload, exit_code=CLIExitCodes.BAD_API_RESPONSE)
+        for value in select(config_events, selector):
+            print(json.dumps(value))
 
 
 def toggle_schain_repair_mode(schain: str) -> None:
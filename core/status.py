@@ -0,0 +1,144 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from configs import LONG_LINE, STATUS_CALL_DEADLINE
+from configs.routes import STATUS_ROUTES, RouteNotFoundException
+from core.node import NodeStatuses, get_node_status
+from core.print_formatters import (
+    print_containers, print_dkg_statuses, print_exit_status,
+    print_node_info, print_schains, print_schains_healthchecks,
+    print_sgx_info, print_ssl_status, print_wallet_info, TEXTS
+)
+from tools.circuit_breaker import AdminUnavailable
+from tools.exit_codes import CLIExitCodes
+from tools.helper import DEFAULT_ERROR_DATA, ensure_admin_available
+
+
+logger = logging.getLogger(__name__)
+
+
+def call_in_daemon_thread(func, *args, **kwargs):
+    """
+    Unlike ThreadPoolExecutor workers, daemon threads are not joined on
+    interpreter exit, so a hung call can't outlive the deadline
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as err:
+            future.set_exception(err)
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def fetch_route(blueprint, method, timeout=None):
+    """
+    Like get_request, but runs in a worker thread: unavailable admin or
+    unknown route fail only this route instead of exiting the command
+    """
+    from tools.api_client import get_api_client
+    try:
+        data = get_api_client().get_json(blueprint, method, timeout=timeout)
+    except (AdminUnavailable, RouteNotFoundException) as err:
+        logger.error(f'{blueprint}/{method} call failed: {err}')
+        return 'error', str(err)
+    except Exception as err:
+        logger.error('Request failed', exc_info=err)
+        data = DEFAULT_ERROR_DATA
+    return data['status'], data['payload']
+
+
+def fetch_status(deadline=STATUS_CALL_DEADLINE):
+    """
+    Queries all STATUS_ROUTES concurrently. Calls that didn't finish
+    within the deadline are reported as failed
+    """
+    start = time.time()
+    futures = {
+        f'{blueprint}/{method}': call_in_daemon_thread(
+            fetch_route, blueprint, method, timeout=deadline
+        )
+        for blueprint, method in STATUS_ROUTES
+    }
+    results = {}
+    for route, future in futures.items():
+        remaining = max(deadline - (time.time() - start), 0)
+        try:
+            status, payload = future.result(timeout=remaining)
+        except TimeoutError:
+            logger.error(f'{route} call exceeded {deadline}s deadline')
+            status, payload = 'error', f'Deadline {deadline}s exceeded'
+        results[route] = {'status': status, 'payload': payload}
+    logger.info(f'Node status collected in {time.time() - start:.3f}s')
+    return results
+
+
+def print_node_info_section(node_info):
+    if node_info['status'] == NodeStatuses.NOT_CREATED.value:
+        print(TEXTS['service']['node_not_registered'])
+    else:
+        print_node_info(node_info, get_node_status(int(node_info['status'])))
+
+
+STATUS_SECTIONS = {
+    'node/info': ('Node', lambda p: print_node_info_section(p['node_info'])),
+    'node/exit/status': ('Exit status', print_exit_status),
+    'wallet/info': ('Wallet', print_wallet_info),
+    'health/containers': ('Containers', print_containers),
+    'health/schains': ('sChains healthchecks', print_schains_healthchecks),
+    'health/sgx': ('SGX', print_sgx_info),
+    'schains/list': ('sChains', print_schains),
+    'schains/dkg-statuses': ('DKG statuses', print_dkg_statuses),
+    'ssl/status': ('SSL', print_ssl_status)
+}
+
+
+def print_status_report(results):
+    for route, result in results.items():
+        title, printer = STATUS_SECTIONS[route]
+        print(f'{title}\n{LONG_LINE}')
+        if result['status'] == 'ok':
+            try:
+                printer(result['payload'])
+            except Exception:
+                logger.exception(f'Rendering {route} failed')
+                print(f'Failed to render {route} response')
+        else:
+            print(f'Failed: {result["payload"]}')
+        print()
+
+
+def show_status(format=None, deadline=STATUS_CALL_DEADLINE):
+    ensure_admin_available()
+    results = fetch_status(deadline)
+    if format == 'json':
+        print(json.dumps(results))
+    else:
+        print_status_report(results)
+    if any(r['status'] != 'ok' for r in results.values()):
+        sys.exit(CLIExitCodes.BAD_API_RESPONSE)
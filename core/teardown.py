@@ -0,0 +1,140 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Removal of sChain and IMA containers. Containers are stopped with the
+graceful stop timeout and removed in parallel, at most max_workers at a
+time, sChain containers are submitted first
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from configs import (CONTAINER_STOP_TIMEOUT, DYNAMIC_CONTAINER_PREFIXES,
+                     TEARDOWN_MAX_WORKERS, TEARDOWN_WORKERS_ENV_VAR)
+
+
+logger = logging.getLogger(__name__)
+
+
+class TeardownError(Exception):
+    def __init__(self, report):
+        self.report = report
+        super().__init__('Failed to remove containers: ' + ', '.join(
+            report.failed))
+
+
+class TeardownReport:
+    def __init__(self, total):
+        self.total = total
+        self.removed = []
+        self.failed = {}
+        self.elapsed = 0
+        self.lock = threading.Lock()
+
+    @property
+    def done(self):
+        return len(self.removed) + len(self.failed)
+
+
+def get_max_workers():
+    value = os.environ.get(TEARDOWN_WORKERS_ENV_VAR)
+    if value and value.isdigit() and int(value) > 0:
+        return int(value)
+    return TEARDOWN_MAX_WORKERS
+
+
+def list_dynamic_containers(api, prefixes=DYNAMIC_CONTAINER_PREFIXES):
+    """(id, name) pairs, in the order of prefixes"""
+    found = []
+    for prefix in prefixes:
+        containers = api.containers(all=True, filters={'name': prefix})
+        found.extend(sorted(
+            (container['Id'], name.lstrip('/'))
+            for container in containers
+            for name in container['Names'][:1]
+            if name.lstrip('/').startswith(prefix)
+        ))
+    return found
+
+
+def compose_docker_api(max_workers):
+    """Low-level docker client keeping connections of every worker"""
+    import docker
+    from docker.utils import kwargs_from_env
+    return docker.APIClient(num_pools=max_workers, **kwargs_from_env())
+
+
+def remove_container(api, container_id, name, stop_timeout):
+    from docker.errors import NotFound
+    start = time.monotonic()
+    try:
+        api.stop(container_id, timeout=stop_timeout)
+        api.remove_container(container_id)
+    except NotFound:
+        logger.info(f'{name} is already removed')
+    return time.monotonic() - start
+
+
+def remove_dynamic_containers(api=None, max_workers=None,
+                              stop_timeout=CONTAINER_STOP_TIMEOUT,
+                              prefixes=DYNAMIC_CONTAINER_PREFIXES, out=None):
+    """Raises TeardownError if some containers are not removed"""
+    max_workers = max_workers or get_max_workers()
+    out = out or sys.stdout
+    if api is None:
+        api = compose_docker_api(max_workers)
+    start = time.monotonic()
+    containers = list_dynamic_containers(api, prefixes)
+    report = TeardownReport(len(containers))
+    if not containers:
+        logger.info('No sChain and IMA containers to remove')
+        return report
+    print(f'Removing {len(containers)} sChain and IMA containers, '
+          f'{max_workers} at a time ...', file=out)
+
+    def remove(container_id, name):
+        try:
+            duration = remove_container(api, container_id, name,
+                                        stop_timeout)
+        except Exception as err:
+            logger.exception(f'Failed to remove {name}')
+            with report.lock:
+                report.failed[name] = err
+                print(f'Failed to remove {name}: {err} '
+                      f'({report.done}/{report.total})', file=out)
+            return
+        with report.lock:
+            report.removed.append(name)
+            print(f'Removed {name} in {duration:.1f}s '
+                  f'({report.done}/{report.total})', file=out)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for container_id, name in containers:
+            pool.submit(remove, container_id, name)
+    report.elapsed = time.monotonic() - start
+    print(f'{len(report.removed)} containers removed in '
+          f'{report.elapsed:.1f}s', file=out)
+    if report.failed:
+        raise TeardownError(report)
+    return report
@@ -13,26 +13,6 @@ export BACKUP_CONTRACTS_DIR="$SKALE_DIR"/.old_contracts_info
 export BASE_SERVICES="transaction-manager skale-admin skale-api mysql sla bounty nginx watchdog filebeat"
 export NOTIFICATION_SERVICES="celery redis"
 
-remove_dynamic_containers () {
-    echo 'Removing schains containers ...'
-    SCHAIN_CONTAINERS="$(docker ps -a --format '{{.Names}}' | grep '^skale_schain_' | awk '{print $1}' | xargs)"
-    for CONTAINER in $SCHAIN_CONTAINERS; do
-        echo 'Stopping' $CONTAINER
-        docker stop $CONTAINER -t 40
-        echo 'Removing' $CONTAINER
-        docker rm $CONTAINER
-    done
-
-    echo 'Removing ima containers...'
-    IMA_CONTAINERS="$(docker ps -a --format '{{.Names}}' | grep '^skale_ima_' | awk '{print $1}' | xargs)"
-    for CONTAINER in $IMA_CONTAINERS; do
-        echo 'Stopping' $CONTAINER
-        docker stop $CONTAINER -t 40
-        echo 'Removing' $CONTAINER
-        docker rm $CONTAINER
-    done
-}
-
 remove_compose_containers () {
     echo 'Removing node containers ...'
     COMPOSE_PATH=$SKALE_DIR/config/docker-compose.yml
@@ -58,6 +38,54 @@ download_filestorage_artifacts () {
     curl -L $FS_ARTIFACTS_URL > $FILESTORAGE_ARTIFACTS_FILE
 }
 
+update_container_configs () {
+    cd $CONFIG_DIR
+    if [[ -z $CONTAINER_CONFIGS_DIR ]]; then
+        if [[ ! -d .git ]]; then
+            echo "Cloning container configs ..."
+            git clone "https://github.com/skalenetwork/skale-node.git" "$CONFIG_DIR"
+        fi
+        echo "Fetching new branches and tags..."
+        git fetch
+        echo "Checkouting to container configs branch $CONTAINER_CONFIGS_STREAM ..."
+        git checkout $CONTAINER_CONFIGS_STREAM
+        is_branch="$(git show-ref --verify refs/heads/$CONTAINER_CONFIGS_STREAM >/dev/null 2>&1; echo $?)"
+        if [[ $is_branch -eq 0 ]] ; then
+          echo "Pulling recent changes from $CONTAINER_CONFIGS_STREAM ..."
+          git pull
+        fi
+    else
+        echo "Syncing container configs ..."
+        rsync -r "$CONTAINER_CONFIGS_DIR/" "$CONFIG_DIR"
+        rsync -r "$CONTAINER_CONFIGS_DIR/.git" "$CONFIG_DIR"
+    fi
+    cd -
+}
+
+fetch_container_configs () {
+    if [[ -z $CONTAINER_CONFIGS_DIR && -d $CONFIG_DIR/.git ]]; then
+        echo "Fetching new branches and tags..."
+        cd $CONFIG_DIR
+        git fetch
+        cd -
+    fi
+}
+
+stage_container_configs () {
+    echo "Staging container configs in $STAGED_CONFIG_DIR ..."
+    mkdir -p "$STAGED_CONFIG_DIR"
+    rsync -a --delete "$CONFIG_DIR/" "$STAGED_CONFIG_DIR"
+    CONFIG_DIR="$STAGED_CONFIG_DIR" update_container_configs
+}
+
+link_env_file () {
+    echo "Creating .env symlink to $CONFIG_DIR/.env ..."
+    if [[ -f $CONFIG_DIR/.env ]]; then
+        rm "$CONFIG_DIR/.env"
+    fi
+    ln -sf "$SKALE_DIR/.env" "$CONFIG_DIR/.env"
+}
+
 backup_old_contracts () {
     echo "Copying old contracts ABI ..."
     cp -R $CONTRACTS_DIR $BACKUP_CONTRACTS_DIR
@@ -78,6 +106,15 @@ update_docker_lvmpy_sources () {
     fi
 }
 
+fetch_docker_lvmpy_sources () {
+    if [[ -d docker-lvmpy ]]; then
+        echo 'Fetching docker-lvmpy changes ...'
+        cd docker-lvmpy
+        git fetch
+        cd -
+    fi
+}
+
 docker_lvmpy_install () {
     echo 'Installing docker-lvmpy ...'
     if [[ ! -d docker-lvmpy ]]; then
@@ -148,6 +185,27 @@ configure_filebeat () {
     sudo chmod go-w $NODE_DATA_DIR/filebeat.yml
 }
 
+compose_services () {
+    if [[ "$MONITORING_CONTAINERS" != "True" ]]; then
+        echo "$BASE_SERVICES"
+        if [[ ! -z "$TG_API_KEY" && ! -z "$TG_CHAT_ID" ]]; then
+            echo "$NOTIFICATION_SERVICES"
+        fi
+    fi
+}
+
+prepare_images () {
+    cd $CONFIG_DIR
+    if [[ ! -z $CONTAINER_CONFIGS_DIR ]]; then
+        echo "Building containers ..."
+        SKALE_DIR=$SKALE_DIR docker-compose -f docker-compose.yml build
+    else
+        echo "Pulling new version of images ..."
+        SKALE_DIR=$SKALE_DIR docker-compose -f docker-compose.yml pull $(compose_services)
+    fi
+    cd -
+}
+
 up_compose() {
     if [[ "$MONITORING_CONTAINERS" == "True"  ]]; then
         echo "Running SKALE Node with monitoring containers..."
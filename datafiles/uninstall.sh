@@ -3,8 +3,7 @@
 export CURRENT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" >/dev/null 2>&1 && pwd )"
 source $CURRENT_DIR/helper.sh
 
-remove_compose_containers
-remove_dynamic_containers
+# containers are removed by the CLI before
 
 # todo: format disk setted in $NODE_DATA_DIR/disk_mountpoint.txt
 
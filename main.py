@@ -17,7 +17,19 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
 import sys
+
+from configs import RESIDENT_ENV_VAR
+from tools import profiler
+
+if __name__ == '__main__' and os.environ.get(RESIDENT_ENV_VAR):
+    from tools.resident_client import run_resident
+    run_resident(sys.argv)
+
+if __name__ == '__main__':
+    profiler.enable_from_env()
+
 import time
 import logging
 import inspect
@@ -26,26 +38,31 @@ import traceback
 import click
 
 from cli import __version__
-from cli.health import health_cli
 from cli.info import BUILD_DATETIME, COMMIT, BRANCH, OS, VERSION
-from cli.logs import logs_cli
-from cli.node import node_cli
-from cli.schains import schains_cli
-from cli.wallet import wallet_cli
-from cli.ssl import ssl_cli
-from cli.exit import exit_cli
-from cli.validate import validate_cli
-from cli.resources_allocation import resources_allocation_cli
-from tools.helper import safe_load_texts, init_default_logger
 from configs import LONG_LINE
-from core.host import init_logs_dir
-
-TEXTS = safe_load_texts()
+from tools.lazy_group import LazyGroup
 
 logger = logging.getLogger(__name__)
 
 
-@click.group()
+LAZY_COMMANDS = {
+    'health': 'cli.health:health_cli',
+    'schains': 'cli.schains:schains_cli',
+    'logs': 'cli.logs:logs_cli',
+    'resources-allocation':
+        'cli.resources_allocation:resources_allocation_cli',
+    'node': 'cli.node:node_cli',
+    'wallet': 'cli.wallet:wallet_cli',
+    'ssl': 'cli.ssl:ssl_cli',
+    'exit': 'cli.exit:exit_cli',
+    'validate': 'cli.validate:validate_cli',
+    'debug': 'cli.debug:debug_cli',
+    'resident': 'cli.resident:resident_cli',
+    'batch': 'cli.batch:batch_cli'
+}
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 def cli():
     pass
 
@@ -73,6 +90,44 @@ def info():
         '''))
 
 
+def set_timeout(ctx, param, value):
+    if value is None:
+        return
+    if value <= 0:
+        raise click.BadParameter('should be greater than 0')
+    from tools.api_client import set_api_timeout
+    set_api_timeout(value)
+
+
+TIMEOUT_OPTION = click.Option(
+    ['--timeout'],
+    type=float,
+    default=None,
+    expose_value=False,
+    is_eager=True,
+    callback=set_timeout,
+    help='Timeout in seconds for skale-admin API calls'
+)
+
+
+def set_no_cache(ctx, param, value):
+    if value:
+        from tools.api_client import disable_api_cache
+        disable_api_cache()
+
+
+NO_CACHE_OPTION = click.Option(
+    ['--no-cache'],
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=set_no_cache,
+    help='Ignore cached skale-admin API responses'
+)
+
+cli.params.extend([TIMEOUT_OPTION, NO_CACHE_OPTION])
+
+
 def handle_exception(exc_type, exc_value, exc_traceback):
     if issubclass(exc_type, KeyboardInterrupt):
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
@@ -85,27 +140,19 @@ sys.excepthook = handle_exception
 
 if __name__ == '__main__':
     start_time = time.time()
-    init_logs_dir()
-    init_default_logger()
+    profiler.add('import', time.perf_counter() - profiler.PROCESS_START)
+    with profiler.phase('logger_init'):
+        from core.host import init_logs_dir
+        from tools.helper import init_default_logger
+        init_logs_dir()
+        init_default_logger()
     args = sys.argv
     # todo: hide secret variables (passwords, private keys)
     logger.info(f'cmd: {" ".join(str(x) for x in args)}, v.{__version__}')
 
-    cmd_collection = click.CommandCollection(
-        sources=[
-            cli,
-            health_cli,
-            schains_cli,
-            logs_cli,
-            resources_allocation_cli,
-            node_cli,
-            wallet_cli,
-            ssl_cli,
-            exit_cli,
-            validate_cli
-        ])
     try:
-        cmd_collection()
+        with profiler.phase('command'):
+            cli()
     except Exception as err:
         print(f'Command execution failed with {err}. Recheck your inputs')
         traceback.print_exc()
@@ -12,14 +12,18 @@ a = Analysis(
     binaries=[],
     datas=[
        ("./text.yml", "data"),
-       ("./datafiles/install.sh", "data/datafiles"),
+       ("./text.yml.cache", "data"),
        ("./datafiles/backup-install.sh", "data/datafiles"),
-       ("./datafiles/update.sh", "data/datafiles"),
        ("./datafiles/helper.sh", "data/datafiles"),
        ("./datafiles/turn-off.sh", "data/datafiles"),
        ("./datafiles/turn-on.sh", "data/datafiles")
     ],
-    hiddenimports=[],
+    # subcommand modules are imported lazily by name, see LAZY_COMMANDS
+    hiddenimports=[
+        'cli.health', 'cli.schains', 'cli.logs', 'cli.resources_allocation',
+        'cli.node', 'cli.wallet', 'cli.ssl', 'cli.exit', 'cli.validate',
+        'cli.debug', 'cli.resident', 'cli.batch'
+    ],
     hookspath=[],
     runtime_hooks=[],
     excludes=[],
@@ -40,6 +40,9 @@ echo "VERSION = '$VERSION'" >> $DIST_INFO_FILEPATH
 
 EXECUTABLE_NAME=skale-$VERSION-$OS
 
+# precompiled texts catalog bundled next to text.yml
+(cd $PARENT_DIR && python -m tools.texts)
+
 pyinstaller --onefile main.spec --hidden-import=eth_hash.backends.pysha3
 
 mv $PARENT_DIR/dist/main $PARENT_DIR/dist/$EXECUTABLE_NAME
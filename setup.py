@@ -29,6 +29,10 @@ extras_require = {
         "pytest-cov==2.9.0",
         "twine==2.0.0",
         "mock==4.0.2"
+    ],
+    # zstd compressed log segments and API responses
+    'zstd': [
+        "zstandard>=0.15"
     ]
 }
 
@@ -65,7 +69,7 @@ setup(
     extras_require=extras_require,
 
     keywords=['skale', 'cli'],
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Intended Audience :: Developers',
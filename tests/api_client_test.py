@@ -0,0 +1,147 @@
+import json
+import os
+import socket
+
+import pytest
+import requests
+
+from configs.routes import (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT,
+                            RouteNotFoundException)
+from tests.helper import AdminHandler
+from tools.api_client import ApiClient, compose_api_client, get_api_client
+from tools.cache import ResponseCache
+
+
+def test_get_timeout():
+    client = ApiClient()
+    assert client.get_timeout('node', 'info') == (
+        DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    assert client.get_timeout('node', 'register')[1] > DEFAULT_READ_TIMEOUT
+    client.timeout = 1.5
+    assert client.get_timeout('node', 'register') == (1.5, 1.5)
+    client.timeout = 10
+    assert client.get_timeout('node', 'info') == (DEFAULT_CONNECT_TIMEOUT, 10)
+
+
+def test_shared_client():
+    assert get_api_client() is get_api_client()
+
+
+def test_unknown_route():
+    with pytest.raises(RouteNotFoundException):
+        ApiClient().get('node', 'unknown')
+
+
+def test_keep_alive(admin_server):
+    client = ApiClient(host=admin_server)
+    for _ in range(3):
+        response = client.get('node', 'info')
+        assert response.json()['payload'] == '/api/v1/node/info'
+    assert len(AdminHandler.peers) == 1
+    client.close()
+
+
+def test_retry_on_unavailable(admin_server):
+    AdminHandler.fails_left = 2
+    client = ApiClient(host=admin_server)
+    response = client.get('schains', 'list')
+    assert response.status_code == 200
+    assert AdminHandler.fails_left == 0
+    client.close()
+
+
+def test_read_timeout_not_retried(admin_server):
+    AdminHandler.delay = 0.5
+    client = ApiClient(host=admin_server)
+    client.timeout = 0.2
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get('schains', 'list')
+    assert AdminHandler.requests == 1
+    client.close()
+
+
+def test_cached_get_json(admin_server, tmp_path):
+    client = ApiClient(host=admin_server)
+    client.cache = ResponseCache(str(tmp_path))
+    expected = {'status': 'ok', 'payload': '/api/v1/schains/list'}
+    assert client.get_json('schains', 'list') == expected
+    assert client.get_json('schains', 'list') == expected
+    assert AdminHandler.requests == 1
+
+    client.use_cache = False
+    assert client.get_json('schains', 'list') == expected
+    assert AdminHandler.requests == 2
+    client.close()
+
+
+def test_revalidation(admin_server, tmp_path):
+    client = ApiClient(host=admin_server)
+    client.cache = ResponseCache(str(tmp_path))
+    client.cache.store('node/info', None, b'{"status": "ok", "payload": 1}',
+                       {'ETag': '"v1"'})
+    entry = client.cache.get('node/info')
+    with open(entry.meta_path) as meta_file:
+        meta = json.load(meta_file)
+    meta['stored_at'] = 0
+    with open(entry.meta_path, 'w') as meta_file:
+        json.dump(meta, meta_file)
+
+    assert client.get_json('node', 'info') == {'status': 'ok', 'payload': 1}
+    assert AdminHandler.requests == 1
+    assert client.cache.get('node/info').is_fresh()
+    client.close()
+
+
+def test_stream(admin_server, tmp_path):
+    client = ApiClient(host=admin_server)
+    client.cache = ResponseCache(str(tmp_path))
+    params = {'schain_name': 'test'}
+    expected = b'{"status": "ok", "payload": "/api/v1/schains/config?schain_name=test"}'
+    with client.stream('schains', 'config', params=params) as body:
+        assert b''.join(body) == expected
+        body.ok = True
+    assert client.cache.get('schains/config', params).read() == expected
+
+    with client.stream('schains', 'config', params=params) as body:
+        assert b''.join(body) == expected
+    assert AdminHandler.requests == 1
+    client.close()
+
+
+def test_zstd_response(admin_server, admin_socket):
+    pytest.importorskip('zstandard')
+    AdminHandler.zstd = True
+    for client in (ApiClient(host=admin_server), compose_api_client(admin_socket)):
+        assert 'zstd' in client.session.headers['Accept-Encoding']
+        response = client.get('node', 'info')
+        assert response.headers['Content-Encoding'] == 'zstd'
+        assert response.json() == {'status': 'ok', 'payload': '/api/v1/node/info'}
+        client.close()
+
+
+def test_unix_socket(admin_socket):
+    client = compose_api_client(admin_socket)
+    assert client.transport == 'unix'
+    for _ in range(3):
+        response = client.get('schains', 'get', params={'schain_name': 'a'})
+        assert response.json()['payload'] == \
+            '/api/v1/schains/get?schain_name=a'
+    assert AdminHandler.requests == 3
+    assert client.session.get_adapter(client.host).pool.num_connections == 1
+    client.close()
+
+
+def test_unix_socket_fallback(tmp_path):
+    client = compose_api_client(os.path.join(str(tmp_path), 'missing.sock'))
+    assert client.transport == 'tcp'
+    assert client.construct_url('/api/v1/node/info') == \
+        'http://localhost:3007/api/v1/node/info'
+
+
+def test_stale_unix_socket_fallback(tmp_path):
+    socket_path = os.path.join(str(tmp_path), 'stale.sock')
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.close()
+    assert os.path.exists(socket_path)
+    assert compose_api_client(socket_path).transport == 'tcp'
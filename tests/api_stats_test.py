@@ -0,0 +1,83 @@
+import os
+
+from tests.helper import AdminHandler
+from tools.api_client import ApiClient
+from tools.api_stats import ApiStats, percentile, summarize
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_record_and_load(tmp_path):
+    stats = ApiStats(os.path.join(str(tmp_path), 'stats.tsv'))
+    stats.record('node/info', 200, 120,
+                 {'connect': 0.002, 'ttfb': 0.01, 'total': 0.02})
+    stats.record('node/info', 'error', 0, {'total': 3}, retries=3)
+    records = stats.load()
+    assert len(records) == 2
+    assert records[0]['route'] == 'node/info'
+    assert records[0]['status'] == '200'
+    assert records[0]['bytes'] == 120
+    assert records[0]['connect'] == 2.0
+    assert records[0]['total'] == 20.0
+    assert records[1]['retries'] == 3
+    assert stats.load(since=records[1]['ts'] + 1) == []
+
+    summary = summarize(records)
+    assert summary == [{
+        'route': 'node/info', 'calls': 2, 'errors': 1, 'retries': 3,
+        'p50': 20.0, 'p95': 3000.0, 'p99': 3000.0, 'ttfb_p50': 0.0,
+        'avg_bytes': 60
+    }]
+
+
+def test_missing_logs_dir(tmp_path):
+    stats = ApiStats(os.path.join(str(tmp_path), 'missing', 'stats.tsv'))
+    stats.record('node/info', 200, 1, {})
+    assert stats.load() == []
+
+
+def test_trim(tmp_path):
+    stats = ApiStats(os.path.join(str(tmp_path), 'stats.tsv'), max_bytes=2000)
+    for _ in range(100):
+        stats.record('schains/list', 200, 10, {'total': 0.001})
+    assert os.path.getsize(stats.path) <= 2000
+    records = stats.load()
+    assert 0 < len(records) < 100
+
+
+def test_client_records_stats(admin_server, tmp_path):
+    client = ApiClient(host=admin_server)
+    client.stats = ApiStats(os.path.join(str(tmp_path), 'stats.tsv'))
+    AdminHandler.fails_left = 1
+    client.get('node', 'info')
+    with client.get_stream('logs', 'dump') as response:
+        body = response.content
+    client.close()
+
+    info, dump = client.stats.load()
+    assert info['route'] == 'node/info'
+    assert info['status'] == '200'
+    assert info['retries'] == 1
+    assert info['connect'] > 0
+    assert info['total'] >= info['ttfb'] > 0
+    assert dump['route'] == 'logs/dump'
+    assert dump['bytes'] == len(body)
+    assert dump['connect'] == 0
+
+
+def test_client_records_errors(tmp_path):
+    client = ApiClient(host='http://127.0.0.1:1', retries=0)
+    client.stats = ApiStats(os.path.join(str(tmp_path), 'stats.tsv'))
+    try:
+        client.get('node', 'info')
+    except Exception:
+        pass
+    record, = client.stats.load()
+    assert record['status'] == 'error'
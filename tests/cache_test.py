@@ -0,0 +1,64 @@
+import json
+import os
+import time
+
+import mock
+import pytest
+
+from tools.api_client import ResponseStream
+from tools.cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path))
+
+
+def test_store_and_get(cache):
+    assert cache.get('node/info') is None
+    body = json.dumps({'status': 'ok', 'payload': 1}).encode()
+    cache.store('node/info', None, body, {'ETag': '"abc"'})
+    entry = cache.get('node/info')
+    assert entry.is_fresh()
+    assert entry.read() == body
+    assert entry.conditional_headers() == {'If-None-Match': '"abc"'}
+
+
+def test_params_key(cache):
+    cache.store('schains/get', {'schain_name': 'a'}, b'a')
+    cache.store('schains/get', {'schain_name': 'b'}, b'b')
+    assert cache.get('schains/get', {'schain_name': 'a'}).read() == b'a'
+    assert cache.get('schains/get', {'schain_name': 'b'}).read() == b'b'
+    assert cache.get('schains/get', {'schain_name': 'c'}) is None
+
+
+def test_expired_and_touch(cache):
+    cache.store('node/info', None, b'{}')
+    entry = cache.get('node/info')
+    entry.stored_at = time.time() - entry.ttl - 1
+    assert not entry.is_fresh()
+    cache.touch(entry)
+    assert cache.get('node/info').is_fresh()
+
+
+def test_invalidate(cache):
+    cache.store('schains/list', None, b'[]')
+    cache.store('schains/config', {'schain_name': 'a'}, b'{}')
+    cache.store('node/info', None, b'{}')
+    cache.invalidate('schains/repair')
+    assert cache.get('schains/list') is None
+    assert cache.get('schains/config', {'schain_name': 'a'}) is None
+    assert cache.get('node/info') is not None
+    cache.invalidate('node/set-domain-name')
+    assert cache.get('node/info') is None
+
+
+def test_failed_write_is_dropped(cache):
+    writer = cache.open_writer('schains/config', {'schain_name': 'a'})
+    writer.body_file.write = mock.Mock(side_effect=OSError('No space left'))
+    body = ResponseStream(iter([b'{"a"', b': 1}']), writer)
+    body.ok = True
+    assert b''.join(body) == b'{"a": 1}'
+    body.close()
+    assert cache.get('schains/config', {'schain_name': 'a'}) is None
+    assert not os.listdir(cache.route_path('schains/config'))
@@ -0,0 +1,65 @@
+import json
+import os
+
+from tools.checkpoints import Checkpoints
+from tools.dag import Step
+
+KEY = {'procedure': 'update', 'version': '2.0.0', 'config_stream': '2.0.0'}
+
+
+def test_record_and_resume(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    output = tmp_path / 'manager.json'
+    output.write_text('abi')
+    step = Step('manager ABI', None, inputs={'url': 'http://abi'},
+                outputs=[str(output)])
+    checkpoints = Checkpoints(KEY, path=path)
+    assert os.path.isfile(path)
+    checkpoints.record(step)
+    with open(path) as f:
+        assert list(json.load(f)['steps']) == ['manager ABI']
+
+    resumed = Checkpoints(KEY, path=path, resume=True)
+    assert resumed.is_recorded(step)
+    assert resumed.outputs_unchanged(step)
+    output.write_text('changed abi')
+    assert not resumed.outputs_unchanged(step)
+    other_url = Step('manager ABI', None, inputs={'url': 'http://new-abi'})
+    assert not resumed.is_recorded(other_url)
+
+
+def test_other_key_is_ignored(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    step = Step('images', None, inputs={'cmd': ['prepare_images']})
+    Checkpoints(KEY, path=path).record(step)
+    assert not Checkpoints({**KEY, 'config_stream': '2.1.0'}, path=path,
+                           resume=True).is_recorded(step)
+    # state of the other key is replaced
+    assert not Checkpoints(KEY, path=path, resume=True).is_recorded(step)
+
+
+def test_records_are_kept_without_resume(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    images = Step('images', None, inputs={'cmd': ['prepare_images']})
+    removal = Step('compose containers removal', None)
+    checkpoints = Checkpoints(KEY, path=path, kept=['images'])
+    checkpoints.record(images)
+    assert checkpoints.interrupted == []
+    checkpoints.record(removal)
+
+    plain = Checkpoints(KEY, path=path, kept=['images'])
+    assert plain.is_recorded(images)
+    assert not plain.is_recorded(removal)
+    assert plain.interrupted == ['compose containers removal']
+    resumed = Checkpoints(KEY, path=path, resume=True, kept=['images'])
+    assert resumed.is_recorded(removal)
+
+
+def test_clear(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    checkpoints = Checkpoints(KEY, path=path)
+    checkpoints.record(Step('images', None))
+    checkpoints.clear()
+    assert not os.path.exists(path)
+    checkpoints.clear()
+    assert Checkpoints(KEY, path=path, resume=True).records == {}
@@ -0,0 +1,139 @@
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from tests.helper import AdminHandler
+from tools.api_client import ApiClient, get_api_client
+from tools.circuit_breaker import AdminUnavailable, CircuitBreaker
+from tools.exit_codes import CLIExitCodes
+from tools.helper import get_request
+
+
+@pytest.fixture
+def closed_port_host():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f'http://127.0.0.1:{port}'
+
+
+@pytest.fixture
+def breaker(tmp_path):
+    return CircuitBreaker(os.path.join(str(tmp_path), 'circuit'),
+                          open_period=5)
+
+
+def read_state(breaker):
+    with open(breaker.path) as state_file:
+        return json.load(state_file)
+
+
+def test_probe(admin_server, closed_port_host):
+    assert ApiClient(host=admin_server).probe()
+    assert not ApiClient(host=closed_port_host).probe()
+
+
+def test_probe_opens_breaker(closed_port_host, breaker):
+    client = ApiClient(host=closed_port_host, breaker=breaker)
+    start = time.perf_counter()
+    with pytest.raises(AdminUnavailable):
+        client.get('node', 'info')
+    assert time.perf_counter() - start < 1
+    assert read_state(breaker)['state'] == 'open'
+
+    probes = []
+    client.probe = lambda: probes.append(1)
+    with pytest.raises(AdminUnavailable):
+        client.get('node', 'info')
+    assert probes == []
+
+
+def test_half_open_closes_breaker(admin_server, breaker):
+    breaker.write_state({'state': 'open', 'opened_at': time.time() - 10})
+    client = ApiClient(host=admin_server, breaker=breaker)
+    assert client.get('node', 'info').status_code == 200
+    assert not os.path.exists(breaker.path)
+    client.close()
+
+
+def test_half_open_probe_fails(closed_port_host, breaker):
+    opened_at = time.time() - 10
+    breaker.write_state({'state': 'open', 'opened_at': opened_at})
+    client = ApiClient(host=closed_port_host, breaker=breaker)
+    with pytest.raises(AdminUnavailable):
+        client.get('node', 'info')
+    assert read_state(breaker)['opened_at'] > opened_at
+
+
+def test_connection_error_opens_breaker(closed_port_host, breaker):
+    client = ApiClient(host=closed_port_host, retries=0, breaker=breaker)
+    client.probe = lambda: True
+    with pytest.raises(AdminUnavailable):
+        client.get('node', 'info')
+    assert read_state(breaker)['state'] == 'open'
+    assert not breaker.checked
+
+
+@pytest.fixture
+def dropping_host():
+    """Accepts connections and closes them without a response"""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(5)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            conn.recv(65536)
+            conn.close()
+    threading.Thread(target=serve, daemon=True).start()
+    yield f'http://127.0.0.1:{server.getsockname()[1]}'
+    server.close()
+
+
+def test_dropped_response_keeps_breaker_closed(dropping_host, breaker):
+    client = ApiClient(host=dropping_host, retries=0, breaker=breaker)
+    client.probe = lambda: True
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get('node', 'info')
+    assert not os.path.exists(breaker.path)
+
+
+def test_unix_connection_error_opens_breaker(tmp_path, breaker):
+    socket_path = os.path.join(str(tmp_path), 'stale.sock')
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.close()
+    client = ApiClient(socket_path=socket_path, retries=0, breaker=breaker)
+    client.probe = lambda: True
+    with pytest.raises(AdminUnavailable):
+        client.get('node', 'info')
+    assert read_state(breaker)['state'] == 'open'
+
+
+def test_probe_once_per_process(admin_server, breaker):
+    client = ApiClient(host=admin_server, breaker=breaker)
+    probes = []
+    client.probe = lambda: probes.append(1) or True
+    for _ in range(3):
+        client.get('node', 'info')
+    assert probes == [1]
+    assert AdminHandler.requests == 3
+    client.close()
+
+
+def test_get_request_exit_code(monkeypatch, breaker):
+    breaker.open(reason='test')
+    monkeypatch.setattr(get_api_client(), 'breaker', breaker)
+    with pytest.raises(SystemExit) as exc_info:
+        get_request('node', 'info')
+    assert exc_info.value.code == CLIExitCodes.ADMIN_UNAVAILABLE
@@ -0,0 +1,144 @@
+import io
+import json
+import threading
+import time
+
+import mock
+import requests
+
+from main import cli
+from core.batch import BatchRunner, is_read_command, parse_commands
+from tests.helper import response_mock, run_command
+
+
+WALLET_PAYLOAD = {'address': '0x123', 'eth_balance_wei': 10 ** 18,
+                  'skale_balance_wei': 0, 'eth_balance': '1',
+                  'skale_balance': '0'}
+
+
+def run_batch(commands, params=[]):
+    result = run_command(cli, ['batch'] + params, input=commands)
+    return result, [json.loads(line) for line in result.output.splitlines()]
+
+
+def test_parse_commands():
+    commands = list(parse_commands([
+        'node info --format json', '', '# comment', '["version", "--short"]',
+        '{"args": ["wallet", "info"], "id": "w"}', 'node "info',
+        '{"id": 1}', '--timeout 1 version', 'resident stop',
+        'logs cli --follow', 'logs cli -n 10 -f'
+    ]))
+    assert [(c.line, c.id, c.args) for c in commands[:3]] == [
+        (1, None, ['node', 'info', '--format', 'json']),
+        (4, None, ['version', '--short']),
+        (5, 'w', ['wallet', 'info'])
+    ]
+    assert [c.error is None for c in commands] == \
+        [True] * 3 + [False] * 6
+    assert commands[-3].error == 'resident can\'t be run in batch'
+    assert commands[-1].error == '--follow can\'t be used in batch'
+    assert list(parse_commands(['logs cli -n 10']))[0].error is None
+
+
+def test_is_read_command():
+    assert is_read_command(['version', '--short'])
+    assert is_read_command(['schains', 'ls'])
+    assert is_read_command(['node', 'info', '-f', 'json'])
+    assert not is_read_command(['node', 'register'])
+    assert not is_read_command(['logs', 'dump', '/tmp'])
+
+
+def test_batch():
+    resp_mock = response_mock(
+        requests.codes.ok,
+        json_data={'payload': WALLET_PAYLOAD, 'status': 'ok'}
+    )
+    commands = 'version --short\n{"args": ["wallet", "info"], "id": 2}\n' \
+        'no-such-command\n'
+    with mock.patch('requests.Session.get', return_value=resp_mock):
+        result, results = run_batch(commands)
+    assert result.exit_code == 1
+    assert [(r['line'], r['args'], r['exit_code']) for r in results] == [
+        (1, ['version', '--short'], 0),
+        (2, ['wallet', 'info'], 0),
+        (3, ['no-such-command'], 2)
+    ]
+    assert results[0]['stdout'] == '0.0.0\n'
+    assert results[1]['id'] == 2
+    assert 'Address: 0x123' in results[1]['stdout']
+    assert 'No such command' in results[2]['stderr']
+
+
+def test_batch_read_commands_concurrently():
+    resp_mock = response_mock(
+        requests.codes.ok,
+        json_data={'payload': WALLET_PAYLOAD, 'status': 'ok'}
+    )
+
+    def slow_get(*args, **kwargs):
+        time.sleep(0.3)
+        return resp_mock
+
+    commands = 'wallet info\n' * 4
+    start = time.monotonic()
+    with mock.patch('requests.Session.get', new=slow_get):
+        result, results = run_batch(commands)
+    assert time.monotonic() - start < 1.2
+    assert result.exit_code == 0
+    assert [r['line'] for r in results] == [1, 2, 3, 4]
+    assert all('Address: 0x123' in r['stdout'] for r in results)
+
+    start = time.monotonic()
+    with mock.patch('requests.Session.get', new=slow_get):
+        result, results = run_batch(commands, ['--workers', '1'])
+    assert time.monotonic() - start >= 1.2
+    assert len(results) == 4
+
+
+def test_batch_write_command_is_barrier():
+    calls = []
+
+    def get(*args, **kwargs):
+        calls.append(('get', time.monotonic()))
+        time.sleep(0.2)
+        return response_mock(
+            requests.codes.ok,
+            json_data={'payload': WALLET_PAYLOAD, 'status': 'ok'}
+        )
+
+    def post(*args, **kwargs):
+        calls.append(('post', time.monotonic()))
+        return response_mock(requests.codes.ok,
+                             json_data={'payload': {}, 'status': 'ok'})
+
+    commands = 'wallet info\nnode maintenance-on --yes\nwallet info\n'
+    with mock.patch('requests.Session.get', new=get), \
+            mock.patch('requests.Session.post', new=post):
+        result, results = run_batch(commands)
+    assert result.exit_code == 0, result.output
+    assert [call[0] for call in calls] == ['get', 'post', 'get']
+    assert calls[1][1] - calls[0][1] >= 0.2
+
+
+def test_batch_captures_threads_output():
+    class ThreadedCommand:
+        def main(self, args, prog_name):
+            print('from command')
+            thread = threading.Thread(
+                target=lambda: print(f'from thread of {args[0]}'))
+            thread.start()
+            thread.join()
+
+    out = io.StringIO()
+    start = threading.Thread.start
+    with mock.patch('sys.stdout', new=io.StringIO()) as real_stdout:
+        runner = BatchRunner(ThreadedCommand(), out=out)
+        failed = runner.run(parse_commands(['version', 'info']))
+    assert failed == 0
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r['stdout'] for r in results] == [
+        'from command\nfrom thread of version\n',
+        'from command\nfrom thread of info\n'
+    ]
+    assert real_stdout.getvalue() == ''
+    assert threading.Thread.start is start
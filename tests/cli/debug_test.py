@@ -0,0 +1,53 @@
+import cProfile
+import json
+import os
+
+import mock
+
+from cli.debug import api_stats, profile
+from tests.helper import run_command
+from tools.api_stats import ApiStats
+
+
+def test_api_stats(tmp_path):
+    stats = ApiStats(os.path.join(str(tmp_path), 'stats.tsv'))
+    with mock.patch('core.debug.ApiStats', return_value=stats):
+        result = run_command(api_stats)
+        assert result.exit_code == 0
+        assert result.output == 'No skale-admin API calls recorded in the last 60 minutes\n'  # noqa
+
+        stats.record('node/info', 200, 100, {'ttfb': 0.004, 'total': 0.005})
+        result = run_command(api_stats, ['--format', 'json'])
+        assert result.exit_code == 0
+        assert json.loads(result.output) == [{
+            'route': 'node/info', 'calls': 1, 'errors': 0, 'retries': 0,
+            'p50': 5.0, 'p95': 5.0, 'p99': 5.0, 'ttfb_p50': 4.0,
+            'avg_bytes': 100
+        }]
+
+        result = run_command(api_stats, ['--window', '5'])
+        assert result.exit_code == 0
+        assert 'node/info' in result.output
+        assert '5.0' in result.output
+
+
+def test_profile(tmp_path):
+    data_path = str(tmp_path)
+    process = mock.Mock(pid=42)
+    process.wait.return_value = 3
+
+    def popen(cmd, env):
+        assert cmd[-2:] == ['version', '--short']
+        assert env['SKALE_CLI_PROFILE'] == 'full'
+        profile = cProfile.Profile()
+        profile.runcall(sum, range(10))
+        profile.dump_stats(os.path.join(data_path, 'profile-42.prof'))
+        return process
+
+    with mock.patch('core.debug.subprocess.Popen', new=popen), \
+            mock.patch('core.debug.profile_prefix',
+                       new=lambda pid: os.path.join(data_path, f'profile-{pid}')):
+        result = run_command(profile, ['-n', '3', 'version', '--short'])
+    assert result.exit_code == 3
+    assert 'sum' in result.output
+    assert 'profile-42.*' in result.output
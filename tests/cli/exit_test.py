@@ -15,6 +15,6 @@ def test_exit_status(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, status, ['--format', 'json'])
+    result = run_command_mock('requests.Session.get', resp_mock, status, ['--format', 'json'])
     assert result.exit_code == 0
     assert result.output == "{'status': 'ACTIVE', 'data': [{'name': 'test', 'status': 'ACTIVE'}], 'exit_time': 0}\n" # noqa
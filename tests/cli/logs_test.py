@@ -25,7 +25,7 @@ import requests
 
 from io import BytesIO
 from tests.helper import response_mock, run_command
-from cli.logs import dump
+from cli.logs import cli, dump
 
 
 def test_dump(config):
@@ -37,11 +37,47 @@ def test_dump(config):
         },
         raw=BytesIO()
     )
-    with mock.patch('requests.get') as req_get_mock:
-        req_get_mock.return_value.__enter__.return_value = resp_mock
+    with mock.patch('requests.Session.get') as req_get_mock:
+        req_get_mock.return_value = resp_mock
         result = run_command(dump, ['.'])
         assert result.exit_code == 0
         assert result.output == f'File {archive_filename} downloaded\n'
 
     if os.path.exists(archive_filename):
         os.remove(archive_filename)
+
+
+def test_cli_logs(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    with open(log_path, 'w') as log_file:
+        log_file.write(
+            '2021-04-01 10:00:00,100 - main - INFO - first\n'
+            '2021-04-01 10:05:00,100 - main - ERROR - second\n'
+            'Traceback (most recent call last):\n'
+            '2021-04-01 10:10:00,100 - main - INFO - third\n'
+        )
+    index_dir = os.path.join(str(tmp_path), 'index')
+    with mock.patch('core.logs.LOG_FILEPATH', log_path), \
+            mock.patch('core.logs.LOG_INDEX_PATH', index_dir):
+        result = run_command(cli)
+        assert result.exit_code == 0
+        assert result.output.count('\n') == 4
+
+        result = run_command(cli, ['--lines', '2'])
+        assert result.output == 'Traceback (most recent call last):\n' \
+            '2021-04-01 10:10:00,100 - main - INFO - third\n'
+
+        result = run_command(cli, ['--since', '2021-04-01 10:01:00'])
+        assert result.output.startswith('2021-04-01 10:05:00')
+        assert result.output.count('\n') == 3
+
+        result = run_command(cli, ['--since', '2021-04-01', '-n', '1'])
+        assert result.output == '2021-04-01 10:10:00,100 - main - INFO - third\n'
+
+        result = run_command(cli, ['--since', 'yesterday'])
+        assert result.exit_code == 2
+    assert os.listdir(index_dir) == ['node-cli.log.idx.json']
+
+    with mock.patch('core.logs.LOG_FILEPATH', log_path + '.missing'):
+        result = run_command(cli)
+        assert result.exit_code == 1
@@ -17,9 +17,11 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import subprocess
+import sys
 
 from cli import info
-from main import version
+from main import LAZY_COMMANDS, cli, version
 from tests.helper import run_command
 
 
@@ -29,3 +31,31 @@ def test_version(config):
     assert result.output == expected
     result = run_command(version, ['--short'])
     assert result.output == f'{info.VERSION}\n'
+
+
+def test_timeout_option():
+    result = run_command(cli, ['--timeout', '0', 'version'])
+    assert result.exit_code == 2
+    assert 'should be greater than 0' in result.output
+
+
+def test_lazy_commands():
+    for name in LAZY_COMMANDS:
+        command = cli.get_command(None, name)
+        assert command.name == name
+    assert cli.list_commands(None) == sorted(
+        ['version', 'info', *LAZY_COMMANDS])
+
+
+def test_version_imports():
+    code = (
+        'import sys, main\n'
+        'main.cli(["version"], standalone_mode=False)\n'
+        'print(",".join(sorted(sys.modules)))'
+    )
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            stdout=subprocess.PIPE).stdout.decode()
+    modules = output.splitlines()[-1].split(',')
+    for module in ('cli.node', 'core.host', 'docker', 'requests', 'jinja2',
+                   'psutil', 'texttable', 'dateutil'):
+        assert module not in modules
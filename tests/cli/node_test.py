@@ -17,18 +17,33 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import json
 import os
+import re
+import subprocess
+import time
 from pathlib import Path
 
 import mock
+import pytest
 import requests
 
 from configs import NODE_DATA_PATH, SKALE_DIR
 from core.resources import ResourceAlloc
+from core.node import purge
+from core.status import fetch_status
+from core.teardown import TeardownError, TeardownReport
+from core import install
+from core.install import COMPOSE_REMOVAL
+from tools.dag import DONE, DONE_EARLIER, Step, StepsReport
+from tools.circuit_breaker import AdminUnavailable
+from tools.exit_codes import CLIExitCodes
+from tools.readiness import ReadinessReport
 from cli.node import (init_node, node_info, register_node, signature,
                       update_node, backup_node, restore_node,
                       set_node_in_maintenance,
-                      remove_node_from_maintenance, _turn_off, _turn_on, _set_domain_name)
+                      remove_node_from_maintenance, _turn_off, _turn_on, _set_domain_name,
+                      node_status)
 
 from tests.helper import (
     response_mock, run_command_mock,
@@ -36,6 +51,13 @@ from tests.helper import (
 )
 
 
+def update_report():
+    report = StepsReport([Step(COMPOSE_REMOVAL, None)])
+    report.results[COMPOSE_REMOVAL].status = DONE
+    report.results[COMPOSE_REMOVAL].started = 0
+    return report
+
+
 def disk_alloc_mock():
     return ResourceAlloc(128)
 
@@ -46,7 +68,7 @@ def test_register_node(config):
         {'status': 'ok', 'payload': None}
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         register_node,
         ['--name', 'test-node', '--ip', '0.0.0.0', '--port', '8080', '-d', 'skale.test'])
@@ -60,7 +82,7 @@ def test_register_node_with_error(config):
         {'status': 'error', 'payload': ['Strange error']},
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         register_node,
         ['--name', 'test-node2', '--ip', '0.0.0.0', '--port', '80', '-d', 'skale.test'])
@@ -74,7 +96,7 @@ def test_register_node_with_prompted_ip(config):
         {'status': 'ok', 'payload': None}
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         register_node,
         ['--name', 'test-node', '--port', '8080', '-d', 'skale.test'], input='0.0.0.0\n')
@@ -88,7 +110,7 @@ def test_register_node_with_default_port(config):
         {'status': 'ok', 'payload': None}
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         register_node,
         ['--name', 'test-node', '-d', 'skale.test'], input='0.0.0.0\n')
@@ -98,12 +120,14 @@ def test_register_node_with_default_port(config):
 
 def test_init_node(config):
     resp_mock = response_mock(requests.codes.created)
-    with mock.patch('subprocess.run', new=subprocess_run_mock), \
+    with mock.patch('tools.executor.run_streaming', new=subprocess_run_mock), \
             mock.patch('core.resources.get_disk_alloc', new=disk_alloc_mock), \
             mock.patch('core.node.prepare_host'), \
             mock.patch('core.host.init_data_dir'), \
-            mock.patch('core.node.is_base_containers_alive',
-                       return_value=True), \
+            mock.patch('core.node.run_node_steps',
+                       return_value=StepsReport([])), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()), \
             mock.patch('core.node.is_node_inited', return_value=False):
         result = run_command_mock(
             'tools.helper.post_request',
@@ -132,12 +156,14 @@ def test_update_node(config):
     os.makedirs(NODE_DATA_PATH, exist_ok=True)
     params = ['./tests/test-env', '--yes']
     resp_mock = response_mock(requests.codes.created)
-    with mock.patch('subprocess.run', new=subprocess_run_mock), \
+    with mock.patch('tools.executor.run_streaming', new=subprocess_run_mock), \
             mock.patch('core.node.get_flask_secret_key'), \
             mock.patch('core.node.save_env_params'), \
             mock.patch('core.node.prepare_host'), \
-            mock.patch('core.node.is_base_containers_alive',
-                       return_value=True), \
+            mock.patch('core.node.run_node_steps',
+                       return_value=update_report()), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()), \
             mock.patch('core.resources.get_disk_alloc', new=disk_alloc_mock), \
             mock.patch('core.host.init_data_dir'):
         result = run_command_mock(
@@ -147,19 +173,163 @@ def test_update_node(config):
             params,
             input='/dev/sdp')
         assert result.exit_code == 0
-        assert result.output == 'Updating the node...\nWaiting for transaction manager initialization ...\nUpdate procedure finished\n'  # noqa
+        assert re.fullmatch(
+            'Updating the node...\nWaiting for transaction manager initialization ...\n'  # noqa
+            r'Node was down for \d+\.\ds\nUpdate procedure finished\n',
+            result.output
+        )
+
+
+def test_update_node_prefetch_only(config):
+    os.makedirs(NODE_DATA_PATH, exist_ok=True)
+    with mock.patch('core.node.save_env_params') as save_env_params, \
+            mock.patch('core.node.prepare_host') as prepare_host, \
+            mock.patch('core.node.get_flask_secret_key'), \
+            mock.patch('core.node.compose_update_checkpoints'), \
+            mock.patch('core.node.run_node_steps',
+                       return_value=StepsReport([])) as run_node_steps:
+        result = run_command(
+            update_node, ['./tests/test-env', '--prefetch-only', '--yes'])
+    assert result.exit_code == 0
+    assert result.output == 'Prefetching the update...\nUpdate is prefetched, node update will start with the teardown\n'  # noqa
+    steps = run_node_steps.call_args[0][0]
+    assert COMPOSE_REMOVAL not in [step.name for step in steps]
+    save_env_params.assert_not_called()
+    prepare_host.assert_not_called()
+
+
+def test_update_node_resume(config):
+    os.makedirs(NODE_DATA_PATH, exist_ok=True)
+    report = update_report()
+    report.results[COMPOSE_REMOVAL].status = DONE_EARLIER
+    report.results[COMPOSE_REMOVAL].started = None
+    with mock.patch('core.node.get_flask_secret_key'), \
+            mock.patch('core.node.save_env_params'), \
+            mock.patch('core.node.prepare_host'), \
+            mock.patch('core.node.compose_update_checkpoints') as checkpoints, \
+            mock.patch('core.node.reused_prefetch_steps', return_value=[]), \
+            mock.patch('core.node.run_node_steps', return_value=report), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()):
+        result = run_command(
+            update_node, ['./tests/test-env', '--resume', '--yes'])
+    assert result.exit_code == 0
+    assert result.output == 'Updating the node...\nWaiting for transaction manager initialization ...\nUpdate procedure finished\n'  # noqa
+    assert checkpoints.call_args[1] == {'resume': True}
+    checkpoints.return_value.clear.assert_called_once_with()
+
+
+def test_update_node_prefetch_invalid_env(config):
+    os.makedirs(NODE_DATA_PATH, exist_ok=True)
+    with mock.patch('core.node.extract_env_params', return_value=None), \
+            mock.patch('core.node.run_node_steps') as run_node_steps:
+        result = run_command(
+            update_node, ['./tests/test-env', '--prefetch-only', '--yes'])
+    assert result.exit_code == 0
+    assert result.output == 'Prefetching the update...\n'
+    run_node_steps.assert_not_called()
+
+
+class FakeUpdate:
+    """Update steps which record their calls and fail on demand"""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+
+    def call(self, name):
+        def func():
+            if name in self.failing:
+                raise RuntimeError(f'{name} failed')
+            self.calls.append(name)
+        return func
+
+    def compose_steps(self, env, prefetch_only=False):
+        prefetched = [step.name
+                      for step in install.compose_prefetch_steps(env)]
+        steps = [Step(name, self.call(name), inputs=env)
+                 for name in prefetched]
+        if prefetch_only:
+            return steps
+        return steps + [
+            Step(COMPOSE_REMOVAL, self.call(COMPOSE_REMOVAL),
+                 requires=prefetched),
+            Step(install.LVMPY, self.call(install.LVMPY),
+                 requires=[COMPOSE_REMOVAL]),
+            Step(install.CONTAINERS, self.call(install.CONTAINERS),
+                 requires=[install.LVMPY])
+        ]
+
+
+@pytest.fixture
+def fake_update(config, tmp_path, monkeypatch):
+    os.makedirs(NODE_DATA_PATH, exist_ok=True)
+    monkeypatch.setattr(install, 'STEPS_CHECKPOINTS_FILEPATH',
+                        str(tmp_path / 'steps-checkpoints.json'))
+    fake = FakeUpdate()
+    with mock.patch('core.node.compose_update_steps',
+                    new=fake.compose_steps), \
+            mock.patch('core.node.get_flask_secret_key', return_value='key'), \
+            mock.patch('core.node.save_env_params'), \
+            mock.patch('core.node.prepare_host'), \
+            mock.patch('core.node.update_meta'), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()):
+        yield fake
+
+
+def test_update_after_prefetch(fake_update):
+    prefetched = [step.name for step in install.compose_prefetch_steps(
+        {'MANAGER_CONTRACTS_ABI_URL': '', 'IMA_CONTRACTS_ABI_URL': ''})]
+    result = run_command(
+        update_node, ['./tests/test-env', '--prefetch-only', '--yes'])
+    assert result.exit_code == 0
+    assert sorted(fake_update.calls) == sorted(prefetched)
+
+    fake_update.calls.clear()
+    result = run_command(update_node, ['./tests/test-env', '--yes'])
+    assert result.exit_code == 0
+    assert fake_update.calls == [
+        COMPOSE_REMOVAL, install.LVMPY, install.CONTAINERS]
+    assert 'Reusing steps prefetched earlier: ' + \
+        ', '.join(install.PREFETCH_STEPS) in result.output
+    assert 'Update procedure finished' in result.output
+    assert not os.path.exists(install.STEPS_CHECKPOINTS_FILEPATH)
+
+
+def test_update_after_interrupted_update(fake_update):
+    fake_update.failing.add(install.LVMPY)
+    run_command(update_node, ['./tests/test-env', '--yes'])
+    assert COMPOSE_REMOVAL in fake_update.calls
+
+    fake_update.calls.clear()
+    fake_update.failing.clear()
+    result = run_command(update_node, ['./tests/test-env', '--yes'])
+    assert result.exit_code == CLIExitCodes.SCRIPT_EXECUTION_ERROR.value
+    assert fake_update.calls == []
+    assert f'interrupted after these steps: {COMPOSE_REMOVAL}' in \
+        result.output
+    assert 'skale node update --resume' in result.output
+
+    result = run_command(update_node,
+                         ['./tests/test-env', '--resume', '--yes'])
+    assert result.exit_code == 0
+    assert fake_update.calls == [install.LVMPY, install.CONTAINERS]
+    assert 'Update procedure finished' in result.output
 
 
 def test_update_node_without_init(config):
     params = ['./tests/test-env', '--yes']
     resp_mock = response_mock(requests.codes.created)
-    with mock.patch('subprocess.run', new=subprocess_run_mock), \
+    with mock.patch('tools.executor.run_streaming', new=subprocess_run_mock), \
             mock.patch('core.node.get_flask_secret_key'), \
             mock.patch('core.node.save_env_params'), \
             mock.patch('core.node.prepare_host'), \
             mock.patch('core.host.init_data_dir'), \
-            mock.patch('core.node.is_base_containers_alive',
-                       return_value=True), \
+            mock.patch('core.node.run_node_steps',
+                       return_value=StepsReport([])), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()), \
             mock.patch('core.node.is_node_inited', return_value=False):
         result = run_command_mock(
             'tools.helper.post_request',
@@ -190,7 +360,7 @@ def test_node_info_node_info(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, node_info)
+    result = run_command_mock('requests.Session.get', resp_mock, node_info)
     assert result.exit_code == 0
     assert result.output == '--------------------------------------------------\nNode info\nName: test\nID: 32\nIP: 0.0.0.0\nPublic IP: 1.1.1.1\nPort: 10001\nDomain name: skale.test\nStatus: Active\n--------------------------------------------------\n'  # noqa
 
@@ -214,7 +384,7 @@ def test_node_info_node_info_not_created(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, node_info)
+    result = run_command_mock('requests.Session.get', resp_mock, node_info)
     assert result.exit_code == 0
     assert result.output == 'This SKALE node is not registered on SKALE Manager yet\n'
 
@@ -238,7 +408,7 @@ def test_node_info_node_info_frozen(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, node_info)
+    result = run_command_mock('requests.Session.get', resp_mock, node_info)
     assert result.exit_code == 0
     assert result.output == '--------------------------------------------------\nNode info\nName: test\nID: 32\nIP: 0.0.0.0\nPublic IP: 1.1.1.1\nPort: 10001\nDomain name: skale.test\nStatus: Frozen\n--------------------------------------------------\n'  # noqa
 
@@ -262,7 +432,7 @@ def test_node_info_node_info_left(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, node_info)
+    result = run_command_mock('requests.Session.get', resp_mock, node_info)
     assert result.exit_code == 0
     assert result.output == '--------------------------------------------------\nNode info\nName: test\nID: 32\nIP: 0.0.0.0\nPublic IP: 1.1.1.1\nPort: 10001\nDomain name: skale.test\nStatus: Left\n--------------------------------------------------\n'  # noqa
 
@@ -286,7 +456,7 @@ def test_node_info_node_info_leaving(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, node_info)
+    result = run_command_mock('requests.Session.get', resp_mock, node_info)
     assert result.exit_code == 0
     assert result.output == '--------------------------------------------------\nNode info\nName: test\nID: 32\nIP: 0.0.0.0\nPublic IP: 1.1.1.1\nPort: 10001\nDomain name: skale.test\nStatus: Leaving\n--------------------------------------------------\n'  # noqa
 
@@ -310,7 +480,7 @@ def test_node_info_node_info_in_maintenance(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, node_info)
+    result = run_command_mock('requests.Session.get', resp_mock, node_info)
     assert result.exit_code == 0
     assert result.output == '--------------------------------------------------\nNode info\nName: test\nID: 32\nIP: 0.0.0.0\nPublic IP: 1.1.1.1\nPort: 10001\nDomain name: skale.test\nStatus: In Maintenance\n--------------------------------------------------\n'  # noqa
 
@@ -322,7 +492,7 @@ def test_node_signature():
         'payload': {'signature': signature_sample}
     }
     resp_mock = response_mock(requests.codes.ok, json_data=response_data)
-    result = run_command_mock('tools.helper.requests.get',
+    result = run_command_mock('requests.Session.get',
                               resp_mock, signature, ['1'])
     assert result.exit_code == 0
     assert result.output == f'Signature: {signature_sample}\n'
@@ -350,7 +520,9 @@ def test_restore():
     )
     backup_path = result.output.replace(
         'Backup archive succesfully created: ', '').replace('\n', '')
-    with mock.patch('subprocess.run', new=subprocess_run_mock):
+    with mock.patch('tools.executor.run_streaming', new=subprocess_run_mock), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()):
         result = run_command(
             restore_node,
             [backup_path, './tests/test-env']
@@ -365,7 +537,7 @@ def test_maintenance_on():
         {'status': 'ok', 'payload': None}
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         set_node_in_maintenance,
         ['--yes'])
@@ -379,7 +551,7 @@ def test_maintenance_off():
         {'status': 'ok', 'payload': None}
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         remove_node_from_maintenance)
     assert result.exit_code == 0
@@ -391,9 +563,10 @@ def test_turn_off_maintenance_on():
         requests.codes.ok,
         {'status': 'ok', 'payload': None}
     )
-    with mock.patch('subprocess.run', new=subprocess_run_mock):
+    with mock.patch('tools.executor.run_streaming', new=subprocess_run_mock), \
+            mock.patch('core.node.remove_dynamic_containers'):
         result = run_command_mock(
-            'tools.helper.requests.post',
+            'requests.Session.post',
             resp_mock,
             _turn_off,
             [
@@ -404,15 +577,57 @@ def test_turn_off_maintenance_on():
     assert result.output == 'Setting maintenance mode on...\nNode is successfully set in maintenance mode\nTuring off the node...\nNode was successfully turned off\n'  # noqa
 
 
+def test_purge():
+    calls = mock.Mock()
+    with mock.patch('core.node.run_cmd', new=calls.run_cmd), \
+            mock.patch('core.node.remove_dynamic_containers',
+                       new=calls.remove_dynamic_containers):
+        purge()
+    names = [name for name, _, _ in calls.mock_calls]
+    assert names == ['run_cmd', 'remove_dynamic_containers', 'run_cmd']
+    compose_cmd = calls.mock_calls[0][1][0]
+    assert compose_cmd[0] == 'bash'
+    assert compose_cmd[2].endswith('remove_compose_containers')
+    assert calls.mock_calls[2][1][0][0] == 'sudo'
+
+
+def test_purge_compose_removal_failed(capsys):
+    with mock.patch('core.node.run_cmd', side_effect=subprocess.CalledProcessError(
+                1, 'docker-compose')) as run_cmd, \
+            mock.patch('core.node.remove_dynamic_containers') as remove, \
+            pytest.raises(SystemExit) as exc:
+        purge()
+    assert exc.value.code == CLIExitCodes.SCRIPT_EXECUTION_ERROR
+    assert run_cmd.call_count == 1
+    remove.assert_not_called()
+    assert 'Node containers removal failed' in capsys.readouterr().out
+
+
+def test_purge_teardown_failed(capsys):
+    report = TeardownReport(1)
+    report.failed['skale_schain_test'] = 'timeout'
+    with mock.patch('core.node.run_cmd') as run_cmd, \
+            mock.patch('core.node.remove_dynamic_containers',
+                       side_effect=TeardownError(report)), \
+            pytest.raises(SystemExit) as exc:
+        purge()
+    assert exc.value.code == CLIExitCodes.SCRIPT_EXECUTION_ERROR
+    assert run_cmd.call_count == 1
+    assert 'Failed to remove containers: skale_schain_test' in \
+        capsys.readouterr().out
+
+
 def test_turn_on_maintenance_off():
     resp_mock = response_mock(
         requests.codes.ok,
         {'status': 'ok', 'payload': None}
     )
-    with mock.patch('subprocess.run', new=subprocess_run_mock), \
-            mock.patch('core.node.get_flask_secret_key'):
+    with mock.patch('tools.executor.run_streaming', new=subprocess_run_mock), \
+            mock.patch('core.node.get_flask_secret_key'), \
+            mock.patch('core.node.wait_for_node',
+                       return_value=ReadinessReport()):
         result = run_command_mock(
-            'tools.helper.requests.post',
+            'requests.Session.post',
             resp_mock,
             _turn_on,
             [
@@ -432,8 +647,100 @@ def test_set_domain_name():
         {'status': 'ok', 'payload': None}
     )
     result = run_command_mock(
-        'tools.helper.requests.post',
+        'requests.Session.post',
         resp_mock,
         _set_domain_name, ['-d', 'skale.test', '--yes'])
     assert result.exit_code == 0
-    assert result.output == 'Setting new domain name: skale.test\nDomain name successfully changed\n'  # noqa
\ No newline at end of file
+    assert result.output == 'Setting new domain name: skale.test\nDomain name successfully changed\n'  # noqa
+
+
+STATUS_PAYLOADS = {
+    '/api/v1/node/info': {'node_info': {'status': 5}},
+    '/api/v1/node/exit/status': {'status': 'ACTIVE', 'data': []},
+    '/api/v1/wallet/info': {
+        'address': '0xAA', 'eth_balance': 1, 'skale_balance': 2
+    },
+    '/api/v1/health/containers': [],
+    '/api/v1/health/schains': [],
+    '/api/v1/health/sgx': {
+        'sgx_server_url': 'https://127.0.0.1:1026',
+        'sgx_wallet_version': '1.50.1-stable.0',
+        'sgx_keyname': 'test_keyname',
+        'status_name': 'CONNECTED'
+    },
+    '/api/v1/schains/list': [],
+    '/api/v1/schains/dkg-statuses': [],
+    '/api/v1/ssl/status': {'is_empty': True}
+}
+
+
+def status_get_mock(session, url, **kwargs):
+    route = url.replace('http://localhost:3007', '')
+    if route == '/api/v1/health/sgx':
+        raise requests.exceptions.ConnectionError('SGX is down')
+    return response_mock(
+        requests.codes.ok,
+        json_data={'status': 'ok', 'payload': STATUS_PAYLOADS[route]}
+    )
+
+
+def test_node_status():
+    with mock.patch('requests.Session.get', new=status_get_mock):
+        result = run_command(node_status, ['--format', 'json'])
+    assert result.exit_code == 3
+    data = json.loads(result.output)
+    assert list(data) == [
+        'node/info', 'node/exit/status', 'wallet/info',
+        'health/containers', 'health/schains', 'health/sgx',
+        'schains/list', 'schains/dkg-statuses', 'ssl/status'
+    ]
+    assert data['wallet/info'] == {
+        'status': 'ok', 'payload': STATUS_PAYLOADS['/api/v1/wallet/info']
+    }
+    assert data['health/sgx']['status'] == 'error'
+
+    with mock.patch('requests.Session.get', new=status_get_mock):
+        result = run_command(node_status)
+    assert result.exit_code == 3
+    assert 'Wallet\n' in result.output
+    assert 'Address: 0xaa' in result.output
+    assert 'SGX\n--------------------------------------------------\nFailed: Request failed' in result.output  # noqa
+    assert 'This SKALE node is not registered on SKALE Manager yet' in result.output
+    assert 'No SSL certificates on the node' in result.output
+
+
+def test_node_status_invalid_deadline():
+    for deadline in ('0', '-1'):
+        result = run_command(node_status, ['--deadline', deadline])
+        assert result.exit_code == 2
+        assert 'should be greater than 0' in result.output
+
+
+def test_node_status_deadline():
+    def slow_get_mock(session, url, **kwargs):
+        if url.endswith('/wallet/info'):
+            time.sleep(5)
+        return status_get_mock(session, url, **kwargs)
+
+    start = time.time()
+    with mock.patch('requests.Session.get', new=slow_get_mock):
+        results = fetch_status(deadline=0.5)
+    assert time.time() - start < 2
+    assert results['wallet/info'] == {
+        'status': 'error', 'payload': 'Deadline 0.5s exceeded'
+    }
+    assert results['ssl/status']['status'] == 'ok'
+
+
+def test_node_status_admin_unavailable_midway():
+    def breaker_get_mock(session, url, **kwargs):
+        if url.endswith('/schains/list'):
+            raise AdminUnavailable('skale-admin is unavailable')
+        return status_get_mock(session, url, **kwargs)
+
+    with mock.patch('requests.Session.get', new=breaker_get_mock):
+        results = fetch_status(deadline=5)
+    assert results['schains/list'] == {
+        'status': 'error', 'payload': 'skale-admin is unavailable'
+    }
+    assert results['wallet/info']['status'] == 'ok'
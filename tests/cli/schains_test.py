@@ -17,12 +17,13 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import json
 import os
 import time
 
 import requests
 
-from tests.helper import response_mock, run_command_mock
+from tests.helper import response_mock, run_command_mock, stream_response_mock
 from cli.schains import (get_schain_config, ls, dkg, show_rules,
                          repair, info_)
 
@@ -49,7 +50,7 @@ def test_ls(config):
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, ls)
+    result = run_command_mock('requests.Session.get', resp_mock, ls)
     assert result.exit_code == 0
     assert result.output == '    Name       Owner   Size   Lifetime        Created At              Deposit      \n-----------------------------------------------------------------------------------\ntest_schain1   0x123   0      5          Oct 03 2019 16:09:45   1000000000000000000\ncrazy_cats1    0x321   0      5          Oct 07 2019 18:30:10   1000000000000000000\n'  # noqa
 
@@ -70,12 +71,12 @@ def test_dkg():
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get',
+    result = run_command_mock('requests.Session.get',
                               resp_mock, dkg)
     assert result.exit_code == 0
     assert result.output == '  sChain Name      DKG Status          Added At         sChain Status\n---------------------------------------------------------------------\nmelodic-aldhibah   IN_PROGRESS   Jan 08 2020 15:26:52   Exists       \n'  # noqa
 
-    result = run_command_mock('tools.helper.requests.get',
+    result = run_command_mock('requests.Session.get',
                               resp_mock, dkg, ['--all'])
     assert result.exit_code == 0
     assert result.output == '  sChain Name      DKG Status          Added At         sChain Status\n---------------------------------------------------------------------\nmelodic-aldhibah   IN_PROGRESS   Jan 08 2020 15:26:52   Exists       \n'  # noqa
@@ -116,15 +117,69 @@ def test_get_schain_config():
                  'publicIP': '3.3.3.3'
                  }]}
     }
-    resp_mock = response_mock(
+    resp_mock = stream_response_mock(
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get',
+    result = run_command_mock('requests.Session.get',
                               resp_mock,
                               get_schain_config, ['test1'])
     assert result.exit_code == 0
-    assert result.output == "{'nodeInfo': {'basePort': 10011,\n              'bindIP': '123.123.123.123',\n              'httpRpcPort': 10009,\n              'httpsRpcPort': 11118,\n              'nodeID': 2,\n              'nodeName': 'testnet-1',\n              'wsRpcPort': 10118,\n              'wssRpcPort': 13219},\n 'sChain': {'nodes': [{'basePort': 10011,\n                       'httpRpcPort': 10013,\n                       'httpsRpcPort': 10018,\n                       'ip': '213.13.123.13',\n                       'nodeID': 2,\n                       'nodeName': 'testnet-1',\n                       'owner': '0xe3213',\n                       'publicIP': '1.1.1.1',\n                       'publicKey': 'public_key',\n                       'schainIndex': 1,\n                       'wsRpcPort': 10014,\n                       'wssRpcPort': 10019},\n                      {'basePort': 10077,\n                       'httpRpcPort': 10079,\n                       'httpsRpcPort': 10084,\n                       'ip': '2.2.2.2',\n                       'nodeID': 0,\n                       'nodeName': 'testnet-2',\n                       'owner': '0x323',\n                       'publicIP': '3.3.3.3',\n                       'publicKey': 'public_key352',\n                       'schainIndex': 2,\n                       'wsRpcPort': 10080,\n                       'wssRpcPort': 10085}],\n            'schainID': 1,\n            'schainName': 'test1'}}\n"  # noqa
+    assert result.output == json.dumps(payload, indent=4) + '\n'
+
+    result = run_command_mock('requests.Session.get',
+                              resp_mock,
+                              get_schain_config,
+                              ['test1', '--path', 'sChain.nodes[*].ip'])
+    assert result.exit_code == 0
+    assert result.output == '"213.13.123.13"\n"2.2.2.2"\n'
+
+    result = run_command_mock('requests.Session.get',
+                              resp_mock,
+                              get_schain_config,
+                              ['test1', '--path', 'sChain.nodes[1]'])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == payload['sChain']['nodes'][1]
+
+    result = run_command_mock('requests.Session.get',
+                              resp_mock,
+                              get_schain_config,
+                              ['test1', '--path', 'nodeInfo[0'])
+    assert result.exit_code == 2
+
+
+def test_get_schain_config_error():
+    resp_mock = stream_response_mock(
+        requests.codes.ok,
+        json_data={'payload': ['No such sChain'], 'status': 'error'}
+    )
+    result = run_command_mock('requests.Session.get',
+                              resp_mock,
+                              get_schain_config, ['test1'])
+    assert result.exit_code == 3
+    assert result.output == 'Command failed with following errors:\n--------------------------------------------------\nNo such sChain\n--------------------------------------------------\nYou can find more info in tests/.skale/.skale-cli-log/debug-node-cli.log\n'  # noqa
+
+
+def test_get_schain_config_status_order():
+    payload = {'sChain': {'schainName': 'test1', 'nodes': [{'ip': '2.2.2.2'}]}}
+    for data in ({'status': 'ok', 'payload': payload},
+                 {'payload': payload, 'status': 'ok'}):
+        resp_mock = stream_response_mock(requests.codes.ok, json_data=data)
+        result = run_command_mock('requests.Session.get', resp_mock,
+                                  get_schain_config, ['test1'])
+        assert result.exit_code == 0
+        assert result.output == json.dumps(payload, indent=4) + '\n'
+
+    resp_mock = stream_response_mock(
+        requests.codes.ok,
+        json_data={'payload': {'error': 'No such sChain'}, 'status': 'error'}
+    )
+    result = run_command_mock('requests.Session.get', resp_mock,
+                              get_schain_config, ['test2', '--path', 'error'])
+    assert result.exit_code == 3
+    assert result.output.startswith('Command failed with following errors:')
+    assert 'No such sChain' in result.output
+    assert '"No such sChain"\n' not in result.output
 
 
 def test_schain_rules():
@@ -145,7 +200,7 @@ def test_schain_rules():
         json_data={'payload': payload, 'status': 'ok'}
     )
     result = run_command_mock(
-        'tools.helper.requests.get', resp_mock, show_rules, ['schain-test'])
+        'requests.Session.get', resp_mock, show_rules, ['schain-test'])
     assert result.exit_code == 0
     print(repr(result.output))
     assert result.output == 'Port       Ip    \n-----------------\n10000   127.0.0.1\n10001   127.0.0.1\n10002   None     \n10003   None     \n10004   127.0.0.1\n10005   127.0.0.1\n10007   None     \n10008   None     \n'  # noqa
@@ -159,7 +214,7 @@ def test_repair():
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.post', resp_mock, repair,
+    result = run_command_mock('requests.Session.post', resp_mock, repair,
                               ['test-schain', '--yes'])
     assert result.output == 'Schain has been set for repair\n'
     assert result.exit_code == 0
@@ -169,7 +224,7 @@ def test_repair():
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'error'}
     )
-    result = run_command_mock('tools.helper.requests.post', resp_mock, repair,
+    result = run_command_mock('requests.Session.post', resp_mock, repair,
                               ['test-schain', '--yes'])
     print(repr(result.output))
     assert result.exit_code == 3
@@ -188,7 +243,7 @@ def test_info():
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'ok'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, info_,
+    result = run_command_mock('requests.Session.get', resp_mock, info_,
                               ['attractive-ed-asich'])
     assert result.output == '       Name                                           Id                                                     Owner                      Part_of_node   Dkg_status   Is_deleted   First_run   Repair_mode\n--------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------\nattractive-ed-asich   0xfb3b68013fa494407b691b4b603d84c66076c0a5ac96a7d6b162d7341d74fa61   0x1111111111111111111111111111111111111111   0              3            False        False       False      \n'  # noqa
     assert result.exit_code == 0
@@ -198,7 +253,7 @@ def test_info():
         requests.codes.ok,
         json_data={'payload': payload, 'status': 'error'}
     )
-    result = run_command_mock('tools.helper.requests.get', resp_mock, info_,
+    result = run_command_mock('requests.Session.get', resp_mock, info_,
                               ['schain not found'])
     assert result.output == 'Command failed with following errors:\n--------------------------------------------------\nerror\n--------------------------------------------------\nYou can find more info in tests/.skale/.skale-cli-log/debug-node-cli.log\n'  # noqa
     assert result.exit_code == 3
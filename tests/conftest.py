@@ -19,10 +19,17 @@
 """ SKALE config test """
 
 
+import os
+import shutil
+import threading
+from http.server import ThreadingHTTPServer
+
 import pytest
 
 from readsettings import ReadSettings
-from configs import CONFIG_FILEPATH
+from configs import API_CACHE_PATH, CIRCUIT_STATE_FILEPATH, CONFIG_FILEPATH
+from tools.api_client import get_api_client
+from tests.helper import AdminHandler, UnixAdminServer
 
 
 @pytest.fixture
@@ -32,3 +39,56 @@ def config(monkeypatch):
     cli_config.save()
     yield
     cli_config.clear()
+
+
+@pytest.fixture(autouse=True)
+def clean_api_cache():
+    yield
+    shutil.rmtree(API_CACHE_PATH, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def no_circuit_breaker(monkeypatch):
+    """Tests mock the session, so there is no skale-admin to probe"""
+    monkeypatch.setattr(get_api_client(), 'breaker', None)
+    yield
+    if os.path.isfile(CIRCUIT_STATE_FILEPATH):
+        os.remove(CIRCUIT_STATE_FILEPATH)
+
+
+@pytest.fixture(autouse=True)
+def api_stats_path(monkeypatch, tmp_path):
+    """API calls made by tests are recorded out of the tests tree"""
+    path = os.path.join(str(tmp_path), 'api-stats.tsv')
+    monkeypatch.setattr('tools.api_stats.API_STATS_FILEPATH', path)
+    monkeypatch.setattr(get_api_client().stats, 'path', path)
+    return path
+
+
+@pytest.fixture
+def admin_server():
+    AdminHandler.fails_left = 0
+    AdminHandler.delay = 0
+    AdminHandler.peers = set()
+    AdminHandler.requests = 0
+    AdminHandler.zstd = False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AdminHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def admin_socket(tmp_path):
+    AdminHandler.peers = set()
+    AdminHandler.requests = 0
+    AdminHandler.zstd = False
+    socket_path = os.path.join(str(tmp_path), 'admin.sock')
+    server = UnixAdminServer(socket_path, AdminHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
@@ -3,21 +3,29 @@ import time
 import docker
 import pytest
 
-from core.node import BASE_CONTAINERS_AMOUNT, is_base_containers_alive
+from core.readiness import COMPOSE_SERVICE_LABEL, wait_for_node
 
 dclient = docker.from_env()
 
 ALPINE_IMAGE_NAME = 'alpine:3.12'
 HELLO_WORLD_IMAGE_NAME = 'hello-world'
 CMD = 'sleep 10'
+SERVICES_AMOUNT = 5
+SERVICES = tuple(f'skale-test{i}' for i in range(SERVICES_AMOUNT))
+
+
+def wait_for_test_services(timeout=3):
+    return wait_for_node(services=SERVICES, admin_api=False, mysql=False,
+                         timeout=timeout)
 
 
 @pytest.fixture
 def skale_base_contianers():
     containers = [
         dclient.containers.run(ALPINE_IMAGE_NAME, detach=True,
-                               name=f'skale_test{i}', command=CMD)
-        for i in range(BASE_CONTAINERS_AMOUNT)
+                               name=f'skale_{name}',
+                               labels={COMPOSE_SERVICE_LABEL: name}, command=CMD)
+        for name in SERVICES
     ]
     yield containers
     for c in containers:
@@ -28,8 +36,9 @@ def skale_base_contianers():
 def skale_base_contianers_without_one():
     containers = [
         dclient.containers.run(ALPINE_IMAGE_NAME, detach=True,
-                               name=f'skale_test{i}', command=CMD)
-        for i in range(BASE_CONTAINERS_AMOUNT - 1)
+                               name=f'skale_{name}',
+                               labels={COMPOSE_SERVICE_LABEL: name}, command=CMD)
+        for name in SERVICES[:-1]
     ]
     yield containers
     for c in containers:
@@ -40,8 +49,8 @@ def skale_base_contianers_without_one():
 def skale_base_contianers_exited():
     containers = [
         dclient.containers.run(HELLO_WORLD_IMAGE_NAME, detach=True,
-                               name=f'skale_test{i}')
-        for i in range(BASE_CONTAINERS_AMOUNT)
+                               name=name)
+        for name in SERVICES
     ]
     time.sleep(10)
     yield containers
@@ -49,19 +58,47 @@ def skale_base_contianers_exited():
         c.remove(force=True)
 
 
-def test_is_base_containers_alive(skale_base_contianers):
-    cont = skale_base_contianers
-    print([c.name for c in cont])
-    assert is_base_containers_alive()
+@pytest.fixture
+def skale_base_contianers_unhealthy():
+    containers = [
+        dclient.containers.run(ALPINE_IMAGE_NAME, detach=True,
+                               name=f'skale_{name}',
+                               labels={COMPOSE_SERVICE_LABEL: name}, command=CMD,
+                               healthcheck={'test': ['CMD', 'false'],
+                                            'interval': 500000000,
+                                            'retries': 1})
+        for name in SERVICES
+    ]
+    yield containers
+    for c in containers:
+        c.remove(force=True)
+
+
+def test_wait_for_node(skale_base_contianers):
+    report = wait_for_test_services()
+    assert report.ok
+    assert set(report.ready) == set(SERVICES)
+
+
+def test_wait_for_node_one_failed(skale_base_contianers_without_one):
+    report = wait_for_test_services()
+    assert not report.ok
+    assert report.lagging == {SERVICES[-1]: 'not created'}
 
 
-def test_is_base_containers_alive_one_failed(skale_base_contianers_without_one):
-    assert not is_base_containers_alive()
+def test_wait_for_node_exited(skale_base_contianers_exited):
+    report = wait_for_test_services()
+    assert report.lagging == {name: 'exited' for name in SERVICES}
 
 
-def test_is_base_containers_alive_exited(skale_base_contianers_exited):
-    assert not is_base_containers_alive()
+def test_wait_for_node_unhealthy(skale_base_contianers_unhealthy):
+    report = wait_for_test_services()
+    assert not report.ok
+    assert all(state.startswith('running, ')
+               for state in report.lagging.values())
 
 
-def test_is_base_containers_alive_empty():
-    assert not is_base_containers_alive()
+def test_wait_for_node_empty():
+    report = wait_for_test_services(timeout=1)
+    assert not report.ok
+    assert len(report.lagging) == SERVICES_AMOUNT
@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+from tools.checkpoints import Checkpoints
+from tools.dag import (DONE, DONE_EARLIER, FAILED, SKIPPED, Step, check_graph,
+                       run_steps)
+
+
+def test_check_graph():
+    check_graph([Step('a', None), Step('b', None, requires=['a'])])
+    with pytest.raises(ValueError, match='Duplicate'):
+        check_graph([Step('a', None), Step('a', None)])
+    with pytest.raises(ValueError, match='unknown'):
+        check_graph([Step('a', None, requires=['c'])])
+    with pytest.raises(ValueError, match='circular requirements: a, b'):
+        check_graph([Step('a', None, requires=['b']),
+                     Step('b', None, requires=['a']),
+                     Step('c', None)])
+
+
+def test_independent_steps_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    order = []
+
+    def downloads():
+        barrier.wait()
+        order.append('download')
+
+    steps = [
+        Step('manager ABI', downloads),
+        Step('IMA ABI', downloads),
+        Step('images', downloads),
+        Step('up', lambda: order.append('up'),
+             requires=['manager ABI', 'IMA ABI', 'images'])
+    ]
+    report = run_steps(steps)
+    assert report.ok
+    assert order == ['download'] * 3 + ['up']
+    assert list(report.results) == ['manager ABI', 'IMA ABI', 'images', 'up']
+
+
+def test_timings():
+    steps = [Step('a', lambda: time.sleep(0.2)),
+             Step('b', lambda: time.sleep(0.2)),
+             Step('c', lambda: None, requires=['a', 'b'])]
+    report = run_steps(steps)
+    assert all(report.results[name].duration >= 0.2 for name in 'ab')
+    assert report.results['c'].started >= 0.2
+    assert report.sequential_time >= 0.4
+    assert report.elapsed < report.sequential_time
+
+
+def test_failure_skips_the_rest():
+    def fail():
+        raise RuntimeError('curl failed')
+
+    steps = [Step('configs', fail),
+             Step('lvmpy', lambda: time.sleep(0.2)),
+             Step('images', lambda: None, requires=['configs']),
+             Step('up', lambda: None, requires=['images', 'lvmpy'])]
+    report = run_steps(steps)
+    assert not report.ok
+    statuses = {name: result.status
+                for name, result in report.results.items()}
+    assert statuses == {'configs': FAILED, 'lvmpy': DONE,
+                        'images': SKIPPED, 'up': SKIPPED}
+    assert [result.name for result in report.failed] == ['configs']
+    assert str(report.failed[0].error) == 'curl failed'
+
+
+def statuses(report):
+    return {name: result.status for name, result in report.results.items()}
+
+
+def test_resume_skips_completed_steps(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    calls = []
+    fail_lvmpy = [True]
+
+    def call(name):
+        def func():
+            if name == 'lvmpy' and fail_lvmpy[0]:
+                raise RuntimeError('lvmpy update failed')
+            calls.append(name)
+        return func
+
+    def compose_steps(images_inputs='stable'):
+        return [
+            Step('configs', call('configs'), inputs='stream'),
+            Step('images', call('images'), requires=['configs'],
+                 inputs=images_inputs),
+            Step('removal', call('removal'), requires=['images']),
+            Step('lvmpy', call('lvmpy'), requires=['removal']),
+            Step('up', call('up'), requires=['lvmpy'])
+        ]
+
+    report = run_steps(compose_steps(), checkpoints=Checkpoints('k', path))
+    assert statuses(report)['lvmpy'] == FAILED
+
+    calls.clear()
+    fail_lvmpy[0] = False
+    report = run_steps(compose_steps(),
+                       checkpoints=Checkpoints('k', path, resume=True))
+    assert report.ok
+    assert calls == ['lvmpy', 'up']
+    assert statuses(report)['removal'] == DONE_EARLIER
+    assert report.results['removal'].started is None
+
+    calls.clear()
+    report = run_steps(compose_steps(images_inputs='new'),
+                       checkpoints=Checkpoints('k', path, resume=True))
+    assert calls == ['images', 'removal', 'lvmpy', 'up']
+    assert statuses(report)['configs'] == DONE_EARLIER
+
+
+def test_resume_checks_needed_outputs(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    staged = tmp_path / 'manager.json'
+    calls = []
+
+    def download():
+        calls.append('download')
+        staged.write_text('abi')
+
+    def compose_steps():
+        return [
+            Step('download', download, outputs=[str(staged)]),
+            Step('move', lambda: calls.append('move'),
+                 requires=['download'])
+        ]
+
+    run_steps(compose_steps(), checkpoints=Checkpoints('k', path))
+    staged.unlink()
+    calls.clear()
+    run_steps(compose_steps(), checkpoints=Checkpoints('k', path, True))
+    # staged file is consumed by the completed step
+    assert calls == []
+
+    checkpoints = Checkpoints('k', path, resume=True)
+    del checkpoints.records['move']
+    run_steps(compose_steps(), checkpoints=checkpoints)
+    assert calls == ['download', 'move']
@@ -0,0 +1,225 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tools import download
+from tools.api_client import ApiClient
+from tools.api_stats import ApiStats
+from tools.download import ChecksumMismatch, download_api_file, parse_checksum
+
+
+CONTENT = os.urandom(200 * 1024) + b'0' * 100 * 1024
+
+
+def gzip_bytes(data):
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as gzip_file:
+        gzip_file.write(data)
+    return buffer.getvalue()
+
+
+GZIP_CONTENT = gzip_bytes(CONTENT)
+FILENAME = 'skale-logs-dump-2021-04-01-10:00:00.tar.gz'
+
+
+class DumpHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    ranges = True
+    gzip = False
+    digest = None
+    drop_after = None
+    requests = []
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        DumpHandler.requests.append(range_header)
+        content = CONTENT
+        if self.gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            content = GZIP_CONTENT
+        start, end = 0, len(content) - 1
+        status = 200
+        match = re.match(r'bytes=(\d+)-(\d*)', range_header or '')
+        if match and self.ranges and self.headers.get('If-Range') == '"v1"':
+            status = 206
+            start = int(match.group(1))
+            end = int(match.group(2) or end)
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        body = content[start:end + 1]
+        self.send_response(status)
+        self.send_header('Content-Disposition',
+                         f'attachment; filename="{FILENAME}"')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        if self.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        if self.digest:
+            self.send_header('Digest', self.digest)
+        if content is GZIP_CONTENT:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if DumpHandler.drop_after is not None:
+            drop_after, DumpHandler.drop_after = DumpHandler.drop_after, None
+            self.wfile.write(body[:drop_after])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def dump_server(monkeypatch):
+    monkeypatch.setattr(download, 'RETRY_BACKOFF', 0)
+    DumpHandler.ranges = True
+    DumpHandler.gzip = False
+    DumpHandler.digest = None
+    DumpHandler.drop_after = None
+    DumpHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DumpHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(dump_server, tmp_path):
+    client = ApiClient(host=dump_server)
+    client.stats = ApiStats(os.path.join(str(tmp_path), 'stats.tsv'))
+    yield client
+    client.close()
+
+
+def fetch(client, dest, **kwargs):
+    filename = download_api_file(client, 'logs', 'dump', str(dest), **kwargs)
+    with open(os.path.join(str(dest), filename), 'rb') as f:
+        return filename, f.read()
+
+
+def sha256_digest(content):
+    digest = base64.b64encode(hashlib.sha256(content).digest()).decode()
+    return f'sha-256={digest}'
+
+
+def test_parse_checksum():
+    assert parse_checksum({}) is None
+    assert parse_checksum({'Digest': sha256_digest(b'a')}) == (
+        'sha256', hashlib.sha256(b'a').hexdigest())
+    md5 = base64.b64encode(hashlib.md5(b'a').digest()).decode()
+    assert parse_checksum({'Digest': f'md5={md5}'}) == (
+        'md5', hashlib.md5(b'a').hexdigest())
+    assert parse_checksum({'X-Checksum-Sha256': 'ABC'}) == ('sha256', 'abc')
+
+
+def test_store_gzip_encoded(client, tmp_path):
+    DumpHandler.gzip = True
+    DumpHandler.digest = sha256_digest(GZIP_CONTENT)
+    DumpHandler.drop_after = 70 * 1024
+    filename, content = fetch(client, tmp_path)
+    assert filename == FILENAME + '.gz'
+    assert content == GZIP_CONTENT
+    assert gzip.decompress(content) == CONTENT
+    assert DumpHandler.requests[1].startswith('bytes=')
+
+
+def test_download(client, tmp_path):
+    DumpHandler.digest = sha256_digest(CONTENT)
+    filename, content = fetch(client, tmp_path)
+    assert filename == FILENAME
+    assert content == CONTENT
+    assert DumpHandler.requests == [None]
+    assert sorted(os.listdir(str(tmp_path))) == [FILENAME, 'stats.tsv']
+
+
+def test_resume_after_drop(client, tmp_path):
+    DumpHandler.drop_after = 100 * 1024
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert len(DumpHandler.requests) == 2
+    assert DumpHandler.requests[1].startswith('bytes=')
+    assert int(DumpHandler.requests[1][6:-1]) > 0
+
+
+def test_restart_without_ranges(client, tmp_path):
+    DumpHandler.ranges = False
+    DumpHandler.drop_after = 100 * 1024
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert DumpHandler.requests == [None, None]
+
+
+def write_part(tmp_path, content, validator='"v1"', size=len(CONTENT)):
+    part_path = os.path.join(str(tmp_path), FILENAME + '.part')
+    with open(part_path, 'wb') as f:
+        f.write(content)
+    with open(part_path + '.meta', 'w') as f:
+        json.dump({'validator': validator, 'size': size}, f)
+
+
+def test_resume_previous_part(client, tmp_path):
+    write_part(tmp_path, CONTENT[:1000])
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert DumpHandler.requests == [None, 'bytes=1000-']
+    assert sorted(os.listdir(str(tmp_path))) == [FILENAME, 'stats.tsv']
+
+
+def test_part_of_another_file(client, tmp_path):
+    write_part(tmp_path, b'old dump', validator='"v0"')
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert DumpHandler.requests == [None]
+
+    write_part(tmp_path, b'part without meta')
+    os.remove(os.path.join(str(tmp_path), FILENAME + '.part.meta'))
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert DumpHandler.requests == [None, None]
+
+
+def test_part_larger_than_file(client, tmp_path, monkeypatch):
+    write_part(tmp_path, CONTENT + b'tail', size=len(CONTENT) + 4)
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert DumpHandler.requests == [None]
+
+    # same file by meta, range fails on the server
+    monkeypatch.setattr(download.Download, 'part_matches',
+                        lambda self, part_path: True)
+    write_part(tmp_path, CONTENT + b'tail')
+    _, content = fetch(client, tmp_path)
+    assert content == CONTENT
+    assert DumpHandler.requests[1:] == [None, f'bytes={len(CONTENT) + 4}-',
+                                        None]
+
+
+def test_parallel_segments(client, tmp_path):
+    DumpHandler.digest = sha256_digest(CONTENT)
+    _, content = fetch(client, tmp_path, segments=4)
+    assert content == CONTENT
+    assert sorted(DumpHandler.requests[1:]) == [
+        'bytes=0-76799', 'bytes=153600-230399',
+        'bytes=230400-307199', 'bytes=76800-153599'
+    ]
+
+
+def test_checksum_mismatch(client, tmp_path):
+    DumpHandler.digest = sha256_digest(b'other')
+    with pytest.raises(ChecksumMismatch):
+        fetch(client, tmp_path)
+    assert os.listdir(str(tmp_path)) == ['stats.tsv']
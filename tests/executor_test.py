@@ -0,0 +1,107 @@
+import io
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from tools.executor import run_streaming
+from tools.helper import run_cmd
+
+
+def python_cmd(code):
+    return [sys.executable, '-c', code]
+
+
+def test_run_streaming():
+    res = run_streaming(python_cmd(
+        'import sys; print("out"); print("err", file=sys.stderr)'))
+    assert res.returncode == 0
+    assert res.stdout == b'out\n'
+    assert res.stderr == b'err\n'
+
+
+def test_output_tail_is_bounded():
+    res = run_streaming(python_cmd('for i in range(100000): print(i)'),
+                        log_output=False, tail_lines=10)
+    assert res.stdout.splitlines() == [
+        str(i).encode() for i in range(99990, 100000)]
+
+
+def test_failure_keeps_output():
+    with pytest.raises(subprocess.CalledProcessError) as err:
+        run_streaming(python_cmd(
+            'import sys; print("boom", file=sys.stderr); sys.exit(3)'))
+    assert err.value.returncode == 3
+    assert err.value.stderr == b'boom\n'
+
+
+def test_timeout_terminates_process_group():
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired) as err:
+        run_streaming('echo started; sleep 30 & sleep 30', shell=True,
+                      timeout=0.5, detached=True)
+    # the background sleep holds the pipes, so it has to be killed too
+    assert time.monotonic() - start < 10
+    assert err.value.output == b'started\n'
+
+
+def test_timeout_terminates_attached_command():
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_streaming(python_cmd('import time; time.sleep(30)'), timeout=0.5)
+    assert time.monotonic() - start < 10
+
+
+@pytest.fixture
+def parent_stdin():
+    """Pipe with a line in it as the process stdin"""
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b'password\n')
+    os.close(write_fd)
+    saved_fd = os.dup(0)
+    os.dup2(read_fd, 0)
+    os.close(read_fd)
+    yield
+    os.dup2(saved_fd, 0)
+    os.close(saved_fd)
+
+
+def test_command_keeps_parent_stdin_and_session(parent_stdin):
+    res = run_streaming(python_cmd(
+        'import os, sys; print(sys.stdin.readline().strip(), os.getsid(0))'))
+    assert res.stdout.decode().split() == ['password', str(os.getsid(0))]
+
+
+def test_detached_command(parent_stdin):
+    res = run_streaming(python_cmd(
+        'import os, sys; print(repr(sys.stdin.read()), os.getsid(0))'),
+        detached=True)
+    stdin, sid = res.stdout.decode().split()
+    assert stdin == "''"
+    assert sid != str(os.getsid(0))
+
+
+def test_sigkill_after_grace_period():
+    code = 'import signal, time; ' \
+           'signal.signal(signal.SIGTERM, signal.SIG_IGN); ' \
+           'print("ready", flush=True); time.sleep(30)'
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_streaming(python_cmd(code), timeout=1, grace_period=0.5)
+    assert time.monotonic() - start < 10
+
+
+def test_echo(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(sys, 'stdout', out)
+    run_streaming(python_cmd('print("line")'), echo=True)
+    assert out.getvalue() == 'line\n'
+
+
+def test_run_cmd_env(monkeypatch):
+    monkeypatch.delenv('SKALE_CLI_SHOW_CMD_OUTPUT', raising=False)
+    res = run_cmd(['sh', '-c', 'echo $TEST_VALUE'],
+                  env={'TEST_VALUE': 'value'})
+    assert res.stdout == b'value\n'
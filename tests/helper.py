@@ -17,6 +17,11 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import json
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler
+
 import mock
 from click.testing import CliRunner
 from mock import Mock, MagicMock
@@ -33,6 +38,18 @@ def response_mock(status_code=0, json_data=None,
     return result
 
 
+def stream_response_mock(status_code=0, json_data=None, chunk_size=16,
+                         headers=None):
+    content = json.dumps(json_data).encode('utf-8')
+    chunks = [content[i:i + chunk_size]
+              for i in range(0, len(content), chunk_size)]
+    result = MagicMock()
+    result.status_code = status_code
+    result.headers = headers or {}
+    result.iter_content = MagicMock(side_effect=lambda size: iter(chunks))
+    return result
+
+
 def request_mock(response_mock):
     request_mock = Mock(return_value=response_mock)
     return request_mock
@@ -50,10 +67,57 @@ def run_command_mock(mock_call_path, response_mock,
         return run_command(command, params, input=input)
 
 
-def subprocess_run_mock(cmd=None, shell=None, stdout=None,
-                        stderr=None, env=None, returncode=0):
+def subprocess_run_mock(cmd=None, env=None, shell=None, timeout=None,
+                        echo=None, detached=False, returncode=0):
     result = MagicMock()
     result.returncode = returncode
     result.stdout = MagicMock()
     result.stderr = MagicMock()
     return result
+
+
+class AdminHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    fails_left = 0
+    delay = 0
+    peers = set()
+    requests = 0
+    zstd = False
+
+    def do_GET(self):
+        AdminHandler.peers.add(self.client_address)
+        AdminHandler.requests += 1
+        if AdminHandler.delay:
+            time.sleep(AdminHandler.delay)
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if AdminHandler.fails_left > 0:
+            AdminHandler.fails_left -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({'status': 'ok', 'payload': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        if AdminHandler.zstd and 'zstd' in self.headers.get('Accept-Encoding', ''):
+            import zstandard
+            # two frames, as streaming encoders may produce
+            cctx = zstandard.ZstdCompressor()
+            body = cctx.compress(body[:10]) + cctx.compress(body[10:])
+            self.send_header('Content-Encoding', 'zstd')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UnixAdminServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+    daemon_threads = True
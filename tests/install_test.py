@@ -0,0 +1,218 @@
+import os
+import threading
+
+import subprocess
+
+import mock
+import pytest
+
+from core import install
+from tools.checkpoints import Checkpoints
+from tools.dag import check_graph
+
+ENV = {
+    'SKALE_DIR': '/skale',
+    'MANAGER_CONTRACTS_ABI_URL': 'http://abi/manager.json',
+    'IMA_CONTRACTS_ABI_URL': 'http://abi/ima.json'
+}
+
+
+def requirements(steps):
+    return {step.name: set(step.requires) for step in steps}
+
+
+def test_init_steps():
+    steps = install.compose_init_steps(ENV)
+    check_graph(steps)
+    reqs = requirements(steps)
+    assert reqs[install.MANAGER_ABI] == reqs[install.LVMPY] == set()
+    assert reqs[install.IMAGES] == {install.CONFIGS}
+    assert reqs[install.CONTAINERS] == set(reqs) - {install.CONTAINERS}
+
+
+def test_dry_run_steps():
+    names = [step.name for step in install.compose_init_steps(ENV, True)]
+    assert install.CONTAINERS not in names
+    assert install.LVMPY not in names
+
+
+def test_update_steps():
+    steps = install.compose_update_steps(ENV)
+    check_graph(steps)
+    reqs = requirements(steps)
+    prefetched = [step.name for step in
+                  install.compose_update_steps(ENV, prefetch_only=True)]
+    assert reqs[install.COMPOSE_REMOVAL] == set(prefetched)
+    assert all(not reqs[name] & {install.COMPOSE_REMOVAL,
+                                 install.DYNAMIC_REMOVAL}
+               for name in prefetched)
+    assert reqs[install.CONFIGS] == {install.COMPOSE_REMOVAL}
+    configs_step = next(step for step in steps
+                        if step.name == install.CONFIGS)
+    assert configs_step.func is install.swap_staged_configs
+    assert reqs[install.LVMPY] == {install.DYNAMIC_REMOVAL}
+    assert {install.MANAGER_ABI, install.IMA_ABI, install.ARTIFACTS} < \
+        reqs[install.STAGED_FILES]
+    assert set(prefetched) == set(install.PREFETCH_STEPS)
+
+
+@pytest.fixture
+def configs_paths(tmp_path, monkeypatch):
+    current = tmp_path / 'config'
+    staged = tmp_path / 'staging' / 'config'
+    previous = tmp_path / 'staging' / 'previous-config'
+    staged.mkdir(parents=True)
+    (staged / 'docker-compose.yml').write_text('new')
+    monkeypatch.setattr(install, 'CONTAINER_CONFIG_PATH', str(current))
+    monkeypatch.setattr(install, 'STAGED_CONFIG_PATH', str(staged))
+    monkeypatch.setattr(install, 'PREVIOUS_CONFIG_PATH', str(previous))
+    return current, staged, previous
+
+
+def test_swap_staged_configs(configs_paths, tmp_path):
+    current, _, _ = configs_paths
+    current.mkdir()
+    (current / 'docker-compose.yml').write_text('old')
+    install.swap_staged_configs()
+    assert (current / 'docker-compose.yml').read_text() == 'new'
+    assert os.listdir(str(tmp_path / 'staging')) == []
+
+
+def test_swap_staged_configs_swapped(configs_paths, tmp_path):
+    """Resumed run finds the configs swapped"""
+    current, staged, _ = configs_paths
+    os.rename(str(staged), str(current))
+    install.swap_staged_configs()
+    assert (current / 'docker-compose.yml').read_text() == 'new'
+    assert os.listdir(str(tmp_path / 'staging')) == []
+
+
+def test_swap_staged_configs_half_swapped(configs_paths, tmp_path):
+    """Run was interrupted after the current configs were moved away"""
+    current, _, previous = configs_paths
+    previous.mkdir()
+    (previous / 'docker-compose.yml').write_text('old')
+    install.swap_staged_configs()
+    assert (current / 'docker-compose.yml').read_text() == 'new'
+    assert os.listdir(str(tmp_path / 'staging')) == []
+
+
+def test_swap_staged_configs_missing(configs_paths):
+    current, staged, _ = configs_paths
+    (staged / 'docker-compose.yml').unlink()
+    staged.rmdir()
+    with pytest.raises(FileNotFoundError):
+        install.swap_staged_configs()
+    assert not current.exists()
+
+
+def test_configs_head():
+    res = mock.Mock(stdout=b'abc123\trefs/heads/develop\n')
+    with mock.patch('core.install.run_cmd', return_value=res) as run_cmd:
+        assert install.configs_head('', 'develop') == 'abc123'
+        assert run_cmd.call_args[0][0][-3:] == ['ls-remote', 'origin',
+                                                'develop']
+    with mock.patch('core.install.run_cmd', return_value=mock.Mock(
+            stdout=b'')):
+        assert install.configs_head('', 'abc123') == 'abc123'
+    with mock.patch('core.install.run_cmd', return_value=mock.Mock(
+            stdout=b'def456\n')) as run_cmd:
+        assert install.configs_head('/configs', 'develop') == 'def456'
+        assert run_cmd.call_args[0][0][:3] == ['git', '-C', '/configs']
+    with mock.patch('core.install.run_cmd',
+                    side_effect=subprocess.CalledProcessError(128, 'git')):
+        assert install.configs_head('', 'develop') is None
+
+
+def test_staged_configs_reused_for_same_head(tmp_path):
+    env = {**ENV, 'CONTAINER_CONFIGS_STREAM': 'develop'}
+
+    def staging_step(head):
+        with mock.patch('core.install.configs_head', return_value=head):
+            steps = install.compose_prefetch_steps(env)
+        return next(step for step in steps
+                    if step.name == install.CONFIGS_STAGING)
+
+    path = str(tmp_path / 'checkpoints.json')
+    checkpoints = Checkpoints({'procedure': 'update'}, path=path,
+                              kept=install.PREFETCH_STEPS)
+    checkpoints.record(staging_step('abc123'))
+    checkpoints = Checkpoints({'procedure': 'update'}, path=path,
+                              kept=install.PREFETCH_STEPS)
+    assert checkpoints.is_recorded(staging_step('abc123'))
+    assert not checkpoints.is_recorded(staging_step('def456'))
+
+
+def test_move_staged_files(tmp_path, monkeypatch):
+    staged = tmp_path / 'staged'
+    staged.mkdir()
+    targets = {}
+    for name in ('MANAGER_CONTRACTS', 'IMA_CONTRACTS', 'FILESTORAGE_ARTIFACTS'):
+        filename = getattr(install, f'{name}_FILENAME')
+        (staged / filename).write_text(name)
+        targets[name] = str(tmp_path / f'current-{filename}')
+        monkeypatch.setattr(install, f'{name}_FILEPATH', targets[name])
+    monkeypatch.setattr(install, 'STAGED_FILES_PATH', str(staged))
+    with mock.patch('core.install.run_cmd') as run_cmd:
+        install.move_staged_files(ENV)
+    assert run_cmd.call_args[0][0][2].endswith('backup_old_contracts')
+    for name, path in targets.items():
+        with open(path) as f:
+            assert f.read() == name
+    assert list(staged.iterdir()) == []
+
+
+def test_move_staged_files_resumed(tmp_path, monkeypatch):
+    staged = tmp_path / 'staged'
+    staged.mkdir()
+    (staged / install.IMA_CONTRACTS_FILENAME).write_text('new ima')
+    targets = {}
+    for name in ('MANAGER_CONTRACTS', 'IMA_CONTRACTS', 'FILESTORAGE_ARTIFACTS'):
+        filename = getattr(install, f'{name}_FILENAME')
+        targets[name] = tmp_path / f'current-{filename}'
+        targets[name].write_text('moved')
+        monkeypatch.setattr(install, f'{name}_FILEPATH', str(targets[name]))
+    monkeypatch.setattr(install, 'STAGED_FILES_PATH', str(staged))
+    with mock.patch('core.install.run_cmd') as run_cmd:
+        install.move_staged_files(ENV)
+    run_cmd.assert_not_called()
+    assert targets['IMA_CONTRACTS'].read_text() == 'new ima'
+    assert targets['MANAGER_CONTRACTS'].read_text() == 'moved'
+
+
+def test_run_init_steps(tmp_path):
+    calls = []
+    lock = threading.Lock()
+
+    def run_cmd(cmd, env):
+        with lock:
+            calls.append(cmd[2].split('; ', 3)[-1])
+        assert env['CONFIG_DIR'] == install.CONTAINER_CONFIG_PATH
+
+    def download_file(url, filepath):
+        with lock:
+            calls.append(url)
+
+    with mock.patch('core.install.run_cmd', new=run_cmd), \
+            mock.patch('core.install.download_file', new=download_file), \
+            mock.patch('core.install.read_json',
+                       return_value={'artifacts_url': 'http://artifacts'}), \
+            mock.patch('core.install.get_flask_secret_key',
+                       return_value='key'):
+        report = install.run_node_steps(install.compose_init_steps(ENV))
+    assert report.ok
+    assert sorted(calls) == sorted([
+        'update_container_configs; link_env_file', 'http://abi/manager.json',
+        'http://abi/ima.json', 'http://artifacts', 'configure_filebeat',
+        'configure_flask', 'iptables_configure', 'docker_lvmpy_install',
+        'prepare_images', 'up_compose'
+    ])
+    assert calls[-1] == 'up_compose'
+
+
+def test_helper_cmd():
+    cmd = install.compose_helper_cmd('a', 'b', cwd='/skale/config')
+    assert cmd == [
+        'bash', '-c',
+        f'set -e; source "{install.HELPER_SCRIPT}"; cd "/skale/config"; a; b'
+    ]
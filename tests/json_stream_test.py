@@ -0,0 +1,91 @@
+import io
+import json
+
+import pytest
+
+from tools.json_stream import (ANY, JsonStreamError, build_value,
+                               compile_path, iter_events, iter_subtree,
+                               select, write_events)
+
+
+DOCUMENT = {
+    'skaleConfig': {
+        'sChain': {
+            'schainName': 'testé "quoted"',
+            'nodes': [
+                {'ip': '1.1.1.1', 'port': 10000, 'ratio': -1.5e-3},
+                {'ip': '2.2.2.2', 'port': 10010, 'ratio': 0.25}
+            ],
+            'empty': {},
+            'emptyList': [],
+            'flags': [True, False, None]
+        }
+    }
+}
+
+
+def chunked(document, size):
+    content = json.dumps(document, ensure_ascii=False).encode('utf-8')
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 4096])
+def test_build_value(size):
+    events = iter_events(chunked(DOCUMENT, size))
+    first = next(events)
+    assert build_value(iter_subtree(first, events)) == DOCUMENT
+
+
+def test_paths():
+    events = list(iter_events(chunked({'a': [{'b': 1}]}, 3)))
+    assert events == [
+        ((), 'start_map', None),
+        ((), 'map_key', 'a'),
+        (('a',), 'start_array', None),
+        (('a', 0), 'start_map', None),
+        (('a', 0), 'map_key', 'b'),
+        (('a', 0, 'b'), 'scalar', 1),
+        (('a', 0), 'end_map', None),
+        (('a',), 'end_array', None),
+        ((), 'end_map', None)
+    ]
+
+
+@pytest.mark.parametrize('size', [1, 5, 4096])
+def test_write_events(size):
+    out = io.StringIO()
+    events = iter_events(chunked(DOCUMENT, size))
+    write_events(iter_subtree(next(events), events), out)
+    assert out.getvalue() == json.dumps(DOCUMENT, indent=4) + '\n'
+
+
+def test_compile_path():
+    assert compile_path('skaleConfig.sChain.nodes[*].ip') == (
+        'skaleConfig', 'sChain', 'nodes', ANY, 'ip')
+    assert compile_path('a[1][*].*') == ('a', 1, ANY, ANY)
+    with pytest.raises(ValueError):
+        compile_path('a..b')
+    with pytest.raises(ValueError):
+        compile_path('a[x]')
+
+
+def test_select():
+    def query(expression):
+        events = iter_events(chunked(DOCUMENT, 5))
+        return list(select(events, compile_path(expression)))
+
+    assert query('skaleConfig.sChain.nodes[*].ip') == ['1.1.1.1', '2.2.2.2']
+    assert query('skaleConfig.sChain.nodes[1]') == [
+        DOCUMENT['skaleConfig']['sChain']['nodes'][1]]
+    assert query('skaleConfig.sChain.nodes[*].*') == [
+        '1.1.1.1', 10000, -1.5e-3, '2.2.2.2', 10010, 0.25]
+    assert query('skaleConfig.sChain.flags') == [[True, False, None]]
+    assert query('skaleConfig.missing') == []
+
+
+@pytest.mark.parametrize('content', [
+    b'{"a":}', b'[1,]', b'{"a" 1}', b'[1] 2', b'"abc', b'tru', b'{', b''
+])
+def test_invalid_document(content):
+    with pytest.raises(JsonStreamError):
+        list(iter_events([content]))
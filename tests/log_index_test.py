@@ -0,0 +1,130 @@
+import gzip
+import os
+from datetime import datetime, timedelta
+
+from tools.log_index import LogIndex, LogSearch, open_indexed
+from tools.log_reader import RecordFilter
+
+
+START = datetime(2021, 4, 1, 10, 0, 0)
+
+
+def write_records(path, first, count, mode='ab'):
+    with open(path, mode) as log_file:
+        for number in range(first, first + count):
+            timestamp = (START + timedelta(seconds=number)).strftime(
+                '%Y-%m-%d %H:%M:%S')
+            level = 'ERROR' if number % 10 == 0 else 'INFO'
+            log_file.write(
+                f'{timestamp},000 - main - {level} - record {number}\n'.encode())
+            if number % 10 == 0:
+                log_file.write(b'Traceback (most recent call last):\n')
+
+
+def test_index_update(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    index_dir = os.path.join(str(tmp_path), 'index')
+    write_records(log_path, 0, 100)
+    log_file, index = open_indexed(log_path, index_dir, interval=512)
+    with log_file:
+        size = os.fstat(log_file.fileno()).st_size
+    assert len(index.entries) == size // 512 + 1
+    assert index.entries[0] == ['2021-04-01 10:00:00', 0]
+    offsets = [entry[1] for entry in index.entries]
+    assert offsets == sorted(offsets)
+
+    write_records(log_path, 100, 100)
+    log_file, grown = open_indexed(log_path, index_dir, interval=512)
+    log_file.close()
+    assert grown.entries[:len(index.entries)] == index.entries
+    assert len(grown.entries) > len(index.entries)
+
+    offset = grown.find_offset('2021-04-01 10:02:00')
+    with open(log_path, 'rb') as log_file:
+        log_file.seek(offset)
+        first = log_file.readline()
+    assert b'10:01:' in first or b'10:02:00' in first
+    assert grown.find_offset('2020-01-01 00:00:00') == 0
+
+    write_records(log_path, 500, 10, mode='wb')  # truncated and rewritten
+    log_file, rebuilt = open_indexed(log_path, index_dir, interval=512)
+    log_file.close()
+    assert rebuilt.entries == [['2021-04-01 10:08:20', 0]]
+
+
+def test_index_reload(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    index_dir = os.path.join(str(tmp_path), 'index')
+    write_records(log_path, 0, 100)
+    open_indexed(log_path, index_dir, interval=512)[0].close()
+    index = LogIndex(log_path, index_dir, interval=512)
+    index.load()
+    with open(log_path, 'rb') as log_file:
+        assert not index.update(log_file)
+    other = LogIndex(log_path, index_dir, interval=1024)
+    other.load()
+    assert other.entries == []
+
+
+def test_search(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    index_dir = os.path.join(str(tmp_path), 'index')
+    write_records(log_path + '.2', 0, 100)
+    write_records(log_path + '.1', 100, 100)
+    write_records(log_path, 200, 100)
+
+    def search(**kwargs):
+        return list(LogSearch(log_path, RecordFilter(**kwargs), index_dir,
+                              interval=256))
+
+    lines = search(since=START + timedelta(seconds=150),
+                   until=START + timedelta(seconds=250))
+    assert lines[0].endswith(b'record 150\n')
+    assert lines[-2].endswith(b'record 250\n')
+    assert len(lines) == 101 + 11
+
+    lines = search(level='error', pattern='record 2[0-9]0\n')
+    assert [line for line in lines if b'record' in line] == [
+        f'{(START + timedelta(seconds=n)):%Y-%m-%d %H:%M:%S},000 - main - '
+        f'ERROR - record {n}\n'.encode() for n in range(200, 300, 10)
+    ]
+
+    search_all = LogSearch(log_path, RecordFilter(since=START), index_dir)
+    assert len(list(search_all)) == 330
+    assert search_all.offset == os.path.getsize(log_path)
+
+
+def test_search_segments(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    index_dir = os.path.join(str(tmp_path), 'index')
+    write_records(log_path + '.1', 0, 100)
+    plain = log_path + '.20210401-100320'
+    write_records(plain, 100, 100)
+    with open(plain, 'rb') as plain_file, \
+            gzip.open(plain + '.gz', 'wb') as gzip_file:
+        gzip_file.write(plain_file.read())
+    os.remove(plain)
+    write_records(log_path + '.20210401-100640', 200, 100)
+    write_records(log_path, 300, 100)
+
+    def search(**kwargs):
+        return [line for line in LogSearch(log_path, RecordFilter(**kwargs),
+                                           index_dir, interval=256)
+                if b'record' in line]
+
+    lines = search(since=START + timedelta(seconds=50))
+    assert len(lines) == 350
+    assert lines[0].endswith(b'record 50\n')
+    assert lines[-1].endswith(b'record 399\n')
+    lines = search(since=START + timedelta(seconds=250))
+    assert lines[0].endswith(b'record 250\n')
+    lines = search(pattern='record 1[0-9][0-9]\n')
+    assert len(lines) == 100
+
+    os.makedirs(index_dir, exist_ok=True)
+    open(os.path.join(index_dir, 'node-cli.log.gone.idx.json'), 'w').close()
+    search(since=START)
+    assert sorted(os.listdir(index_dir)) == [
+        'node-cli.log.1.idx.json', 'node-cli.log.20210401-100640.idx.json',
+        'node-cli.log.idx.json'
+    ]
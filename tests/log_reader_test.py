@@ -0,0 +1,93 @@
+import io
+import os
+from datetime import datetime
+
+import pytest
+
+from tools.log_reader import RecordFilter, follow, parse_time, tail_offset
+
+
+RECORDS = [
+    b'2021-04-01 10:00:00,100 - main - INFO - first\n',
+    b'2021-04-01 10:05:00,100 - main - ERROR - second\n',
+    b'Traceback (most recent call last):\n',
+    b'2021-04-01 10:10:00,100 - main - INFO - third\n'
+]
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 1024])
+def test_tail_offset(block_size):
+    content = b''.join(RECORDS)
+    log_file = io.BytesIO(content)
+    for lines in range(6):
+        offset = tail_offset(log_file, lines, block_size=block_size)
+        assert content[offset:] == b''.join(RECORDS[max(len(RECORDS) - lines, 0):])
+    unterminated = io.BytesIO(content + b'partial')
+    offset = tail_offset(unterminated, 2, block_size=block_size)
+    assert unterminated.getvalue()[offset:] == RECORDS[-1] + b'partial'
+    assert tail_offset(io.BytesIO(), 3) == 0
+
+
+def test_parse_time():
+    now = datetime(2021, 4, 1, 10, 0, 0)
+    assert parse_time('15m', now=now) == datetime(2021, 4, 1, 9, 45)
+    assert parse_time('1d', now=now) == datetime(2021, 3, 31, 10, 0)
+    assert parse_time('2021-04-01 10:05:00') == datetime(2021, 4, 1, 10, 5)
+    assert parse_time('2021-04-01') == datetime(2021, 4, 1)
+    with pytest.raises(ValueError):
+        parse_time('yesterday')
+
+
+def test_record_filter():
+    assert RecordFilter().is_empty
+    assert list(RecordFilter().filter(RECORDS)) == RECORDS
+    since = datetime(2021, 4, 1, 10, 1)
+    assert list(RecordFilter(since=since).filter(RECORDS)) == RECORDS[1:]
+    record_filter = RecordFilter(until=datetime(2021, 4, 1, 10, 5))
+    assert list(record_filter.filter(RECORDS)) == RECORDS[:3]
+    assert record_filter.done
+    assert list(RecordFilter(level='error').filter(RECORDS)) == RECORDS[1:3]
+    assert list(RecordFilter(pattern='Trace').filter(RECORDS)) == RECORDS[1:3]
+    assert list(RecordFilter(pattern='third').filter(RECORDS)) == RECORDS[3:]
+    # continuation lines of the record from the previous file
+    assert list(RecordFilter(since=since).filter(RECORDS[2:])) == RECORDS[3:]
+    json_records = [
+        b'{"time": "2021-04-01 10:00:00,100", "level": "INFO", "logger": '
+        b'"main", "message": "first"}\n',
+        b'{"time": "2021-04-01 10:05:00,100", "level": "ERROR", "logger": '
+        b'"main", "message": "second"}\n'
+    ]
+    record_filter = RecordFilter(since=since, level='error')
+    assert list(record_filter.filter(json_records)) == json_records[1:]
+    # None flushes the pending record
+    lines = RecordFilter(level='INFO').filter(iter([RECORDS[0], None]))
+    assert next(lines) == RECORDS[0]
+
+
+def test_follow_rotation(tmp_path):
+    path = os.path.join(str(tmp_path), 'node-cli.log')
+    with open(path, 'wb') as log_file:
+        log_file.write(RECORDS[0])
+
+    actions = [
+        lambda: append(path, b'2021-04-01 10:05:00,100 - partial'),
+        lambda: append(path, b' line\n'),
+        lambda: os.rename(path, path + '.1'),
+        lambda: append(path, RECORDS[3])
+    ]
+
+    def sleep(interval):
+        if not actions:
+            raise KeyboardInterrupt
+        actions.pop(0)()
+
+    lines = []
+    with pytest.raises(KeyboardInterrupt):
+        for line in follow(path, len(RECORDS[0]), sleep=sleep):
+            lines.append(line)
+    assert lines == [b'2021-04-01 10:05:00,100 - partial line\n', RECORDS[3]]
+
+
+def append(path, data):
+    with open(path, 'ab') as log_file:
+        log_file.write(data)
@@ -0,0 +1,164 @@
+import gzip
+import logging
+import os
+import time
+
+import mock
+
+from tools.log_rotation import (CompressingRotatingFileHandler, compress_file,
+                                compression_lock, log_segments)
+
+
+def make_handler(tmp_path, **kwargs):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    handler = CompressingRotatingFileHandler(log_path, **kwargs)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return log_path, handler
+
+
+def emit(handler, message):
+    handler.emit(logging.LogRecord('core', logging.INFO, __file__, 1,
+                                   message, None, None))
+
+
+def test_rollover_compresses_segments(tmp_path):
+    log_path, handler = make_handler(tmp_path, max_bytes=100)
+    for number in range(5):
+        emit(handler, f'{number:02}' + 'x' * 60)
+    handler.wait()
+    handler.close()
+    segments = log_segments(log_path)
+    assert segments and all(segment.compressed for segment in segments)
+    content = b''
+    for segment in segments:
+        with segment.open() as segment_file:
+            content += segment_file.read()
+    with open(log_path, 'rb') as log_file:
+        content += log_file.read()
+    assert [line[:2] for line in content.splitlines()] == \
+        [b'00', b'01', b'02', b'03', b'04']
+    assert not [name for name in os.listdir(str(tmp_path))
+                if name.endswith('.tmp')]
+
+
+def test_budget(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    for minute in range(5):
+        with open(f'{log_path}.20210401-10{minute:02}00', 'wb') as f:
+            f.write(os.urandom(1000))  # doesn't compress
+    open(log_path + '.1', 'w').close()
+    _, handler = make_handler(tmp_path, backup_count=3,
+                              max_backups_bytes=2500)
+    handler.wait()
+    handler.close()
+    # numbered backup is left as is and fits into the budget
+    assert [os.path.basename(segment.path)
+            for segment in log_segments(log_path)] == [
+        'node-cli.log.1', 'node-cli.log.20210401-100300.gz',
+        'node-cli.log.20210401-100400.gz'
+    ]
+
+    _, handler = make_handler(tmp_path, backup_count=1)
+    handler.remove_outdated()
+    handler.close()
+    assert len(log_segments(log_path)) == 1
+
+
+def test_segments_order(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    names = ['node-cli.log.2', 'node-cli.log.1', 'node-cli.log.20210401-100000',
+             'node-cli.log.20210401-100000-1.gz', 'node-cli.log.20210402-090000.gz']
+    for name in names + ['node-cli.log.lock', 'node-cli.log.x.tmp']:
+        open(os.path.join(str(tmp_path), name), 'w').close()
+    segments = log_segments(log_path)
+    assert [os.path.basename(segment.path) for segment in segments] == names
+    assert segments[0].end is None
+    assert segments[-1].end == b'2021-04-02 09:00:00'
+
+
+def test_compress_file(tmp_path):
+    source = os.path.join(str(tmp_path), 'segment')
+    with open(source, 'wb') as f:
+        f.write(b'record\n' * 1000)
+    compress_file(source, source + '.gz')
+    assert not os.path.exists(source)
+    with gzip.open(source + '.gz') as f:
+        assert f.read() == b'record\n' * 1000
+
+
+def test_compression_after_exit(tmp_path):
+    log_path, handler = make_handler(tmp_path, max_bytes=100)
+    emit(handler, 'x' * 120)
+    emit(handler, 'y')
+    assert handler.workers
+    # command exits, the detached process finishes the compression
+    handler.close()
+    deadline = time.monotonic() + 10
+    while not all(segment.compressed for segment in log_segments(log_path)):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    content = b''
+    for segment in log_segments(log_path):
+        with segment.open() as segment_file:
+            content += segment_file.read()
+    assert content == b'x' * 120 + b'\n'
+
+
+def test_killed_compression_is_redone(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    segment = f'{log_path}.20210402-090000'
+    with open(segment, 'wb') as f:
+        f.write(b'record\n' * 100)
+    stale_tmp = f'{segment}.gz.1234.tmp'
+    with open(stale_tmp, 'wb') as f:
+        f.write(b'partial')
+    _, handler = make_handler(tmp_path)
+    assert not os.path.exists(stale_tmp)
+    handler.wait()
+    handler.close()
+    assert not [name for name in os.listdir(str(tmp_path))
+                if name.endswith('.tmp')]
+    assert all(segment.compressed for segment in log_segments(log_path))
+    with gzip.open(segment + '.gz') as f:
+        assert f.read() == b'record\n' * 100
+
+
+def test_running_compression_is_not_restarted(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    segment = f'{log_path}.20210402-090000'
+    open(segment, 'wb').close()
+    tmp_file = f'{segment}.gz.1234.tmp'
+    open(tmp_file, 'wb').close()
+    with compression_lock(log_path) as locked:
+        assert locked
+        _, handler = make_handler(tmp_path)
+        assert handler.workers == []
+        handler.close()
+    assert os.path.exists(tmp_file)
+
+
+def test_rollover_prunes_without_compression(tmp_path):
+    with mock.patch.object(CompressingRotatingFileHandler,
+                           'schedule_compression'):
+        log_path, handler = make_handler(tmp_path, max_bytes=100,
+                                         backup_count=2)
+        for number in range(6):
+            emit(handler, f'{number:02}' + 'x' * 120)
+            assert len(log_segments(log_path)) <= 2
+        handler.close()
+    segments = log_segments(log_path)
+    assert len(segments) == 2
+    assert not any(segment.compressed for segment in segments)
+
+
+def test_newest_segment_is_kept(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'node-cli.log')
+    for minute in range(2):
+        with open(f'{log_path}.20210401-10{minute:02}00.gz', 'wb') as f:
+            f.write(os.urandom(1000))
+    _, handler = make_handler(tmp_path, max_backups_bytes=500)
+    handler.remove_outdated()
+    handler.close()
+    assert [os.path.basename(segment.path)
+            for segment in log_segments(log_path)] == [
+        'node-cli.log.20210401-100100.gz']
@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import sys
+
+from tools import profiler
+from tools.profiler import FULL, ImportTracer, Profile, prune_profiles
+
+
+def test_phases():
+    profile = Profile(start=0)
+    with profile.phase('render'):
+        with profile.phase('render'):
+            pass
+    profile.add('http', 0.5)
+    profile.add('http', 0.25)
+    profile.add('import', 0.1)
+    summary = profile.summary()
+    assert list(summary['phases_ms']) == ['import', 'http', 'render', 'total']
+    assert summary['phases_ms']['http'] == 750
+    assert summary['phases_ms']['render'] < 100
+
+
+def test_disabled_profiler():
+    assert profiler.get_profile() is None
+    with profiler.phase('config'):
+        pass
+    profiler.add('http', 1)
+    namespace = {'print_x': print}
+    profiler.instrument(namespace, 'print_', 'render')
+    assert namespace['print_x'] is print
+
+
+def test_import_tracer():
+    sys.modules.pop('colorsys', None)
+    tracer = ImportTracer()
+    tracer.install()
+    try:
+        import colorsys  # noqa
+    finally:
+        tracer.uninstall()
+    assert [record[:2] for record in tracer.records] == [(1, 'colorsys')]
+    assert 'colorsys' in tracer.format()
+
+
+def test_save_full_profile(tmp_path):
+    data_path = str(tmp_path)
+    profile = Profile(FULL, data_path=data_path)
+    profile.run()
+    import colorsys  # noqa
+    sum(range(1000))
+    profile.stop()
+    out = io.StringIO()
+    summary = profile.summary()
+    profiler.print_summary(summary, out)
+    profile.save(summary, pid=1)
+    assert 'total' in out.getvalue()
+    assert sorted(os.listdir(data_path)) == [
+        'profile-1.imports.txt', 'profile-1.json', 'profile-1.prof'
+    ]
+    with open(os.path.join(data_path, 'profile-1.json')) as summary_file:
+        saved = json.load(summary_file)
+    assert saved['mode'] == FULL
+    assert saved['tracemalloc_peak_bytes'] > 0
+
+
+def test_prune_profiles(tmp_path):
+    data_path = str(tmp_path)
+    for pid in range(5):
+        for suffix in ('.json', '.prof'):
+            path = os.path.join(data_path, f'profile-{pid}{suffix}')
+            open(path, 'w').close()
+            os.utime(path, (pid, pid))
+    prune_profiles(data_path, keep=2)
+    assert sorted(os.listdir(data_path)) == [
+        'profile-3.json', 'profile-3.prof', 'profile-4.json', 'profile-4.prof'
+    ]
@@ -0,0 +1,96 @@
+import mock
+
+from core.readiness import NodeProbes
+from tools.readiness import Check, wait_ready
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, interval):
+        self.sleeps.append(interval)
+        self.now += interval
+
+
+def ready_after(clock, seconds, state='starting'):
+    def probe():
+        if clock.now >= seconds:
+            return True, 'ready'
+        return False, state
+    return probe
+
+
+def test_wait_ready_returns_as_soon_as_ready():
+    clock = FakeClock()
+    checks = [Check('tm', ready_after(clock, 0)),
+              Check('admin', ready_after(clock, 2))]
+    report = wait_ready(checks, 60, clock=clock, sleep=clock.sleep)
+    assert report.ok
+    assert report.ready == {'tm': 0, 'admin': 3.5}
+    assert clock.sleeps == [0.5, 1, 2]
+    assert report.elapsed == 3.5
+
+
+def test_backoff_is_capped_by_max_interval_and_deadline():
+    clock = FakeClock()
+    checks = [Check('mysql', ready_after(clock, 100, 'not responding'))]
+    report = wait_ready(checks, 20, max_interval=5, clock=clock,
+                        sleep=clock.sleep)
+    assert not report.ok
+    assert report.lagging == {'mysql': 'not responding'}
+    assert report.describe_lagging() == 'mysql (not responding)'
+    assert clock.sleeps == [0.5, 1, 2, 4, 5, 5, 2.5]
+    assert report.elapsed == 20
+
+
+def test_ready_component_is_not_probed_again():
+    clock = FakeClock()
+    calls = []
+
+    def probe():
+        calls.append(clock.now)
+        return True, 'ready'
+    checks = [Check('api', probe), Check('tm', ready_after(clock, 1))]
+    wait_ready(checks, 60, clock=clock, sleep=clock.sleep)
+    assert calls == [0]
+
+
+def test_probe_error_means_not_ready():
+    def probe():
+        raise ConnectionError('docker is unavailable')
+    report = wait_ready([Check('nginx', probe)], 0)
+    assert report.lagging == {'nginx': 'docker is unavailable'}
+
+
+def probes_with_state(state):
+    probes = NodeProbes()
+    probes.client = mock.Mock()
+    containers = []
+    if state is not None:
+        containers.append(mock.Mock(attrs={'State': state}))
+    probes.client.containers.list.return_value = containers
+    return probes
+
+
+def test_service_probe():
+    assert probes_with_state(None).service('skale-api') == (
+        False, 'not created')
+    assert probes_with_state({'Status': 'running'}).service('skale-api') \
+        == (True, 'running')
+    assert probes_with_state({'Status': 'restarting'}).service(
+        'skale-api') == (False, 'restarting')
+    assert probes_with_state({
+        'Status': 'running', 'Health': {'Status': 'starting'}
+    }).service('skale-api') == (False, 'running, starting')
+    assert probes_with_state({
+        'Status': 'running', 'Health': {'Status': 'healthy'}
+    }).service('skale-api') == (True, 'running, healthy')
+    probes = probes_with_state(None)
+    probes.service('skale-api')
+    probes.client.containers.list.assert_called_with(
+        all=True, filters={'label': 'com.docker.compose.service=skale-api'})
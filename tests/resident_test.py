@@ -0,0 +1,88 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from tools.resident_client import compose_request, read_line, send_message
+
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__))), 'main.py')
+
+
+@pytest.fixture
+def resident_env(tmp_path):
+    home_dir = str(tmp_path)
+    env = dict(os.environ, HOME_DIR=home_dir, SKALE_CLI_RESIDENT='1')
+    env.pop('CONFIG_FILEPATH', None)
+    socket_path = os.path.join(home_dir, '.skale', '.skale-cli-resident.sock')
+    yield env, socket_path
+    subprocess.run([sys.executable, MAIN_PATH, 'resident', 'stop'],
+                   env=env, stdout=subprocess.PIPE)
+
+
+def skale(env, *args, cwd=None):
+    return subprocess.run([sys.executable, MAIN_PATH, *args], env=env,
+                          cwd=cwd, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, timeout=30)
+
+
+def status(env):
+    result = skale(env, 'resident', 'status', '--format', 'json')
+    return json.loads(result.stdout)
+
+
+def test_resident_commands(resident_env):
+    env, socket_path = resident_env
+    result = skale(env, 'version', '--short')
+    assert result.returncode == 0
+    assert result.stdout == b'0.0.0\n'
+    assert os.path.exists(socket_path)
+    pid = status(env)['pid']
+
+    result = skale(env, 'debug', 'api-stats', '--format', 'json')
+    assert result.stdout == b'[]\n'
+    result = skale(env, 'unknown')
+    assert result.returncode == 2
+    assert b'No such command' in result.stderr
+    assert status(env)['pid'] == pid
+
+    local_env = dict(env)
+    local_env.pop('SKALE_CLI_RESIDENT')
+    assert skale(local_env, 'resident', 'stop').stdout == \
+        b'Resident process is stopped\n'
+    assert status(local_env) == {'running': False}
+
+
+def test_version_mismatch(resident_env):
+    env, socket_path = resident_env
+    skale(env, 'version')
+    pid = status(env)['pid']
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    request = compose_request(['main.py', 'version'])
+    request['version'] = '0.0.0-old'
+    send_message(sock, request, (0, 1, 2))
+    assert read_line(sock) == {'error': 'version'}
+    sock.close()
+
+    result = skale(env, 'version', '--short')
+    assert result.stdout == b'0.0.0\n'
+    assert status(env)['pid'] != pid
+
+
+def test_idle_timeout(resident_env):
+    env, socket_path = resident_env
+    local_env = dict(env)
+    local_env.pop('SKALE_CLI_RESIDENT')
+    server = subprocess.Popen(
+        [sys.executable, MAIN_PATH, 'resident', 'serve', '--idle-timeout',
+         '1'], env=local_env)
+    try:
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,105 @@
+import io
+import threading
+import time
+
+import docker
+import mock
+import pytest
+from docker.errors import APIError, NotFound
+
+from core.teardown import (TeardownError, compose_docker_api, get_max_workers,
+                           list_dynamic_containers, remove_dynamic_containers)
+
+
+class FakeApi:
+    def __init__(self, names, stop_delay=0.1, fail=(), gone=()):
+        self.names = names
+        self.stop_delay = stop_delay
+        self.fail = fail
+        self.gone = gone
+        self.stopped = []
+        self.removed = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def containers(self, all=False, filters=None):
+        assert all
+        return [{'Id': f'id-{name}', 'Names': [f'/{name}']}
+                for name in self.names if filters['name'] in name]
+
+    def stop(self, container_id, timeout=None):
+        name = container_id[3:]
+        if name in self.gone:
+            raise NotFound('No such container')
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.stop_delay)
+        with self.lock:
+            self.running -= 1
+            self.stopped.append((name, timeout))
+        if name in self.fail:
+            raise APIError('stop failed')
+
+    def remove_container(self, container_id):
+        self.removed.append(container_id[3:])
+
+
+NAMES = [f'skale_schain_chain-{i}' for i in range(6)] + \
+    ['skale_ima_chain-0', 'skale_admin', 'my_skale_schain_copy']
+
+
+def test_list_dynamic_containers():
+    api = FakeApi(NAMES)
+    names = [name for _, name in list_dynamic_containers(api)]
+    assert names == NAMES[:7]
+
+
+def test_remove_in_parallel():
+    api = FakeApi(NAMES)
+    out = io.StringIO()
+    start = time.monotonic()
+    report = remove_dynamic_containers(api, max_workers=3, stop_timeout=40,
+                                       out=out)
+    assert time.monotonic() - start < 0.1 * 7
+    assert api.max_running == 3
+    assert sorted(report.removed) == sorted(NAMES[:7])
+    assert all(timeout == 40 for _, timeout in api.stopped)
+    assert 'Removing 7 sChain and IMA containers, 3 at a time' in \
+        out.getvalue()
+    assert '(7/7)' in out.getvalue()
+    assert '7 containers removed in' in out.getvalue()
+
+
+def test_already_removed_container():
+    api = FakeApi(NAMES[:2], gone=[NAMES[0]])
+    report = remove_dynamic_containers(api, max_workers=2, out=io.StringIO())
+    assert sorted(report.removed) == NAMES[:2]
+    assert api.removed == [NAMES[1]]
+
+
+def test_failures_are_reported():
+    api = FakeApi(NAMES[:3], fail=[NAMES[1]])
+    with pytest.raises(TeardownError) as err:
+        remove_dynamic_containers(api, max_workers=2, out=io.StringIO())
+    report = err.value.report
+    assert list(report.failed) == [NAMES[1]]
+    assert sorted(report.removed) == [NAMES[0], NAMES[2]]
+
+
+def test_max_workers_env(monkeypatch):
+    monkeypatch.setenv('SKALE_CLI_TEARDOWN_WORKERS', '3')
+    assert get_max_workers() == 3
+    monkeypatch.setenv('SKALE_CLI_TEARDOWN_WORKERS', 'many')
+    assert get_max_workers() == 8
+
+
+def test_default_docker_client(monkeypatch):
+    monkeypatch.setenv('DOCKER_HOST', 'unix:///var/run/test-docker.sock')
+    assert isinstance(compose_docker_api(4), docker.APIClient)
+    with mock.patch.object(docker.APIClient, 'containers',
+                           return_value=[]) as containers:
+        report = remove_dynamic_containers(max_workers=4, out=io.StringIO())
+    assert containers.call_count == 2
+    assert report.total == 0
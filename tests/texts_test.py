@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from tools import texts
+from tools.texts import Texts, load_texts
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = os.path.join(str(tmp_path), 'text.yml')
+    with open(path, 'w') as f:
+        f.write('node:\n  hello: Hello\n')
+    return path, path + '.cache'
+
+
+def test_cache_reused(text_file, monkeypatch):
+    path, cache_path = text_file
+    assert load_texts(path, cache_path) == {'node': {'hello': 'Hello'}}
+    assert os.path.isfile(cache_path)
+
+    def fail(source):
+        raise AssertionError('text.yml parsed again')
+    monkeypatch.setattr(texts, 'parse_texts', fail)
+    assert load_texts(path, cache_path) == {'node': {'hello': 'Hello'}}
+
+
+def test_cache_invalidated(text_file):
+    path, cache_path = text_file
+    load_texts(path, cache_path)
+    with open(path, 'w') as f:
+        f.write('node:\n  hello: Hi\n')
+    assert load_texts(path, cache_path) == {'node': {'hello': 'Hi'}}
+
+
+def test_broken_cache(text_file):
+    path, cache_path = text_file
+    with open(cache_path, 'wb') as f:
+        f.write(b'broken')
+    assert load_texts(path, cache_path) == {'node': {'hello': 'Hello'}}
+
+
+def test_texts_loaded_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(texts, '_texts', None)
+    monkeypatch.setattr(texts, 'load_texts',
+                        lambda: calls.append(1) or {'node': {'a': 'b'}})
+    catalog = Texts()
+    assert calls == []
+    assert catalog['node'] == {'a': 'b'}
+    assert Texts()['node'] == {'a': 'b'}
+    assert calls == [1]
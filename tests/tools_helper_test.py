@@ -0,0 +1,91 @@
+import json
+import logging
+import logging.handlers
+import os
+
+import pytest
+import readsettings
+
+from tools import helper
+
+
+def test_session_config_memoized(tmp_path, monkeypatch):
+    config_path = os.path.join(str(tmp_path), 'skale-cli.yaml')
+    with open(config_path, 'w') as f:
+        f.write('host: http://a.com\n')
+    monkeypatch.setattr(helper, 'CONFIG_FILEPATH', config_path)
+    monkeypatch.setattr(helper, '_session_config', None)
+    loads = []
+
+    class CountingReadSettings(readsettings.ReadSettings):
+        def __init__(self, *args, **kwargs):
+            loads.append(1)
+            super().__init__(*args, **kwargs)
+    monkeypatch.setattr(readsettings, 'ReadSettings', CountingReadSettings)
+
+    config = helper.session_config()
+    assert config['host'] == 'http://a.com'
+    assert helper.session_config() is config
+    assert len(loads) == 1
+
+    with open(config_path, 'w') as f:
+        f.write('host: http://b.com\n')
+    os.utime(config_path, ns=(0, 0))
+    assert helper.session_config()['host'] == 'http://b.com'
+    assert len(loads) == 2
+
+
+def test_parse_log_levels():
+    assert helper.parse_log_levels(None) == {}
+    assert helper.parse_log_levels('urllib3=debug, docker=WARNING,x,y=no') \
+        == {'urllib3': 'DEBUG', 'docker': 'WARNING'}
+
+
+@pytest.fixture
+def queued_logger(tmp_path, monkeypatch):
+    paths = [os.path.join(str(tmp_path), name)
+             for name in ('node-cli.log', 'debug-node-cli.log')]
+    monkeypatch.setattr(helper, 'LOG_FILEPATH', paths[0])
+    monkeypatch.setattr(helper, 'DEBUG_LOG_FILEPATH', paths[1])
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield paths
+    helper.stop_log_listener()
+    for handler in root.handlers:
+        if handler not in handlers:
+            root.removeHandler(handler)
+            handler.close()
+    root.setLevel(level)
+    logging.getLogger('urllib3').setLevel(logging.NOTSET)
+
+
+def read_lines(path):
+    with open(path) as log_file:
+        return log_file.read().splitlines()
+
+
+def test_init_default_logger(queued_logger):
+    helper.init_default_logger(levels={'urllib3': 'INFO'})
+    logging.getLogger('urllib3').debug('noisy')
+    logging.getLogger('core').debug('details')
+    logging.getLogger('core').info('done')
+    helper.stop_log_listener()
+    info_path, debug_path = queued_logger
+    assert [line.split(' - ', 1)[1] for line in read_lines(info_path)] == \
+        ['core - INFO - done']
+    assert [line.split(' - ', 1)[1] for line in read_lines(debug_path)] == \
+        ['core - DEBUG - details', 'core - INFO - done']
+
+
+def test_json_log_format(queued_logger):
+    helper.init_default_logger(log_format='json', levels={})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logging.getLogger('core').exception('failed')
+    helper.stop_log_listener()
+    record = json.loads(read_lines(queued_logger[0])[0])
+    assert list(record) == ['time', 'level', 'logger', 'message']
+    assert record['level'] == 'ERROR'
+    assert record['message'].startswith('failed\nTraceback')
+    assert 'ValueError: boom' in record['message']
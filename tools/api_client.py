@@ -0,0 +1,393 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.response import HTTPResponse
+from urllib3.util.retry import Retry
+
+from configs import (ADMIN_HOST, ADMIN_PORT, ADMIN_PROBE_TIMEOUT,
+                     ADMIN_SOCKET_PATH, API_BACKOFF_FACTOR, API_POOL_MAXSIZE,
+                     API_RETRIES)
+from configs.routes import get_route, get_route_timeout
+from tools import profiler
+from tools.api_stats import (ERROR_STATUS, ApiStats, add_timing,
+                             pop_timings, reset_timings)
+from tools.cache import ResponseCache
+from tools.circuit_breaker import AdminUnavailable, CircuitBreaker
+from tools.content_decoding import API_ACCEPT_ENCODING, DecodingHTTPResponse
+from tools.unix_adapter import (UNIX_SCHEME, UnixSocketAdapter,
+                                is_socket_listening)
+
+
+logger = logging.getLogger(__name__)
+
+HOST = f'http://{ADMIN_HOST}:{ADMIN_PORT}'
+UNIX_HOST = f'{UNIX_SCHEME}{ADMIN_HOST}'
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_METHODS = frozenset(['GET', 'HEAD'])
+
+
+def is_connect_error(err):
+    """
+    Request wasn't sent: connection was refused or timed out. Errors after
+    the connect, e.g. dropped response, don't tell that admin is down
+    """
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(err, requests.exceptions.ConnectionError):
+        return False
+    reason = err.args[0] if err.args else None
+    reason = getattr(reason, 'reason', reason)  # MaxRetryError
+    return isinstance(reason, NewConnectionError)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        """Connect time includes name resolution done by urllib3"""
+        start = time.perf_counter()
+        conn = super()._new_conn()
+        add_timing('connect', time.perf_counter() - start)
+        return conn
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+    ResponseCls = DecodingHTTPResponse
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter which reports connect time of new connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(
+            self.poolmanager.pool_classes_by_scheme,
+            http=TimedHTTPConnectionPool
+        )
+
+
+def compose_retry(retries=API_RETRIES, backoff_factor=API_BACKOFF_FACTOR):
+    """
+    Connection errors are retried for every method because the request
+    never reached skale-admin, 5xx responses only for idempotent ones.
+    Read timeouts are not retried so the timeout bounds the whole call
+    """
+    opts = {
+        'total': retries,
+        'connect': retries,
+        'read': False,
+        'status': retries,
+        'backoff_factor': backoff_factor,
+        'status_forcelist': RETRY_STATUSES,
+        'raise_on_status': False
+    }
+    try:
+        return Retry(allowed_methods=RETRY_METHODS, **opts)
+    except TypeError:  # urllib3 < 1.26
+        return Retry(method_whitelist=RETRY_METHODS, **opts)
+
+
+class ResponseStream:
+    """
+    Iterable over response body chunks. Body is tee'd into the cache writer
+    and committed on close if it was read till the end and marked as ok
+    """
+
+    def __init__(self, chunks, writer=None):
+        self.chunks = chunks
+        self.writer = writer
+        self.ok = False
+        self.exhausted = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if self.writer and not self.writer.write(chunk):
+                self.writer = None
+            yield chunk
+        self.exhausted = True
+
+    def close(self):
+        if self.writer:
+            if self.ok and self.exhausted:
+                self.writer.commit()
+            else:
+                self.writer.discard()
+
+
+class ApiClient:
+    """
+    Keep-alive HTTP client for skale-admin API shared by all commands.
+    Requests go through the unix socket if socket_path is set, otherwise
+    through TCP to the host. If breaker is set, skale-admin is probed
+    before the first request and calls fail fast while it's unavailable
+    """
+
+    def __init__(self, host=HOST, retries=API_RETRIES,
+                 pool_maxsize=API_POOL_MAXSIZE, socket_path=None,
+                 breaker=None):
+        self.host = host
+        self.socket_path = socket_path
+        self.breaker = breaker
+        self.timeout = None
+        self.cache = ResponseCache()
+        self.use_cache = True
+        self.stats = ApiStats()
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = API_ACCEPT_ENCODING
+        adapter = TimedHTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=compose_retry(retries)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if socket_path:
+            self.host = UNIX_HOST
+            self.session.mount(UNIX_SCHEME, UnixSocketAdapter(
+                socket_path,
+                pool_maxsize=pool_maxsize,
+                max_retries=compose_retry(retries)
+            ))
+
+    @property
+    def transport(self):
+        return 'unix' if self.socket_path else 'tcp'
+
+    def probe(self, timeout=ADMIN_PROBE_TIMEOUT):
+        """Checks that skale-admin accepts connections"""
+        if self.socket_path:
+            return is_socket_listening(self.socket_path, timeout)
+        url = urlsplit(self.host)
+        port = url.port or (443 if url.scheme == 'https' else 80)
+        try:
+            socket.create_connection((url.hostname, port),
+                                     timeout=timeout).close()
+            return True
+        except OSError:
+            return False
+
+    def check_available(self):
+        """Raises AdminUnavailable if skale-admin is known to be down"""
+        if self.breaker:
+            self.breaker.check(self.probe)
+
+    def construct_url(self, route):
+        return self.host.rstrip('/') + route
+
+    def get_timeout(self, blueprint, method, timeout=None):
+        connect_timeout, read_timeout = get_route_timeout(blueprint, method)
+        timeout = timeout if timeout is not None else self.timeout
+        if timeout is not None:
+            return min(connect_timeout, timeout), timeout
+        return connect_timeout, read_timeout
+
+    def get(self, blueprint, method, params=None, timeout=None, **kwargs):
+        return self.send(self.session.get, blueprint, method, timeout,
+                         params=params, **kwargs)
+
+    def post(self, blueprint, method, json=None, files=None, timeout=None,
+             **kwargs):
+        return self.send(self.session.post, blueprint, method, timeout,
+                         json=json, files=files, **kwargs)
+
+    def send(self, session_method, blueprint, method, timeout=None, **kwargs):
+        """Performs the request and records its timings into api stats"""
+        route = f'{blueprint}/{method}'
+        response, timings, start = self.perform(
+            session_method, blueprint, method, timeout, **kwargs)
+        self.record_stats(route, response, timings, start)
+        return response
+
+    @contextmanager
+    def get_stream(self, blueprint, method, params=None, timeout=None,
+                   **kwargs):
+        """
+        Streamed GET request, stats are recorded once the body is consumed
+        and the response is closed
+        """
+        route = f'{blueprint}/{method}'
+        response, timings, start = self.perform(
+            self.session.get, blueprint, method, timeout,
+            params=params, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            response.close()
+            self.record_stats(route, response, timings, start)
+
+    def perform(self, session_method, blueprint, method, timeout=None,
+                **kwargs):
+        route = f'{blueprint}/{method}'
+        url = self.construct_url(get_route(blueprint, method))
+        self.check_available()
+        reset_timings()
+        start = time.perf_counter()
+        try:
+            response = session_method(
+                url,
+                timeout=self.get_timeout(blueprint, method, timeout),
+                **kwargs
+            )
+        except Exception as err:
+            timings = pop_timings()
+            timings['total'] = time.perf_counter() - start
+            profiler.add('http', timings['total'])
+            self.stats.record(route, ERROR_STATUS, 0, timings,
+                              transport=self.transport)
+            if self.breaker and is_connect_error(err):
+                self.breaker.open(reason=f'{route} call failed: {err}')
+                raise AdminUnavailable(
+                    f'skale-admin is unavailable: {err}') from err
+            raise
+        return response, pop_timings(), start
+
+    def record_stats(self, route, response, timings, start):
+        try:
+            timings['total'] = time.perf_counter() - start
+            profiler.add('http', timings['total'])
+            timings['ttfb'] = response.elapsed.total_seconds()
+            raw = response.raw
+            # bytes on the wire, compressed if Content-Encoding was used
+            size = raw.tell() if isinstance(raw, HTTPResponse) \
+                else len(response.content)
+            retries = raw.retries if raw is not None else None
+            self.stats.record(
+                route,
+                response.status_code,
+                size,
+                timings,
+                retries=len(retries.history) if isinstance(
+                    retries, Retry) else 0,
+                transport=self.transport
+            )
+        except Exception:
+            logger.debug(f'Failed to record {route} stats', exc_info=True)
+
+    def get_json(self, blueprint, method, params=None, timeout=None):
+        route = f'{blueprint}/{method}'
+        if not self.cache.is_cacheable(route):
+            response = self.get(blueprint, method, params=params,
+                                timeout=timeout)
+            return response.json()
+
+        entry = self.cache.get(route, params) if self.use_cache else None
+        if entry and entry.is_fresh():
+            logger.debug(f'Using cached {route} response')
+            return json.loads(entry.read())
+        headers = entry.conditional_headers() if entry else {}
+        response = self.get(blueprint, method, params=params,
+                            timeout=timeout, headers=headers)
+        if entry and response.status_code == requests.codes.not_modified:
+            self.cache.touch(entry)
+            return json.loads(entry.read())
+        data = response.json()
+        if response.status_code == requests.codes.ok and \
+                isinstance(data, dict) and data.get('status') == 'ok':
+            self.cache.store(route, params, json.dumps(data).encode('utf-8'),
+                             response.headers)
+        return data
+
+    @contextmanager
+    def stream(self, blueprint, method, params=None, timeout=None):
+        route = f'{blueprint}/{method}'
+        cacheable = self.cache.is_cacheable(route)
+        entry = None
+        if cacheable and self.use_cache:
+            entry = self.cache.get(route, params)
+        if entry and entry.is_fresh():
+            logger.debug(f'Streaming cached {route} response')
+            yield ResponseStream(entry.iter_chunks(STREAM_CHUNK_SIZE))
+            return
+        headers = entry.conditional_headers() if entry else {}
+        with self.get_stream(blueprint, method, params=params,
+                             timeout=timeout, headers=headers) as response:
+            if entry and \
+                    response.status_code == requests.codes.not_modified:
+                self.cache.touch(entry)
+                yield ResponseStream(entry.iter_chunks(STREAM_CHUNK_SIZE))
+                return
+            writer = None
+            if cacheable and response.status_code == requests.codes.ok:
+                writer = self.cache.open_writer(route, params,
+                                                response.headers)
+            body = ResponseStream(
+                response.iter_content(STREAM_CHUNK_SIZE), writer)
+            try:
+                yield body
+            finally:
+                body.close()
+
+    def post_json(self, blueprint, method, json=None, files=None,
+                  timeout=None):
+        try:
+            response = self.post(blueprint, method, json=json, files=files,
+                                 timeout=timeout)
+            return response.json()
+        finally:
+            self.cache.invalidate(f'{blueprint}/{method}')
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def compose_api_client(socket_path=ADMIN_SOCKET_PATH):
+    """
+    Prefers skale-admin unix socket, falls back to TCP if it's missing
+    or nobody listens on it
+    """
+    breaker = CircuitBreaker()
+    if is_socket_listening(socket_path):
+        logger.debug(f'Using skale-admin unix socket {socket_path}')
+        return ApiClient(socket_path=socket_path, breaker=breaker)
+    return ApiClient(breaker=breaker)
+
+
+def get_api_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = compose_api_client()
+        return _client
+
+
+def set_api_timeout(timeout):
+    get_api_client().timeout = timeout
+
+
+def disable_api_cache():
+    get_api_client().use_cache = False
@@ -0,0 +1,158 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import math
+import os
+import threading
+import time
+
+from configs.cli_logger import API_STATS_FILEPATH, API_STATS_FILE_SIZE_BYTES
+
+
+logger = logging.getLogger(__name__)
+
+STATS_FIELDS = ('ts', 'route', 'status', 'bytes', 'connect', 'ttfb', 'total',
+                'retries', 'transport')
+TIMING_FIELDS = ('connect', 'ttfb', 'total')
+ERROR_STATUS = 'error'
+
+_timings = threading.local()
+
+
+def reset_timings():
+    _timings.values = {'connect': 0.0}
+
+
+def add_timing(name, seconds):
+    values = getattr(_timings, 'values', None)
+    if values is not None:
+        values[name] = values.get(name, 0.0) + seconds
+
+
+def pop_timings():
+    values = getattr(_timings, 'values', None) or {'connect': 0.0}
+    _timings.values = None
+    return values
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of the sorted values"""
+    if not values:
+        return None
+    rank = max(math.ceil(p / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class ApiStats:
+    """
+    Rolling tab-separated log of skale-admin calls, timings are stored
+    in milliseconds. When file exceeds max_bytes the older half is dropped
+    """
+
+    def __init__(self, path=None, max_bytes=API_STATS_FILE_SIZE_BYTES):
+        self.path = path or API_STATS_FILEPATH
+        self.max_bytes = max_bytes
+
+    def record(self, route, status, size, timings, retries=0,
+               transport='tcp'):
+        values = [
+            f'{time.time():.3f}', route, str(status), str(size),
+            *(f'{timings.get(name, 0.0) * 1000:.3f}' for name in TIMING_FIELDS),
+            str(retries), transport
+        ]
+        line = '\t'.join(values) + '\n'
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                         0o644)
+        except OSError:
+            return  # logs directory is created by init_logs_dir
+        try:
+            os.write(fd, line.encode('utf-8'))
+            file_size = os.fstat(fd).st_size
+        except OSError:
+            logger.debug('Failed to record api stats', exc_info=True)
+            return
+        finally:
+            os.close(fd)
+        if file_size > self.max_bytes:
+            self.trim()
+
+    def trim(self):
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(self.path, 'rb') as stats_file:
+                stats_file.seek(-(self.max_bytes // 2), os.SEEK_END)
+                stats_file.readline()
+                tail = stats_file.read()
+            with open(tmp_path, 'wb') as tmp_file:
+                tmp_file.write(tail)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.debug('Failed to trim api stats', exc_info=True)
+
+    def load(self, since=None):
+        records = []
+        try:
+            stats_file = open(self.path)
+        except FileNotFoundError:
+            return records
+        with stats_file:
+            for line in stats_file:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) != len(STATS_FIELDS):
+                    continue
+                record = dict(zip(STATS_FIELDS, fields))
+                try:
+                    record['ts'] = float(record['ts'])
+                    record['bytes'] = int(record['bytes'])
+                    record['retries'] = int(record['retries'])
+                    for name in TIMING_FIELDS:
+                        record[name] = float(record[name])
+                except ValueError:
+                    continue
+                if since is None or record['ts'] >= since:
+                    records.append(record)
+        return records
+
+
+def summarize(records):
+    by_route = {}
+    for record in records:
+        by_route.setdefault(record['route'], []).append(record)
+    summary = []
+    for route, route_records in sorted(by_route.items()):
+        totals = sorted(r['total'] for r in route_records)
+        ttfbs = sorted(r['ttfb'] for r in route_records)
+        summary.append({
+            'route': route,
+            'calls': len(route_records),
+            'errors': sum(
+                1 for r in route_records
+                if r['status'] == ERROR_STATUS or r['status'].startswith('5')
+            ),
+            'retries': sum(r['retries'] for r in route_records),
+            'p50': percentile(totals, 50),
+            'p95': percentile(totals, 95),
+            'p99': percentile(totals, 99),
+            'ttfb_p50': percentile(ttfbs, 50),
+            'avg_bytes': sum(r['bytes'] for r in route_records) //
+            len(route_records)
+        })
+    return summary
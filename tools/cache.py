@@ -0,0 +1,194 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from configs import API_CACHE_PATH
+from configs.routes import ROUTE_CACHE_TTL, ROUTE_INVALIDATES
+
+
+logger = logging.getLogger(__name__)
+
+
+def tmp_path_for(path):
+    """Unique per process and thread so concurrent writers don't clash"""
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+class CacheEntry:
+    def __init__(self, meta_path, body_path, meta):
+        self.meta_path = meta_path
+        self.body_path = body_path
+        self.stored_at = meta['stored_at']
+        self.ttl = meta['ttl']
+        self.etag = meta.get('etag')
+        self.last_modified = meta.get('last_modified')
+
+    def is_fresh(self):
+        return time.time() - self.stored_at < self.ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def read(self):
+        with open(self.body_path, 'rb') as body_file:
+            return body_file.read()
+
+    def iter_chunks(self, chunk_size):
+        with open(self.body_path, 'rb') as body_file:
+            yield from iter(lambda: body_file.read(chunk_size), b'')
+
+
+class CacheWriter:
+    """Writes streamed response body into the cache entry"""
+
+    def __init__(self, cache, route, params, headers):
+        self.cache = cache
+        self.route = route
+        self.meta_path, self.body_path = cache.entry_paths(route, params)
+        self.meta = cache.compose_meta(route, headers)
+        os.makedirs(os.path.dirname(self.body_path), exist_ok=True)
+        self.tmp_path = tmp_path_for(self.body_path)
+        self.body_file = open(self.tmp_path, 'wb')
+
+    def write(self, chunk):
+        """Returns False if the entry can't be written, it's discarded then"""
+        try:
+            self.body_file.write(chunk)
+            return True
+        except OSError:
+            logger.warning(f'Failed to cache {self.route} response',
+                           exc_info=True)
+            self.discard()
+            return False
+
+    def commit(self):
+        self.body_file.close()
+        try:
+            os.replace(self.tmp_path, self.body_path)
+            self.cache.write_meta(self.meta_path, self.meta)
+        except OSError:
+            logger.warning(f'Failed to cache {self.route} response',
+                           exc_info=True)
+
+    def discard(self):
+        try:
+            self.body_file.close()
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+class ResponseCache:
+    """
+    Stores successful responses of routes from ROUTE_CACHE_TTL on disk,
+    one directory per route, one body/meta pair per request params
+    """
+
+    def __init__(self, base_path=API_CACHE_PATH):
+        self.base_path = base_path
+
+    @staticmethod
+    def is_cacheable(route):
+        return route in ROUTE_CACHE_TTL
+
+    def route_path(self, route):
+        return os.path.join(self.base_path, *route.split('/'))
+
+    def entry_paths(self, route, params):
+        plain_params = json.dumps(params or {}, sort_keys=True, default=str)
+        key = hashlib.sha1(plain_params.encode('utf-8')).hexdigest()
+        path = os.path.join(self.route_path(route), key)
+        return f'{path}.meta', f'{path}.body'
+
+    def get(self, route, params=None):
+        meta_path, body_path = self.entry_paths(route, params)
+        if not os.path.isfile(body_path):
+            return None
+        try:
+            with open(meta_path) as meta_file:
+                return CacheEntry(meta_path, body_path, json.load(meta_file))
+        except (OSError, ValueError, KeyError):
+            logger.warning(f'Broken cache entry {meta_path}')
+            return None
+
+    @staticmethod
+    def compose_meta(route, headers=None):
+        headers = headers or {}
+        return {
+            'stored_at': time.time(),
+            'ttl': ROUTE_CACHE_TTL[route],
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified')
+        }
+
+    def write_meta(self, meta_path, meta):
+        self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def store(self, route, params, body, headers=None):
+        meta_path, body_path = self.entry_paths(route, params)
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            self._atomic_write(body_path, body)
+            self.write_meta(meta_path, self.compose_meta(route, headers))
+        except OSError:
+            logger.warning(f'Failed to cache {route} response', exc_info=True)
+
+    def open_writer(self, route, params, headers=None):
+        try:
+            return CacheWriter(self, route, params, headers)
+        except OSError:
+            logger.warning(f'Failed to cache {route} response', exc_info=True)
+            return None
+
+    def touch(self, entry):
+        meta = {
+            'stored_at': time.time(),
+            'ttl': entry.ttl,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified
+        }
+        try:
+            self.write_meta(entry.meta_path, meta)
+        except OSError:
+            logger.warning(f'Failed to update {entry.meta_path}',
+                           exc_info=True)
+
+    def invalidate(self, route):
+        for cached_route in ROUTE_INVALIDATES.get(route, []):
+            logger.debug(f'Invalidating {cached_route} cache after {route}')
+            shutil.rmtree(self.route_path(cached_route), ignore_errors=True)
+
+    @staticmethod
+    def _atomic_write(path, data):
+        tmp_path = tmp_path_for(path)
+        with open(tmp_path, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,135 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Checkpoints of completed steps, kept in the state file so the next run
+can skip them. Records are bound to the key (procedure, CLI version and
+configs stream) and hold the hash of step inputs and checksums of the
+files it produced
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from configs import STEPS_CHECKPOINTS_FILEPATH
+from tools.cache import tmp_path_for
+from tools.download import file_checksum
+
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_ALGORITHM = 'sha256'
+
+
+def inputs_hash(inputs):
+    plain = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(plain.encode('utf-8')).hexdigest()
+
+
+def outputs_checksums(paths):
+    return {
+        path: file_checksum(path, CHECKSUM_ALGORITHM)
+        if os.path.isfile(path) else None
+        for path in paths
+    }
+
+
+class Checkpoints:
+    """
+    Records of the steps listed in kept are used by every run, the other
+    ones only if resume is set. Records are never dropped because of the
+    missing resume, state of another key is replaced right away
+    """
+
+    def __init__(self, key, path=STEPS_CHECKPOINTS_FILEPATH, resume=False,
+                 kept=()):
+        self.key = key
+        self.path = path
+        self.resume = resume
+        self.kept = frozenset(kept)
+        self.lock = threading.Lock()
+        self.records = self.load()
+
+    def read_state(self):
+        try:
+            with open(self.path) as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return None
+        return state if isinstance(state, dict) else None
+
+    def load(self):
+        state = self.read_state()
+        if state is None or state.get('key') != self.key:
+            if state is not None:
+                logger.info(f'Checkpoints of {state.get("key")} are '
+                            f'replaced, current run is {self.key}')
+            self.records = {}
+            self.save()
+            return {}
+        return dict(state.get('steps') or {})
+
+    @property
+    def interrupted(self):
+        """Recorded steps which are skipped only by the resumed run"""
+        return [name for name in self.records if name not in self.kept]
+
+    def save(self):
+        tmp_path = tmp_path_for(self.path)
+        try:
+            with open(tmp_path, 'w') as tmp_file:
+                json.dump({'key': self.key, 'steps': self.records}, tmp_file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.warning('Failed to save steps checkpoints', exc_info=True)
+
+    def is_recorded(self, step):
+        """Step was completed with the same inputs"""
+        if not (self.resume or step.name in self.kept):
+            return False
+        record = self.records.get(step.name)
+        return record is not None and \
+            record.get('inputs') == inputs_hash(step.inputs)
+
+    def outputs_unchanged(self, step):
+        record = self.records.get(step.name) or {}
+        return outputs_checksums(step.outputs) == record.get('outputs')
+
+    def record(self, step):
+        record = {
+            'inputs': inputs_hash(step.inputs),
+            'outputs': outputs_checksums(step.outputs),
+            'finished_at': time.time()
+        }
+        with self.lock:
+            self.records[step.name] = record
+            self.save()
+
+    def clear(self):
+        with self.lock:
+            self.records = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
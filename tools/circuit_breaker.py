@@ -0,0 +1,119 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Circuit breaker for skale-admin calls shared by all CLI processes through
+the state file. Breaker is opened when skale-admin can't be reached, calls
+fail immediately while it's open. After the open period the next process
+probes skale-admin once (half-open state) and closes the breaker if it
+answers, otherwise the breaker is opened again
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from configs import CIRCUIT_OPEN_PERIOD, CIRCUIT_STATE_FILEPATH
+from tools.cache import tmp_path_for
+
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATE = 'open'
+
+
+class AdminUnavailable(Exception):
+    """Raised when skale-admin is not reachable or breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, path=CIRCUIT_STATE_FILEPATH,
+                 open_period=CIRCUIT_OPEN_PERIOD):
+        self.path = path
+        self.open_period = open_period
+        self.checked = False
+        self.lock = threading.RLock()
+
+    def read_state(self):
+        try:
+            with open(self.path) as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return None
+        return state if isinstance(state, dict) else None
+
+    def write_state(self, state):
+        tmp_path = tmp_path_for(self.path)
+        try:
+            with open(tmp_path, 'w') as tmp_file:
+                json.dump(state, tmp_file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.debug('Failed to save circuit breaker state',
+                         exc_info=True)
+
+    def remaining(self, state):
+        """Seconds left till the half-open probe, 0 if breaker is closed"""
+        if not state or state.get('state') != OPEN_STATE:
+            return 0
+        try:
+            elapsed = time.time() - float(state['opened_at'])
+        except (KeyError, TypeError, ValueError):
+            return 0
+        return max(self.open_period - elapsed, 0)
+
+    def check(self, probe):
+        """
+        Raises AdminUnavailable if breaker is open or probe fails.
+        Probe is done once per process, later calls pass immediately
+        """
+        with self.lock:
+            if self.checked:
+                return
+            state = self.read_state()
+            remaining = self.remaining(state)
+            if remaining:
+                raise AdminUnavailable(
+                    'skale-admin is unavailable, next check in '
+                    f'{remaining:.1f}s'
+                )
+            if not probe():
+                self.open(reason='probe failed')
+                raise AdminUnavailable('skale-admin is unavailable')
+            if state:
+                logger.info('skale-admin is back, closing circuit breaker')
+                self.close()
+            self.checked = True
+
+    def open(self, reason=''):
+        logger.warning(f'Opening circuit breaker: {reason}')
+        with self.lock:
+            self.checked = False
+            self.write_state({'state': OPEN_STATE, 'opened_at': time.time(),
+                              'reason': reason})
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.debug('Failed to close circuit breaker', exc_info=True)
@@ -0,0 +1,70 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+zstd decoding of API responses. urllib3 < 2 decodes only gzip, deflate
+and br, so the connection pools of the API client create responses which
+decode zstd too when zstandard package is installed
+"""
+
+from importlib.util import find_spec
+
+from urllib3.exceptions import DecodeError
+from urllib3.response import HTTPResponse
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+ZSTD_AVAILABLE = find_spec('zstandard') is not None
+API_ACCEPT_ENCODING = ACCEPT_ENCODING + ',zstd' if ZSTD_AVAILABLE \
+    else ACCEPT_ENCODING
+
+
+class ZstdDecoder:
+    """Streaming decoder with the zlib-like interface urllib3 expects"""
+
+    def __init__(self):
+        import zstandard
+        self.error = zstandard.ZstdError
+        self.decompressor = zstandard.ZstdDecompressor()
+        self.stream = self.decompressor.decompressobj()
+
+    def decompress(self, data):
+        if not data:
+            return b''
+        try:
+            output = [self.stream.decompress(data)]
+            # body may consist of several frames
+            while self.stream.eof and self.stream.unused_data:
+                unused = self.stream.unused_data
+                self.stream = self.decompressor.decompressobj()
+                output.append(self.stream.decompress(unused))
+        except self.error as err:
+            raise DecodeError(f'Failed to decode zstd body: {err}') from err
+        return b''.join(output)
+
+    def flush(self):
+        return b''
+
+
+class DecodingHTTPResponse(HTTPResponse):
+    def _init_decoder(self):
+        encoding = self.headers.get('content-encoding', '').strip().lower()
+        if self._decoder is None and encoding == 'zstd' and ZSTD_AVAILABLE:
+            self._decoder = ZstdDecoder()
+        super()._init_decoder()
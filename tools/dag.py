@@ -0,0 +1,206 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Runs steps in dependency order, independent ones concurrently. After a
+failure no new steps are started, the running ones are waited for and
+the rest are reported as skipped. Each step is timed. With checkpoints,
+completed steps are recorded and the ones recorded by a previous run
+are not started again while they are still valid
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from configs import STEPS_MAX_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+DONE_EARLIER = 'done earlier'
+COMPLETED = (DONE, DONE_EARLIER)
+
+
+class Step:
+    """
+    inputs are the json-serializable parameters the step result depends
+    on, outputs are the paths of files it produces, both are used by
+    checkpoints only
+    """
+
+    def __init__(self, name, func, requires=(), inputs=None, outputs=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.inputs = inputs
+        self.outputs = tuple(outputs)
+
+
+class StepResult:
+    def __init__(self, name):
+        self.name = name
+        self.status = PENDING
+        self.started = None
+        self.duration = None
+        self.error = None
+
+
+class StepsReport:
+    def __init__(self, steps):
+        self.results = OrderedDict(
+            (step.name, StepResult(step.name)) for step in steps)
+        self.start = time.monotonic()
+        self.elapsed = 0
+
+    @property
+    def ok(self):
+        return all(result.status in COMPLETED
+                   for result in self.results.values())
+
+    @property
+    def failed(self):
+        return [result for result in self.results.values()
+                if result.status == FAILED]
+
+    @property
+    def sequential_time(self):
+        """Time the steps would take if they were run one by one"""
+        return sum(result.duration or 0 for result in self.results.values())
+
+
+def check_graph(steps):
+    """Raises ValueError on duplicate names, unknown requirements and cycles"""
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f'Duplicate step names: {names}')
+    requires = {step.name: set(step.requires) for step in steps}
+    for name, deps in requires.items():
+        unknown = deps - set(names)
+        if unknown:
+            raise ValueError(f'Step {name} requires unknown steps: {unknown}')
+    resolved = set()
+    while len(resolved) < len(names):
+        ready = [name for name in names
+                 if name not in resolved and requires[name] <= resolved]
+        if not ready:
+            raise ValueError('Steps have circular requirements: ' + ', '.join(
+                name for name in names if name not in resolved))
+        resolved.update(ready)
+
+
+def completed_earlier(steps, checkpoints):
+    """
+    Names of recorded steps whose requirements are completed earlier too.
+    Outputs may be gone only if all the steps requiring them are completed,
+    e.g. staged files moved into place
+    """
+    completed = {step.name for step in steps if checkpoints.is_recorded(step)}
+    dependents = {step.name: [] for step in steps}
+    for step in steps:
+        for dep in step.requires:
+            dependents[dep].append(step.name)
+    changed = True
+    while changed:
+        changed = False
+        for step in steps:
+            if step.name not in completed:
+                continue
+            consumed = dependents[step.name] and all(
+                name in completed for name in dependents[step.name])
+            if not set(step.requires) <= completed or not (
+                    consumed or checkpoints.outputs_unchanged(step)):
+                completed.discard(step.name)
+                changed = True
+    return completed
+
+
+def execute(step, result, start):
+    result.started = time.monotonic() - start
+    logger.info(f'Step {step.name} started')
+    try:
+        step.func()
+    finally:
+        result.duration = time.monotonic() - start - result.started
+
+
+def run_steps(steps, max_workers=STEPS_MAX_WORKERS, on_interrupt=None,
+              checkpoints=None):
+    """
+    Returns StepsReport. on_interrupt is called on KeyboardInterrupt to
+    stop the running steps, they are waited for before it's re-raised
+    """
+    check_graph(steps)
+    report = StepsReport(steps)
+    results = report.results
+    if checkpoints:
+        for name in completed_earlier(steps, checkpoints):
+            logger.info(f'Step {name} is completed earlier, skipping')
+            results[name].status = DONE_EARLIER
+    start = report.start
+    running = {}
+    failed = False
+
+    def submit_ready(pool):
+        for step in steps:
+            result = results[step.name]
+            if result.status == PENDING and step not in running.values() \
+                    and all(results[dep].status in COMPLETED
+                            for dep in step.requires):
+                running[pool.submit(execute, step, result, start)] = step
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            submit_ready(pool)
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    result = results[step.name]
+                    error = future.exception()
+                    if error is None:
+                        result.status = DONE
+                        logger.info(f'Step {step.name} done in '
+                                    f'{result.duration:.1f}s')
+                        if checkpoints:
+                            checkpoints.record(step)
+                    else:
+                        result.status = FAILED
+                        result.error = error
+                        failed = True
+                        logger.error(f'Step {step.name} failed',
+                                     exc_info=error)
+                if not failed:
+                    submit_ready(pool)
+        except KeyboardInterrupt:
+            if on_interrupt:
+                on_interrupt()
+            raise
+    for result in results.values():
+        if result.status == PENDING:
+            result.status = SKIPPED
+    report.elapsed = time.monotonic() - start
+    logger.info(f'Steps took {report.elapsed:.1f}s, '
+                f'{report.sequential_time:.1f}s if run one by one')
+    return report
@@ -0,0 +1,415 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Downloads of large files from skale-admin. Body is written into a .part
+file which is resumed with Range requests after connection drops (and by
+the next run if the server still serves the same file, by the validator
+and size kept in .part.meta), optionally in parallel segments, and
+verified against the checksum from headers.
+gzip or zstd encoded body is stored as is, with the matching file suffix.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import urllib3
+
+from configs import (DOWNLOAD_ATTEMPTS, DOWNLOAD_CHUNK_SIZE,
+                     DOWNLOAD_PROGRESS_INTERVAL)
+
+
+logger = logging.getLogger(__name__)
+
+PART_SUFFIX = '.part'
+PART_META_SUFFIX = '.meta'
+RETRY_BACKOFF = 0.5
+
+STORED_ENCODINGS = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+ACCEPT_STORED_ENCODINGS = ', '.join(STORED_ENCODINGS)
+
+TRANSFER_ERRORS = (
+    requests.exceptions.RequestException,
+    urllib3.exceptions.HTTPError
+)
+
+DIGEST_ALGORITHMS = {
+    'sha-512': 'sha512',
+    'sha-256': 'sha256',
+    'sha': 'sha1',
+    'md5': 'md5'
+}
+
+
+class DownloadError(Exception):
+    """Raised when file can't be downloaded completely"""
+
+
+class ResponseError(DownloadError):
+    def __init__(self, response):
+        self.status_code = response.status_code
+        try:
+            self.payload = response.json()
+        except ValueError:
+            self.payload = None
+        super().__init__(f'Request failed, status code: {self.status_code}')
+
+
+class ChecksumMismatch(DownloadError):
+    pass
+
+
+def parse_checksum(headers):
+    """
+    Returns (hashlib algorithm, hex digest) from RFC 3230 Digest,
+    X-Checksum-Sha256 or Content-MD5 headers, strongest one first
+    """
+    digests = {}
+    for item in (headers.get('Digest') or '').split(','):
+        name, _, value = item.strip().partition('=')
+        algorithm = DIGEST_ALGORITHMS.get(name.lower())
+        if algorithm and value:
+            digests[algorithm] = value
+    if headers.get('X-Checksum-Sha256'):
+        return 'sha256', headers['X-Checksum-Sha256'].lower()
+    if headers.get('Content-MD5'):
+        digests.setdefault('md5', headers['Content-MD5'])
+    for algorithm in DIGEST_ALGORITHMS.values():
+        if algorithm in digests:
+            try:
+                raw = base64.b64decode(digests[algorithm], validate=True)
+            except binascii.Error:
+                logger.warning(f'Malformed {algorithm} digest header')
+                continue
+            return algorithm, raw.hex()
+    return None
+
+
+def file_checksum(path, algorithm):
+    file_hash = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class RemoteFile:
+    def __init__(self, headers):
+        disposition = headers.get('Content-Disposition') or ''
+        match = re.search(r'filename=(.+)', disposition)
+        if not match:
+            raise DownloadError('Response has no file name')
+        self.filename = os.path.basename(match.group(1).strip().strip('"'))
+        encoding = (headers.get('Content-Encoding') or '').strip().lower()
+        self.store_encoded = encoding in STORED_ENCODINGS
+        if self.store_encoded:
+            self.filename += STORED_ENCODINGS[encoding]
+        size = headers.get('Content-Length')
+        self.size = int(size) if size and size.isdigit() else None
+        if encoding and not self.store_encoded:
+            self.size = None  # decoded body size is unknown
+        self.validator = headers.get('ETag') or headers.get('Last-Modified')
+        self.resumable = self.size is not None and \
+            self.validator is not None and \
+            headers.get('Accept-Ranges') == 'bytes'
+        self.checksum = parse_checksum(headers)
+
+
+class Progress:
+    """Transferred bytes and throughput, rendered only on a terminal"""
+
+    def __init__(self, total=None, out=None,
+                 interval=DOWNLOAD_PROGRESS_INTERVAL):
+        self.total = total
+        self.out = out or sys.stderr
+        self.enabled = self.out.isatty()
+        self.interval = interval
+        self.done = 0
+        self.transferred = 0
+        self.start = time.monotonic()
+        self.last_render = 0
+        self.lock = threading.Lock()
+
+    def update(self, size):
+        with self.lock:
+            self.done += size
+            self.transferred += size
+            now = time.monotonic()
+            if self.enabled and now - self.last_render >= self.interval:
+                self.last_render = now
+                self.render(now)
+
+    def set_done(self, done):
+        with self.lock:
+            self.done = done
+
+    def speed(self, now=None):
+        elapsed = (now or time.monotonic()) - self.start
+        return self.transferred / elapsed if elapsed > 0 else 0
+
+    def render(self, now):
+        mib = 1024 * 1024
+        line = f'{self.done / mib:.1f}'
+        if self.total:
+            line += f'/{self.total / mib:.1f} MiB ' \
+                    f'({self.done * 100 // self.total}%)'
+        else:
+            line += ' MiB'
+        self.out.write(f'\r{line}, {self.speed(now) / mib:.1f} MiB/s ')
+        self.out.flush()
+
+    def finish(self):
+        if self.enabled:
+            self.render(time.monotonic())
+            self.out.write('\n')
+            self.out.flush()
+
+
+class Download:
+    def __init__(self, client, blueprint, method, params=None,
+                 attempts=DOWNLOAD_ATTEMPTS):
+        self.client = client
+        self.blueprint = blueprint
+        self.method = method
+        self.params = params
+        self.attempts = attempts
+        self.remote = None
+        self.progress = None
+
+    def open(self, start=None, end=None):
+        headers = {'Accept-Encoding': ACCEPT_STORED_ENCODINGS}
+        if start is not None:
+            end = '' if end is None else end
+            headers['Range'] = f'bytes={start}-{end}'
+            headers['If-Range'] = self.remote.validator
+        return self.client.get_stream(self.blueprint, self.method,
+                                      params=self.params, headers=headers)
+
+    def write_body(self, response, part_file, offset):
+        part_file.seek(offset)
+        if self.remote.store_encoded:
+            chunks = response.raw.stream(DOWNLOAD_CHUNK_SIZE,
+                                         decode_content=False)
+        else:
+            chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+        for chunk in chunks:
+            part_file.write(chunk)
+            self.progress.update(len(chunk))
+
+    def retry(self, attempt, err, what):
+        if attempt + 1 >= self.attempts:
+            raise DownloadError(f'{what} failed after {self.attempts} '
+                                f'attempts: {err}') from err
+        logger.warning(f'{what} interrupted: {err}, retrying')
+        time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    def fetch_sequential(self, part_path, response=None):
+        """
+        Writes the whole file into part_path starting from its current size,
+        uses the already opened response if given
+        """
+        open(part_path, 'ab').close()
+        with open(part_path, 'r+b') as part_file:
+            if response is not None:
+                part_file.truncate(0)
+            offset = part_file.seek(0, os.SEEK_END)
+            self.progress.set_done(offset)
+            for attempt in range(self.attempts):
+                try:
+                    if response is not None:
+                        opened, response = response, None
+                        self.write_body(opened, part_file, 0)
+                    elif offset and offset == self.remote.size:
+                        break
+                    else:
+                        with self.open(offset or None) as opened:
+                            if opened.status_code == requests.codes.ok:
+                                # file changed on the server, If-Range failed
+                                part_file.truncate(0)
+                                offset = 0
+                                self.progress.set_done(0)
+                            elif opened.status_code == requests.codes.\
+                                    requested_range_not_satisfiable:
+                                logger.warning(f'{part_path} is larger than '
+                                               'the file, starting over')
+                                part_file.truncate(0)
+                                part_file.seek(0)
+                                offset = 0
+                                self.progress.set_done(0)
+                                continue
+                            elif opened.status_code != \
+                                    requests.codes.partial_content:
+                                raise ResponseError(opened)
+                            self.write_body(opened, part_file, offset)
+                    ended = part_file.tell()
+                    if self.remote.size is not None and \
+                            ended < self.remote.size:
+                        # urllib3 < 1.26 ends a cut body without an error
+                        raise requests.exceptions.ChunkedEncodingError(
+                            f'Body ended at {ended} of {self.remote.size} '
+                            'bytes')
+                    break
+                except TRANSFER_ERRORS as err:
+                    part_file.flush()
+                    offset = part_file.tell() if self.remote.resumable else 0
+                    if not offset:
+                        part_file.truncate(0)
+                    self.retry(attempt, err, 'Download')
+            size = part_file.seek(0, os.SEEK_END)
+        if self.remote.size is not None and size != self.remote.size:
+            raise DownloadError(
+                f'Downloaded {size} bytes, expected {self.remote.size}')
+
+    def fetch_segment(self, part_path, start, end):
+        position = start
+        with open(part_path, 'r+b') as part_file:
+            for attempt in range(self.attempts):
+                try:
+                    with self.open(position, end) as response:
+                        if response.status_code != \
+                                requests.codes.partial_content:
+                            raise DownloadError(
+                                'Server did not return requested range, '
+                                f'status code: {response.status_code}')
+                        self.write_body(response, part_file, position)
+                    position = part_file.tell()
+                    if position > end:
+                        return
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f'Segment {start}-{end} ended at {position}')
+                except TRANSFER_ERRORS as err:
+                    part_file.flush()
+                    position = part_file.tell()
+                    self.retry(attempt, err, f'Segment {start}-{end}')
+
+    def fetch_parallel(self, part_path, segments):
+        size = self.remote.size
+        with open(part_path, 'wb') as part_file:
+            part_file.truncate(size)
+        step = -(-size // segments)
+        bounds = [(start, min(start + step, size) - 1)
+                  for start in range(0, size, step)]
+        with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+            futures = [
+                executor.submit(self.fetch_segment, part_path, start, end)
+                for start, end in bounds
+            ]
+            for future in futures:
+                future.result()
+
+    def verify(self, path):
+        if not self.remote.checksum:
+            logger.info('No checksum provided, skipping verification')
+            return
+        algorithm, expected = self.remote.checksum
+        actual = file_checksum(path, algorithm)
+        if actual != expected:
+            raise ChecksumMismatch(
+                f'{algorithm} checksum mismatch: {actual} != {expected}')
+        logger.info(f'{algorithm} checksum verified')
+
+    @property
+    def part_meta(self):
+        return {'validator': self.remote.validator, 'size': self.remote.size}
+
+    def part_matches(self, part_path):
+        """Part was written from the same remote file, so it can be resumed"""
+        try:
+            with open(part_path + PART_META_SUFFIX) as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            return False
+        return meta == self.part_meta and \
+            os.path.getsize(part_path) <= self.remote.size
+
+    def write_part_meta(self, part_path):
+        with open(part_path + PART_META_SUFFIX, 'w') as meta_file:
+            json.dump(self.part_meta, meta_file)
+
+    def remove_part(self, part_path, meta_only=False):
+        paths = [part_path + PART_META_SUFFIX]
+        if not meta_only:
+            paths.append(part_path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def run(self, dest_dir, segments=1, progress_out=None):
+        with self.open() as response:
+            if response.status_code != requests.codes.ok:
+                raise ResponseError(response)
+            self.remote = RemoteFile(response.headers)
+            filepath = os.path.join(dest_dir, self.remote.filename)
+            part_path = filepath + PART_SUFFIX
+            self.progress = Progress(self.remote.size, progress_out)
+            resume = self.remote.resumable and os.path.isfile(part_path)
+            if resume and not self.part_matches(part_path):
+                logger.info(f'{part_path} is not of the served file, '
+                            'starting over')
+                resume = False
+            parallel = self.remote.resumable and segments > 1 and not resume
+            if resume:
+                logger.info(f'Resuming {part_path}')
+            else:
+                # preallocated parallel part can't be resumed
+                self.remove_part(part_path, meta_only=True)
+            if not (resume or parallel):
+                if self.remote.resumable:
+                    self.write_part_meta(part_path)
+                self.fetch_sequential(part_path, response)
+        if resume:
+            self.fetch_sequential(part_path)
+        elif parallel:
+            self.fetch_parallel(part_path, segments)
+        self.progress.finish()
+        logger.info(
+            f'Downloaded {self.remote.filename}: {self.progress.done} bytes, '
+            f'{self.progress.speed() / 1024 / 1024:.1f} MiB/s'
+        )
+        try:
+            self.verify(part_path)
+        except ChecksumMismatch:
+            self.remove_part(part_path)
+            raise
+        os.replace(part_path, filepath)
+        self.remove_part(part_path, meta_only=True)
+        return self.remote.filename
+
+
+def download_api_file(client, blueprint, method, dest_dir, params=None,
+                      segments=1, progress_out=None):
+    """Downloads file returned by the route into dest_dir, returns its name"""
+    download = Download(client, blueprint, method, params=params)
+    return download.run(dest_dir, segments=segments,
+                        progress_out=progress_out)
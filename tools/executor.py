@@ -0,0 +1,168 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Runs external commands with their output streamed line by line into the
+log (and optionally to the console) as it's produced. Only the last
+lines of each stream are kept for error reporting, so memory usage
+doesn't depend on the output size. Commands keep the terminal stdin, so
+sudo can ask for a password. On timeout the command gets SIGTERM and,
+after a grace period, SIGKILL. Detached commands run without stdin in
+their own session, the signals are sent to their whole process group
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+from collections import deque
+
+from configs import (CMD_OUTPUT_LINE_LIMIT, CMD_OUTPUT_TAIL_LINES,
+                     CMD_TERMINATE_TIMEOUT)
+
+
+logger = logging.getLogger(__name__)
+
+_running = set()
+_running_lock = threading.Lock()
+
+
+class OutputPump(threading.Thread):
+    """Reads the pipe till EOF, keeping the last lines"""
+
+    def __init__(self, pipe, name, echo=None, log=True,
+                 tail_lines=CMD_OUTPUT_TAIL_LINES):
+        super().__init__(name=f'cmd-{name}', daemon=True)
+        self.pipe = pipe
+        self.stream_name = name
+        self.echo = echo
+        self.log = log
+        self.tail = deque(maxlen=tail_lines)
+
+    def run(self):
+        try:
+            for line in iter(
+                    lambda: self.pipe.readline(CMD_OUTPUT_LINE_LIMIT), b''):
+                self.tail.append(line)
+                text = line.decode('utf-8', errors='replace')
+                if self.log:
+                    logger.info(f'[{self.stream_name}] {text.rstrip()}')
+                if self.echo:
+                    self.echo.write(text)
+                    self.echo.flush()
+        finally:
+            self.pipe.close()
+
+    @property
+    def output(self):
+        return b''.join(self.tail)
+
+
+def signal_process(process, sig):
+    """Detached process gets the signal with its process group"""
+    try:
+        if getattr(process, 'detached', False):
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except ProcessLookupError:
+        pass
+    except PermissionError:
+        # e.g. sudo, it's owned by root
+        logger.warning(f'Not permitted to send {sig} to {process.args}')
+
+
+def terminate(process, grace_period=CMD_TERMINATE_TIMEOUT):
+    signal_process(process, signal.SIGTERM)
+    try:
+        process.wait(grace_period)
+    except subprocess.TimeoutExpired:
+        logger.warning(f'{process.args} ignored SIGTERM, killing it')
+        signal_process(process, signal.SIGKILL)
+        process.wait()
+
+
+def terminate_running():
+    """
+    Sends SIGTERM to commands started by other threads, they are waited
+    for (and killed if needed) by their own threads
+    """
+    with _running_lock:
+        processes = list(_running)
+    for process in processes:
+        signal_process(process, signal.SIGTERM)
+
+
+def join_pumps(pumps, timeout=None):
+    """
+    After termination children of the command may still hold the pipes,
+    so pumps are waited for only a limited time
+    """
+    for pump in pumps:
+        pump.join(timeout)
+
+
+def run_streaming(cmd, env=None, shell=False, timeout=None, echo=False,
+                  log_output=True, tail_lines=CMD_OUTPUT_TAIL_LINES,
+                  grace_period=CMD_TERMINATE_TIMEOUT, detached=False):
+    """
+    Returns CompletedProcess with the last lines of stdout and stderr,
+    raises CalledProcessError if the command failed and TimeoutExpired
+    if it didn't finish in time. Detached command is non-interactive
+    """
+    opts = {}
+    if detached:
+        opts = {'stdin': subprocess.DEVNULL, 'start_new_session': True}
+    process = subprocess.Popen(
+        cmd, shell=shell, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, **opts
+    )
+    process.detached = detached
+    pumps = [
+        OutputPump(process.stdout, 'stdout', sys.stdout if echo else None,
+                   log_output, tail_lines),
+        OutputPump(process.stderr, 'stderr', sys.stderr if echo else None,
+                   log_output, tail_lines)
+    ]
+    for pump in pumps:
+        pump.start()
+    with _running_lock:
+        _running.add(process)
+    try:
+        returncode = process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        logger.error(f'Command timed out after {timeout}s, terminating it')
+        terminate(process, grace_period)
+        join_pumps(pumps, grace_period)
+        raise subprocess.TimeoutExpired(
+            cmd, timeout, output=pumps[0].output, stderr=pumps[1].output)
+    except KeyboardInterrupt:
+        # attached command has got SIGINT from the terminal as well
+        terminate(process, grace_period)
+        raise
+    finally:
+        with _running_lock:
+            _running.discard(process)
+    join_pumps(pumps)
+    stdout, stderr = pumps[0].output, pumps[1].output
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
@@ -26,3 +26,4 @@ class CLIExitCodes(IntEnum):
     FAILURE = 1
     BAD_API_RESPONSE = 3
     SCRIPT_EXECUTION_ERROR = 4
+    ADMIN_UNAVAILABLE = 5
@@ -18,15 +18,9 @@
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
-import re
 import sys
 import json
-import yaml
-import shutil
-import requests
 import subprocess
-import urllib.request
-from subprocess import PIPE
 from functools import wraps
 
 import logging
@@ -35,26 +29,25 @@ import logging.handlers as py_handlers
 
 import click
 
-from jinja2 import Environment
-from readsettings import ReadSettings
-
-from core.print_formatters import print_err_response
 from tools.exit_codes import CLIExitCodes
 
 from configs.env import (absent_params as absent_env_params,
                          get_params as get_env_params)
-from configs import CONFIG_FILEPATH, TEXT_FILE, ADMIN_HOST, ADMIN_PORT
-from configs.cli_logger import (LOG_FORMAT, LOG_BACKUP_COUNT,
-                                LOG_FILE_SIZE_BYTES,
-                                LOG_FILEPATH, DEBUG_LOG_FILEPATH)
-from configs.routes import get_route
+from configs import (CONFIG_FILEPATH, DOWNLOAD_CHUNK_SIZE,
+                     FILE_DOWNLOAD_TIMEOUT, SHOW_CMD_OUTPUT_ENV_VAR)
+from configs.cli_logger import (LOG_FORMAT, LOG_FORMAT_ENV_VAR,
+                                LOG_BACKUP_COUNT, LOG_FILE_SIZE_BYTES,
+                                LOG_FILEPATH, DEBUG_LOG_FILEPATH,
+                                LOG_LEVELS, LOG_LEVELS_ENV_VAR)
+from configs.routes import RouteNotFoundException
+from tools import profiler
+from tools.circuit_breaker import AdminUnavailable
+from tools.texts import get_texts
 
 
 logger = logging.getLogger(__name__)
 
 
-HOST = f'http://{ADMIN_HOST}:{ADMIN_PORT}'
-
 DEFAULT_ERROR_DATA = {
     'status': 'error',
     'payload': 'Request failed. Check skale_api container logs'
@@ -71,20 +64,32 @@ def write_json(path, content):
         json.dump(content, outfile, indent=4)
 
 
-def run_cmd(cmd, env={}, shell=False, secure=False):
+def run_cmd(cmd, env={}, shell=False, secure=False, timeout=None,
+            echo=None, detached=False):
+    """
+    Output is streamed into the log while the command runs (and to the
+    console if echo is set or SKALE_CLI_SHOW_CMD_OUTPUT=1), the result
+    keeps only its last lines. Command keeps the terminal unless it's
+    detached
+    """
+    from tools.executor import run_streaming
     if not secure:
         logger.info(f'Running: {cmd}')
     else:
         logger.info('Running some secure command')
-    res = subprocess.run(cmd, shell=shell, stdout=PIPE, stderr=PIPE, env={**env, **os.environ})
-    if res.returncode:
-        logger.info(res.stdout.decode('UTF-8').rstrip())
-        logger.error('Error during shell execution:')
-        logger.error(res.stderr.decode('UTF-8').rstrip())
-        res.check_returncode()
-    else:
-        logger.info('Command is executed successfully. Command log:')
-        logger.info(res.stdout.decode('UTF-8').rstrip())
+    if echo is None:
+        echo = os.environ.get(SHOW_CMD_OUTPUT_ENV_VAR) == '1'
+    try:
+        res = run_streaming(cmd, env={**env, **os.environ}, shell=shell,
+                            timeout=timeout, echo=echo, detached=detached)
+    except subprocess.CalledProcessError as err:
+        logger.error(f'Error during shell execution, exit code '
+                     f'{err.returncode}')
+        raise
+    except subprocess.TimeoutExpired:
+        logger.error(f'Shell execution timed out after {timeout}s')
+        raise
+    logger.info('Command is executed successfully')
     return res
 
 
@@ -92,8 +97,21 @@ def format_output(res):
     return res.stdout.decode('UTF-8').rstrip(), res.stderr.decode('UTF-8').rstrip()
 
 
-def download_file(url, filepath):
-    return urllib.request.urlretrieve(url, filepath)
+def download_file(url, filepath, timeout=FILE_DOWNLOAD_TIMEOUT):
+    """File is replaced only when the body is downloaded completely"""
+    import requests
+    from tools.cache import tmp_path_for
+    tmp_path = tmp_path_for(filepath)
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(tmp_path, 'wb') as tmp_file:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    tmp_file.write(chunk)
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def process_template(source, destination, data):
@@ -103,6 +121,7 @@ def process_template(source, destination, data):
     :param data: dictionary with fields for template
     :return: Nothing
     """
+    from jinja2 import Environment
     template = read_file(source)
     processed_template = Environment().from_string(template).render(data)
     with open(destination, "w") as f:
@@ -120,8 +139,31 @@ def get_username():
     return os.environ.get('USERNAME') or os.environ.get('USER')
 
 
+_session_config = None
+_session_config_version = None
+
+
+def config_file_version(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def session_config():
-    return ReadSettings(CONFIG_FILEPATH)
+    """
+    Config file is parsed on the first call only, the same object is
+    returned until the file is modified
+    """
+    global _session_config, _session_config_version
+    version = config_file_version(CONFIG_FILEPATH)
+    if _session_config is None or version != _session_config_version:
+        from readsettings import ReadSettings
+        with profiler.phase('config'):
+            _session_config = ReadSettings(CONFIG_FILEPATH)
+        _session_config_version = version
+    return _session_config
 
 
 def extract_env_params(env_filepath):
@@ -140,7 +182,18 @@ def extract_env_params(env_filepath):
     return env_params
 
 
+def exit_code_of(code):
+    """Exit code of the process which raised SystemExit(code)"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
 def error_exit(error_payload, exit_code=CLIExitCodes.FAILURE):
+    from core.print_formatters import print_err_response
     print_err_response(error_payload)
     sys.exit(exit_code.value)
 
@@ -163,14 +216,11 @@ def no_node(f):
 
 
 def safe_load_texts():
-    with open(TEXT_FILE, 'r') as stream:
-        try:
-            return yaml.safe_load(stream)
-        except yaml.YAMLError as exc:
-            print(exc)
+    return get_texts()
 
 
 def safe_load_yml(filepath):
+    import yaml
     with open(filepath, 'r') as stream:
         try:
             return yaml.safe_load(stream)
@@ -178,21 +228,33 @@ def safe_load_yml(filepath):
             print(exc)
 
 
-def construct_url(route):
-    return urllib.parse.urljoin(HOST, route)
-
-
 def abort_if_false(ctx, param, value):
     if not value:
         ctx.abort()
 
 
+def admin_unavailable_exit(err):
+    logger.error(err)
+    error_exit(str(err), exit_code=CLIExitCodes.ADMIN_UNAVAILABLE)
+
+
+def ensure_admin_available():
+    from tools.api_client import get_api_client
+    try:
+        get_api_client().check_available()
+    except AdminUnavailable as err:
+        admin_unavailable_exit(err)
+
+
 def post_request(blueprint, method, json=None, files=None):
-    route = get_route(blueprint, method)
-    url = construct_url(route)
+    from tools.api_client import get_api_client
     try:
-        response = requests.post(url, json=json, files=files)
-        data = response.json()
+        data = get_api_client().post_json(blueprint, method,
+                                          json=json, files=files)
+    except RouteNotFoundException:
+        raise
+    except AdminUnavailable as err:
+        admin_unavailable_exit(err)
     except Exception as err:
         logger.error('Request failed', exc_info=err)
         data = DEFAULT_ERROR_DATA
@@ -201,12 +263,15 @@ def post_request(blueprint, method, json=None, files=None):
     return status, payload
 
 
-def get_request(blueprint, method, params=None):
-    route = get_route(blueprint, method)
-    url = construct_url(route)
+def get_request(blueprint, method, params=None, timeout=None):
+    from tools.api_client import get_api_client
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = get_api_client().get_json(blueprint, method, params=params,
+                                         timeout=timeout)
+    except RouteNotFoundException:
+        raise
+    except AdminUnavailable as err:
+        admin_unavailable_exit(err)
     except Exception as err:
         logger.error('Request failed', exc_info=err)
         data = DEFAULT_ERROR_DATA
@@ -216,40 +281,121 @@ def get_request(blueprint, method, params=None):
     return status, payload
 
 
-def download_dump(path, container_name=None):
-    route = get_route('logs', 'dump')
-    url = construct_url(route)
+def download_dump(path, container_name=None, segments=1):
+    from tools.api_client import get_api_client
+    from tools.download import (DownloadError, ResponseError,
+                                download_api_file)
     params = {}
     if container_name:
         params['container_name'] = container_name
-    with requests.get(url, params=params, stream=True) as r:
-        if r is None:
-            return None
-        if r.status_code != requests.codes.ok:  # pylint: disable=no-member
-            print('Request failed, status code:', r.status_code)
-            error_exit(r.json())
-            return None
-        d = r.headers['Content-Disposition']
-        fname_q = re.findall("filename=(.+)", d)[0]
-        fname = fname_q.replace('"', '')
-        filepath = os.path.join(path, fname)
-        with open(filepath, 'wb') as f:
-            shutil.copyfileobj(r.raw, f)
-    return fname
-
-
-def init_default_logger():
-    f_handler = get_file_handler(LOG_FILEPATH, logging.INFO)
-    debug_f_handler = get_file_handler(DEBUG_LOG_FILEPATH, logging.DEBUG)
-    logging.basicConfig(level=logging.DEBUG, handlers=[
-                        f_handler, debug_f_handler])
-
-
-def get_file_handler(log_filepath, log_level):
-    formatter = Formatter(LOG_FORMAT)
-    f_handler = py_handlers.RotatingFileHandler(
-        log_filepath, maxBytes=LOG_FILE_SIZE_BYTES,
-        backupCount=LOG_BACKUP_COUNT)
+    try:
+        return download_api_file(get_api_client(), 'logs', 'dump', path,
+                                 params=params, segments=segments)
+    except AdminUnavailable as err:
+        admin_unavailable_exit(err)
+    except ResponseError as err:
+        print('Request failed, status code:', err.status_code)
+        error_exit(err.payload)
+    except DownloadError as err:
+        logger.error(f'Dump download failed: {err}')
+        print(f'Dump download failed: {err}')
+    return None
+
+
+class JsonFormatter(Formatter):
+    """
+    One JSON object per line, time goes first in the same format as in
+    text logs, so logs cli can search both
+    """
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message = f'{message}\n{record.exc_text}'
+        return json.dumps({
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': message
+        })
+
+
+def parse_log_levels(value):
+    """name=LEVEL pairs separated by commas"""
+    levels = {}
+    for item in (value or '').split(','):
+        name, _, level = item.strip().partition('=')
+        if name and level.strip().upper() in logging._nameToLevel:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_log_listener = None
+
+
+def init_default_logger(log_format=None, levels=None):
+    """
+    Records are put into the queue by the calling thread and written to
+    the files by the listener thread, which is stopped (and the queue
+    drained) at exit
+    """
+    global _log_listener
+    import atexit
+    import queue
+    log_format = log_format or os.environ.get(LOG_FORMAT_ENV_VAR)
+    f_handler = get_file_handler(LOG_FILEPATH, logging.INFO, log_format)
+    debug_f_handler = get_file_handler(DEBUG_LOG_FILEPATH, logging.DEBUG,
+                                       log_format)
+    log_queue = queue.Queue(-1)
+    _log_listener = py_handlers.QueueListener(
+        log_queue, f_handler, debug_f_handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    root.addHandler(py_handlers.QueueHandler(log_queue))
+    if levels is None:
+        levels = {**LOG_LEVELS,
+                  **parse_log_levels(os.environ.get(LOG_LEVELS_ENV_VAR))}
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+    _log_listener.start()
+    atexit.register(stop_log_listener)
+
+
+def stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def log_synchronously():
+    """
+    Writes records from the calling thread, for forked children where the
+    listener thread doesn't exist
+    """
+    global _log_listener
+    if _log_listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, py_handlers.QueueHandler):
+            root.removeHandler(handler)
+    for handler in _log_listener.handlers:
+        root.addHandler(handler)
+    _log_listener = None
+
+
+def get_file_handler(log_filepath, log_level, log_format=None):
+    from tools.log_rotation import CompressingRotatingFileHandler
+    if log_format == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = Formatter(LOG_FORMAT)
+    f_handler = CompressingRotatingFileHandler(
+        log_filepath, max_bytes=LOG_FILE_SIZE_BYTES,
+        backup_count=LOG_BACKUP_COUNT)
     f_handler.setFormatter(formatter)
     f_handler.setLevel(log_level)
 
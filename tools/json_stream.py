@@ -0,0 +1,298 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Incremental JSON parsing for payloads that shouldn't be loaded into memory
+at once. iter_events turns byte chunks into (path, event, value) tuples
+where path is a tuple of map keys and array indexes of the current value.
+"""
+
+import codecs
+import json
+import re
+from json.decoder import scanstring
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?')
+NUMBER_CHARS = re.compile(r'[0-9.eE+\-]*')
+LITERALS = {'true': True, 'false': False, 'null': None}
+PATH_PART = re.compile(r'([^.\[\]]*)((?:\[(?:\d+|\*)\])*)$')
+PATH_INDEX = re.compile(r'\[(\d+|\*)\]')
+
+START_EVENTS = ('start_map', 'start_array')
+END_EVENTS = ('end_map', 'end_array')
+
+VALUE, VALUE_OR_END, KEY, KEY_OR_END, COLON, COMMA, DONE = range(7)
+
+
+class JsonStreamError(ValueError):
+    """Raised when streamed payload is not a valid JSON document"""
+
+
+class _NeedMore(Exception):
+    """Raised when token may continue in the next chunk"""
+
+
+class _Any:
+    def __repr__(self):
+        return '*'
+
+
+ANY = _Any()
+
+
+def iter_events(chunks):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf, pos = '', 0
+    final = False
+    path, stack = [], []
+    state = VALUE
+
+    while True:
+        pos = WHITESPACE.match(buf, pos).end()
+        try:
+            if pos >= len(buf):
+                raise _NeedMore
+            char = buf[pos]
+            if state == DONE:
+                raise JsonStreamError(
+                    f'Extra data after JSON document: {char!r}')
+
+            if state in (KEY, KEY_OR_END):
+                if char == '}' and state == KEY_OR_END:
+                    pos += 1
+                    stack.pop()
+                    path.pop()
+                    yield tuple(path), 'end_map', None
+                    state = COMMA if stack else DONE
+                elif char == '"':
+                    key, pos = _scan_string(buf, pos, final)
+                    path[-1] = key
+                    yield tuple(path[:-1]), 'map_key', key
+                    state = COLON
+                else:
+                    raise JsonStreamError(f'Expected map key, got {char!r}')
+            elif state == COLON:
+                if char != ':':
+                    raise JsonStreamError(f'Expected ":", got {char!r}')
+                pos += 1
+                state = VALUE
+            elif state == COMMA:
+                container = stack[-1]
+                if char == ',':
+                    pos += 1
+                    if container == 'map':
+                        state = KEY
+                    else:
+                        path[-1] += 1
+                        state = VALUE
+                elif char == '}' and container == 'map' or \
+                        char == ']' and container == 'array':
+                    pos += 1
+                    stack.pop()
+                    path.pop()
+                    yield tuple(path), f'end_{container}', None
+                    state = COMMA if stack else DONE
+                else:
+                    raise JsonStreamError(
+                        f'Expected "," or end of {container}, got {char!r}')
+            elif char == ']' and state == VALUE_OR_END:
+                pos += 1
+                stack.pop()
+                path.pop()
+                yield tuple(path), 'end_array', None
+                state = COMMA if stack else DONE
+            elif char == '{':
+                pos += 1
+                yield tuple(path), 'start_map', None
+                stack.append('map')
+                path.append(None)
+                state = KEY_OR_END
+            elif char == '[':
+                pos += 1
+                yield tuple(path), 'start_array', None
+                stack.append('array')
+                path.append(0)
+                state = VALUE_OR_END
+            else:
+                value, pos = _scan_scalar(buf, pos, final)
+                yield tuple(path), 'scalar', value
+                state = COMMA if stack else DONE
+        except _NeedMore:
+            if final:
+                break
+            buf = buf[pos:]
+            pos = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                buf += decoder.decode(b'', final=True)
+                final = True
+            else:
+                buf += decoder.decode(chunk)
+
+    if state != DONE:
+        raise JsonStreamError('Unexpected end of JSON document')
+
+
+def _scan_string(buf, pos, final):
+    try:
+        return scanstring(buf, pos + 1)
+    except json.JSONDecodeError as err:
+        if not final:
+            raise _NeedMore
+        raise JsonStreamError(str(err))
+
+
+def _scan_scalar(buf, pos, final):
+    char = buf[pos]
+    if char == '"':
+        return _scan_string(buf, pos, final)
+    if not final and NUMBER_CHARS.match(buf, pos).end() == len(buf):
+        raise _NeedMore
+    match = NUMBER.match(buf, pos)
+    if match:
+        text = match.group()
+        if '.' in text or 'e' in text or 'E' in text:
+            return float(text), match.end()
+        return int(text), match.end()
+    for literal, value in LITERALS.items():
+        if buf.startswith(literal, pos):
+            return value, pos + len(literal)
+        if not final and literal.startswith(buf[pos:]):
+            raise _NeedMore
+    raise JsonStreamError(f'Unexpected character {char!r}')
+
+
+def iter_subtree(first, events):
+    """Yields events of the value which starts with the first event"""
+    yield first
+    if first[1] not in START_EVENTS:
+        return
+    depth = 1
+    for event in events:
+        yield event
+        if event[1] in START_EVENTS:
+            depth += 1
+        elif event[1] in END_EVENTS:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def build_value(events):
+    """Materializes value from events of a single subtree"""
+    containers = []
+    result = None
+    key = None
+    for _, event, value in events:
+        if event == 'map_key':
+            key = value
+            continue
+        if event in END_EVENTS:
+            result = containers.pop()
+            continue
+        if event == 'start_map':
+            value = {}
+        elif event == 'start_array':
+            value = []
+        if containers:
+            parent = containers[-1]
+            if isinstance(parent, list):
+                parent.append(value)
+            else:
+                parent[key] = value
+        else:
+            result = value
+        if event in START_EVENTS:
+            containers.append(value)
+    return result
+
+
+def write_events(events, out, indent=4):
+    """Writes events of a single subtree to out as indented JSON"""
+    containers = []
+    has_items = []
+    after_key = False
+    for _, event, value in events:
+        if event == 'map_key':
+            out.write(',' if has_items[-1] else '')
+            out.write('\n' + ' ' * indent * len(containers))
+            out.write(json.dumps(value) + ': ')
+            has_items[-1] = True
+            after_key = True
+            continue
+        if event in END_EVENTS:
+            containers.pop()
+            if has_items.pop():
+                out.write('\n' + ' ' * indent * len(containers))
+            out.write('}' if event == 'end_map' else ']')
+            continue
+        if containers and not after_key:
+            out.write(',' if has_items[-1] else '')
+            out.write('\n' + ' ' * indent * len(containers))
+            has_items[-1] = True
+        after_key = False
+        if event == 'start_map':
+            out.write('{')
+        elif event == 'start_array':
+            out.write('[')
+        else:
+            out.write(json.dumps(value))
+        if event in START_EVENTS:
+            containers.append(event)
+            has_items.append(False)
+    out.write('\n')
+
+
+def compile_path(expression):
+    """
+    Compiles selector like skaleConfig.sChain.nodes[*].ip into a tuple of
+    map keys, array indexes and ANY wildcards
+    """
+    selector = []
+    for part in expression.split('.'):
+        match = PATH_PART.match(part)
+        if not match or not (match.group(1) or match.group(2)):
+            raise ValueError(f'Invalid path expression: {expression}')
+        key, indexes = match.groups()
+        if key:
+            selector.append(ANY if key == '*' else key)
+        for index in PATH_INDEX.findall(indexes):
+            selector.append(ANY if index == '*' else int(index))
+    return tuple(selector)
+
+
+def path_matches(path, selector):
+    return len(path) == len(selector) and all(
+        s is ANY or s == p and isinstance(s, int) == isinstance(p, int)
+        for p, s in zip(path, selector)
+    )
+
+
+def select(events, selector):
+    """Yields values located at paths matching the compiled selector"""
+    events = iter(events)
+    for path, event, value in events:
+        if event in ('map_key',) + END_EVENTS:
+            continue
+        if path_matches(path, selector):
+            first = (path, event, value)
+            yield build_value(iter_subtree(first, events))
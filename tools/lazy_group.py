@@ -0,0 +1,52 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import importlib
+
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    Group which imports subcommand modules only when they are dispatched.
+    lazy_commands maps command name to 'module:group', the click group in
+    that module which contains the command
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) |
+                      set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands:
+            self.load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def load_command(self, cmd_name):
+        module_name, group_name = self.lazy_commands.pop(cmd_name).split(':')
+        source = getattr(importlib.import_module(module_name), group_name)
+        command = source.get_command(None, cmd_name)
+        if command is None:
+            raise RuntimeError(f'{module_name}:{group_name} has no '
+                               f'{cmd_name} command')
+        self.add_command(command, cmd_name)
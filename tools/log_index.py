@@ -0,0 +1,222 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Sparse index of CLI log files: timestamp of the first record after every
+LOG_INDEX_INTERVAL bytes mapped to its offset. Entries are sampled by
+seeking to the interval boundaries, so the file is never scanned as a
+whole, and the index is extended as the file grows. Index of the file
+which was replaced (rotated or truncated) is rebuilt
+"""
+
+import bisect
+import json
+import logging
+import os
+
+from configs.cli_logger import LOG_INDEX_INTERVAL, LOG_INDEX_PATH
+from tools.cache import tmp_path_for
+from tools.log_reader import record_timestamp
+from tools.log_rotation import log_segments
+
+
+logger = logging.getLogger(__name__)
+
+HEAD_SIZE = 64
+INDEX_SUFFIX = '.idx.json'
+
+
+class LogIndex:
+    def __init__(self, log_path, index_dir=LOG_INDEX_PATH,
+                 interval=LOG_INDEX_INTERVAL):
+        self.log_path = log_path
+        self.path = os.path.join(
+            index_dir, os.path.basename(log_path) + INDEX_SUFFIX)
+        self.interval = interval
+        self.inode = None
+        self.head = None
+        self.next_boundary = 0
+        self.entries = []  # [timestamp, offset], offsets ascending
+
+    def load(self):
+        try:
+            with open(self.path) as index_file:
+                data = json.load(index_file)
+            self.inode = data['inode']
+            self.head = data['head']
+            self.next_boundary = data['next_boundary']
+            self.entries = data['entries']
+            if data['interval'] != self.interval:
+                self.reset()
+        except (OSError, ValueError, KeyError, TypeError):
+            self.reset()
+
+    def save(self):
+        data = {
+            'inode': self.inode,
+            'head': self.head,
+            'interval': self.interval,
+            'next_boundary': self.next_boundary,
+            'entries': self.entries
+        }
+        tmp_path = tmp_path_for(self.path)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w') as tmp_file:
+                json.dump(data, tmp_file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.debug('Failed to save log index', exc_info=True)
+
+    def reset(self):
+        self.inode = None
+        self.head = None
+        self.next_boundary = 0
+        self.entries = []
+
+    def is_valid_for(self, log_file, stat):
+        if self.inode != stat.st_ino or self.head is None:
+            return False
+        head = bytes.fromhex(self.head)
+        log_file.seek(0)
+        return log_file.read(len(head)) == head and \
+            self.next_boundary <= stat.st_size + self.interval
+
+    def update(self, log_file):
+        """Adds entries for the boundaries the file has grown past"""
+        stat = os.fstat(log_file.fileno())
+        if not self.is_valid_for(log_file, stat):
+            self.reset()
+            self.inode = stat.st_ino
+            log_file.seek(0)
+            self.head = log_file.read(HEAD_SIZE).hex()
+        updated = False
+        while self.next_boundary < stat.st_size:
+            entry = self.sample(log_file, self.next_boundary, stat.st_size)
+            if entry is None:
+                break  # no complete record after the boundary yet
+            if entry and (not self.entries or entry[1] > self.entries[-1][1]):
+                self.entries.append(entry)
+            self.next_boundary += self.interval
+            updated = True
+        return updated
+
+    def sample(self, log_file, boundary, size):
+        """
+        First record after the boundary as [timestamp, offset], empty list
+        if there is none till the next boundary, None if it's not written yet
+        """
+        log_file.seek(boundary)
+        if boundary:
+            log_file.readline()  # boundary is in the middle of a line
+        offset = log_file.tell()
+        limit = min(boundary + self.interval, size)
+        while offset < limit:
+            line = log_file.readline()
+            if not line.endswith(b'\n'):
+                return None
+            timestamp = record_timestamp(line)
+            if timestamp is not None:
+                return [timestamp.decode(), offset]
+            offset += len(line)
+        return None if offset >= size else []
+
+    def find_offset(self, since):
+        """
+        Offset of the last sampled record older than the timestamp,
+        the scan for records since the timestamp starts from it
+        """
+        timestamps = [entry[0] for entry in self.entries]
+        position = bisect.bisect_left(timestamps, since)
+        return self.entries[position - 1][1] if position else 0
+
+
+def open_indexed(log_path, index_dir=LOG_INDEX_PATH,
+                 interval=LOG_INDEX_INTERVAL):
+    """Returns the opened binary log file and its up to date index"""
+    log_file = open(log_path, 'rb')
+    index = LogIndex(log_path, index_dir, interval)
+    index.load()
+    if index.update(log_file):
+        index.save()
+    return log_file, index
+
+
+def prune_indexes(index_dir, log_paths):
+    """Removes indexes of the files which are gone or compressed"""
+    names = {os.path.basename(path) + INDEX_SUFFIX for path in log_paths}
+    try:
+        filenames = os.listdir(index_dir)
+    except FileNotFoundError:
+        return
+    for filename in filenames:
+        if filename.endswith(INDEX_SUFFIX) and filename not in names:
+            try:
+                os.remove(os.path.join(index_dir, filename))
+            except OSError:
+                pass
+
+
+class LogSearch:
+    """
+    Iterates over lines of the matching records in the log and its backups.
+    Scan of each file starts from the indexed offset close to since, offset
+    is where the scan of the live log has stopped
+    """
+
+    def __init__(self, log_path, record_filter, index_dir=LOG_INDEX_PATH,
+                 interval=LOG_INDEX_INTERVAL):
+        self.log_path = log_path
+        self.record_filter = record_filter
+        self.index_dir = index_dir
+        self.interval = interval
+        self.offset = 0
+
+    def __iter__(self):
+        since = self.record_filter.since
+        segments = log_segments(self.log_path)
+        prune_indexes(self.index_dir, [
+            segment.path for segment in segments if not segment.compressed
+        ] + [self.log_path])
+        for segment in segments:
+            if since is not None and segment.end is not None and \
+                    segment.end < since:
+                continue
+            if segment.compressed:
+                # compressed segments are not seekable, so not indexed
+                with segment.open() as segment_file:
+                    yield from self.record_filter.filter(segment_file)
+            else:
+                yield from self.search_file(segment.path)
+            if self.record_filter.done:
+                return
+        yield from self.search_file(self.log_path, live=True)
+
+    def search_file(self, path, live=False):
+        since = self.record_filter.since
+        try:
+            log_file, index = open_indexed(path, self.index_dir,
+                                           self.interval)
+        except FileNotFoundError:
+            return  # compressed or removed during the search
+        with log_file:
+            log_file.seek(index.find_offset(since.decode()) if since else 0)
+            yield from self.record_filter.filter(iter(log_file.readline, b''))
+            if live:
+                self.offset = log_file.tell()
@@ -0,0 +1,193 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Bounded-memory readers of CLI log files: the last lines are found by
+reading the file backwards in blocks, records are streamed line by line
+and the file is followed by polling, reopening it after rotation
+"""
+
+import os
+import re
+import time
+from datetime import datetime, timedelta
+
+from configs.cli_logger import LOG_FOLLOW_INTERVAL, LOG_READ_BLOCK_SIZE
+
+
+# asctime of configs.cli_logger.LOG_FORMAT or JsonFormatter, local time
+TIMESTAMP_RE = re.compile(
+    rb'(?:\{"time": ")?(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIME_FORMATS = (TIMESTAMP_FORMAT, '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M',
+                '%Y-%m-%d')
+RELATIVE_TIME_RE = re.compile(r'^(\d+)([smhd])$')
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+LEVEL_RE = re.compile(
+    rb'(?: - |"level": ")(DEBUG|INFO|WARNING|ERROR|CRITICAL)(?: - |")')
+TIME_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+
+def parse_time(value, now=None):
+    """Absolute local time or relative one like 30s, 15m, 2h, 1d ago"""
+    match = RELATIVE_TIME_RE.match(value.strip())
+    if match:
+        delta = timedelta(**{TIME_UNITS[match.group(2)]: int(match.group(1))})
+        return (now or datetime.now()) - delta
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), time_format)
+        except ValueError:
+            pass
+    raise ValueError(f'Expected time like "2021-04-01 10:00:00" or 15m, '
+                     f'got {value}')
+
+
+def tail_offset(log_file, lines, block_size=LOG_READ_BLOCK_SIZE):
+    """Offset where the last `lines` lines of the binary file start"""
+    end = log_file.seek(0, os.SEEK_END)
+    if lines <= 0 or end == 0:
+        return end
+    log_file.seek(end - 1)
+    # newline at the end terminates the last line, it doesn't start one
+    position = end - 1 if log_file.read(1) == b'\n' else end
+    found = 0
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        log_file.seek(position)
+        block = log_file.read(size)
+        index = len(block)
+        while True:
+            index = block.rfind(b'\n', 0, index)
+            if index < 0:
+                break
+            found += 1
+            if found == lines:
+                return position + index + 1
+    return 0
+
+
+def record_timestamp(line):
+    """asctime of the record as sortable bytes, None for continuation lines"""
+    match = TIMESTAMP_RE.match(line)
+    return match.group(1) if match else None
+
+
+class RecordFilter:
+    """
+    Selects records by time range, minimal level and regex pattern. Lines
+    are grouped into records, so tracebacks go with their record. Records
+    are expected in time order: the first one newer than until ends the scan
+    """
+
+    def __init__(self, since=None, until=None, level=None, pattern=None):
+        self.since = format_timestamp(since)
+        self.until = format_timestamp(until)
+        self.min_level = LEVELS.index(level.upper()) if level else None
+        self.pattern = re.compile(pattern.encode()) if pattern else None
+        self.done = False
+
+    @property
+    def is_empty(self):
+        return self.since is None and self.until is None and \
+            self.min_level is None and self.pattern is None
+
+    def matches(self, record):
+        timestamp = record_timestamp(record[0])
+        if timestamp is None:
+            # tail of the record which started in the previous file
+            if self.since is not None or self.min_level is not None:
+                return False
+        else:
+            if self.until is not None and timestamp > self.until:
+                self.done = True
+                return False
+            if self.since is not None and timestamp < self.since:
+                return False
+            if self.min_level is not None:
+                match = LEVEL_RE.search(record[0])
+                if not match or LEVELS.index(
+                        match.group(1).decode()) < self.min_level:
+                    return False
+        return self.pattern is None or \
+            any(self.pattern.search(line) for line in record)
+
+    def filter(self, lines):
+        """Yields lines of the matching records, None flushes the record"""
+        record = []
+        for line in lines:
+            if line is not None and (
+                    not record or record_timestamp(line) is None):
+                record.append(line)
+                continue
+            if record and self.matches(record):
+                yield from record
+            if self.done:
+                return
+            record = [line] if line is not None else []
+        if record and self.matches(record):
+            yield from record
+
+
+def format_timestamp(value):
+    return value.strftime(TIMESTAMP_FORMAT).encode() if value else None
+
+
+def is_replaced(path, log_file):
+    """True if the file was rotated (or truncated) under the open handle"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return False  # rollover is in progress, new file isn't created yet
+    return stat.st_ino != os.fstat(log_file.fileno()).st_ino or \
+        stat.st_size < log_file.tell()
+
+
+def follow(path, offset=0, interval=LOG_FOLLOW_INTERVAL, sleep=time.sleep,
+           yield_idle=False):
+    """
+    Yields complete lines appended to the file after offset. When the file
+    is rotated the rest of the old one is read before switching to the new.
+    If yield_idle is set None is yielded each time there is no new data
+    """
+    log_file = open(path, 'rb')
+    log_file.seek(offset)
+    pending = b''
+    try:
+        while True:
+            line = log_file.readline()
+            if line:
+                pending += line
+                if pending.endswith(b'\n'):
+                    yield pending
+                    pending = b''
+                continue
+            if is_replaced(path, log_file):
+                if pending:
+                    yield pending + b'\n'
+                    pending = b''
+                log_file.close()
+                log_file = open(path, 'rb')
+                continue
+            if yield_idle:
+                yield None
+            sleep(interval)
+    finally:
+        log_file.close()
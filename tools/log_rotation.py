@@ -0,0 +1,281 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Size-budgeted rotation of CLI logs. On rollover the log is renamed into a
+segment named by the rollover time (node-cli.log.20210401-100000), which
+is compressed by a detached process, so it's neither waited for nor
+killed when the command exits. On every rollover the oldest segments are
+removed to keep LOG_BACKUP_COUNT of them within LOG_BACKUPS_MAX_BYTES,
+the newest one is always kept. Compressed file is written into a temporary
+file and renamed, so segments left uncompressed by a killed process are
+compressed by the next one
+"""
+
+import fcntl
+import gzip
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from configs.cli_logger import (LOG_BACKUP_COUNT, LOG_BACKUPS_MAX_BYTES,
+                                LOG_COMPRESSION, LOG_FILE_SIZE_BYTES)
+
+
+SEGMENT_TIME_FORMAT = '%Y%m%d-%H%M%S'
+SEGMENT_RE = re.compile(r'^\.(\d{8}-\d{6})(?:-(\d+))?(\.gz|\.zst)?$')
+NUMBERED_RE = re.compile(r'^\.(\d+)$')  # backups of RotatingFileHandler
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class Segment:
+    def __init__(self, path, order, compressed):
+        self.path = path
+        self.order = order
+        self.compressed = compressed
+
+    @property
+    def end(self):
+        """Rollover time as log timestamp bytes, records aren't newer"""
+        if not self.order[0]:
+            return None
+        rollover = time.strptime(self.order[0], SEGMENT_TIME_FORMAT)
+        return time.strftime('%Y-%m-%d %H:%M:%S', rollover).encode()
+
+    def open(self):
+        """Binary file-like object over decompressed records"""
+        if self.path.endswith('.gz'):
+            return gzip.open(self.path, 'rb')
+        if self.path.endswith('.zst'):
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(
+                open(self.path, 'rb'), closefd=True)
+        return open(self.path, 'rb')
+
+
+def log_segments(log_path):
+    """Rotated segments of the log, the oldest first"""
+    directory, name = os.path.split(log_path)
+    segments = []
+    for filename in os.listdir(directory or '.'):
+        if not filename.startswith(name) or filename.endswith('.tmp'):
+            continue
+        suffix = filename[len(name):]
+        path = os.path.join(directory, filename)
+        numbered = NUMBERED_RE.match(suffix)
+        if numbered:
+            # older than any timestamped segment, .1 is the newest of them
+            order = ('', -int(numbered.group(1)))
+            segments.append(Segment(path, order, False))
+            continue
+        match = SEGMENT_RE.match(suffix)
+        if match:
+            order = (match.group(1), int(match.group(2) or 0))
+            segments.append(Segment(path, order, bool(match.group(3))))
+    segments.sort(key=lambda segment: segment.order)
+    return segments
+
+
+def compress_file(source, destination, compression=LOG_COMPRESSION):
+    tmp_path = f'{destination}.{os.getpid()}.tmp'
+    try:
+        with open(source, 'rb') as source_file, \
+                open(tmp_path, 'wb') as tmp_file:
+            if compression == 'zstd':
+                import zstandard
+                with zstandard.ZstdCompressor().stream_writer(
+                        tmp_file, closefd=False) as writer:
+                    shutil.copyfileobj(source_file, writer, COPY_BUFFER_SIZE)
+            else:
+                with gzip.GzipFile(fileobj=tmp_file, mode='wb',
+                                   mtime=0) as writer:
+                    shutil.copyfileobj(source_file, writer, COPY_BUFFER_SIZE)
+        os.replace(tmp_path, destination)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    os.remove(source)
+
+
+def usable_compression(compression):
+    if compression == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            return 'gzip'
+    return compression
+
+
+@contextmanager
+def compression_lock(log_path):
+    """Yields True if the lock is taken, False if another process holds it"""
+    with open(log_path + '.lock', 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        yield True
+
+
+def detach_std_fds(keep_fd):
+    """Detached process must not hold the caller's streams and sockets"""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    max_fd = os.sysconf('SC_OPEN_MAX')
+    os.closerange(3, keep_fd)
+    os.closerange(keep_fd + 1, max_fd)
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, filename, max_bytes=LOG_FILE_SIZE_BYTES,
+                 backup_count=LOG_BACKUP_COUNT,
+                 max_backups_bytes=LOG_BACKUPS_MAX_BYTES,
+                 compression=LOG_COMPRESSION, delay=False):
+        super().__init__(filename, maxBytes=max_bytes,
+                         backupCount=backup_count, delay=delay)
+        self.max_backups_bytes = max_backups_bytes
+        self.compression = usable_compression(compression)
+        # read ends of pipes closed by the compressing processes on exit
+        self.workers = []
+        with compression_lock(self.baseFilename) as locked:
+            if not locked:
+                return  # another process is compressing the segments
+            self.remove_stale_tmp_files()
+        self.remove_outdated()
+        if self.has_uncompressed():
+            self.schedule_compression()
+
+    def has_uncompressed(self):
+        return any(not segment.compressed and segment.order[0]
+                   for segment in log_segments(self.baseFilename))
+
+    def segment_path(self):
+        base = f'{self.baseFilename}.{time.strftime(SEGMENT_TIME_FORMAT)}'
+        path, number = base, 0
+        suffix = COMPRESSED_SUFFIXES[self.compression]
+        while os.path.exists(path) or os.path.exists(path + suffix):
+            number += 1
+            path = f'{base}-{number}'
+        return path
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, self.segment_path())
+            self.remove_outdated()
+            self.schedule_compression()
+        if not self.delay:
+            self.stream = self._open()
+
+    def schedule_compression(self):
+        """
+        Forks twice, so the compressing process is detached from the
+        command and its parent isn't left with a zombie
+        """
+        read_fd, write_fd = os.pipe()
+        try:
+            pid = os.fork()
+        except OSError:
+            os.close(read_fd)
+            os.close(write_fd)
+            return  # the next process compresses them
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                os.setsid()
+                if os.fork() == 0:
+                    detach_std_fds(write_fd)
+                    self.compress_segments()
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        self.workers.append(read_fd)
+
+    def compress_segments(self):
+        """Segments rotated while it was compressing are compressed too"""
+        with compression_lock(self.baseFilename) as locked:
+            if not locked:
+                return  # another process is compressing them
+            self.remove_stale_tmp_files()
+            suffix = COMPRESSED_SUFFIXES[self.compression]
+            while self.has_uncompressed():
+                for segment in log_segments(self.baseFilename):
+                    if not segment.compressed and segment.order[0]:
+                        try:
+                            compress_file(segment.path,
+                                          segment.path + suffix,
+                                          self.compression)
+                        except FileNotFoundError:
+                            pass  # removed as outdated
+            self.remove_outdated()
+
+    def remove_stale_tmp_files(self):
+        """Left by processes killed while compressing"""
+        directory, name = os.path.split(self.baseFilename)
+        for filename in os.listdir(directory or '.'):
+            if filename.startswith(name) and filename.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(directory, filename))
+                except OSError:
+                    pass
+
+    def remove_outdated(self):
+        """
+        Keeps the newest segments within the count and bytes budget, the
+        newest one even if it's bigger than the budget
+        """
+        kept, kept_bytes = 0, 0
+        for segment in reversed(log_segments(self.baseFilename)):
+            try:
+                size = os.path.getsize(segment.path)
+            except OSError:
+                continue
+            if kept == 0 or kept < self.backupCount and \
+                    kept_bytes + size <= self.max_backups_bytes:
+                kept += 1
+                kept_bytes += size
+                continue
+            try:
+                os.remove(segment.path)
+            except OSError:
+                pass
+
+    def wait(self):
+        """Waits for the compressing processes started by this handler"""
+        while self.workers:
+            read_fd = self.workers.pop()
+            while os.read(read_fd, 1024):
+                pass
+            os.close(read_fd)
+
+    def close(self):
+        """Compressing processes are left running"""
+        for read_fd in self.workers:
+            os.close(read_fd)
+        self.workers = []
+        super().close()
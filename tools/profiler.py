@@ -0,0 +1,287 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Opt-in profiling of a CLI run, enabled by SKALE_CLI_PROFILE environment
+variable: 1 records per-phase timings, full also collects cProfile stats,
+import-time tree and tracemalloc peak. Report is printed to stderr and
+saved into PROFILE_DATA_PATH when the process exits. Must stay cheap to
+import, it's imported before everything else by main.py
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from configs import PROFILE_ENV_VAR
+from configs.cli_logger import PROFILE_DATA_PATH, PROFILE_KEEP
+
+
+PROCESS_START = time.perf_counter()
+
+TIMINGS = 'timings'
+FULL = 'full'
+MODES = {'1': TIMINGS, TIMINGS: TIMINGS, FULL: FULL}
+
+PHASES = ('import', 'logger_init', 'config', 'texts', 'http', 'render',
+          'command', 'total')
+
+_profile = None
+
+
+class ImportTracer:
+    """
+    Records the same tree as python -X importtime (which is not available
+    in the frozen executable): self and cumulative time of each module
+    loaded by the installing thread
+    """
+
+    def __init__(self):
+        self.records = []
+        self.stack = [0.0]
+        self.thread_id = threading.get_ident()
+        self.original = None
+
+    def install(self):
+        self.original = builtins.__import__
+        builtins.__import__ = self.traced_import
+
+    def uninstall(self):
+        if self.original is not None:
+            builtins.__import__ = self.original
+            self.original = None
+
+    def traced_import(self, name, globals=None, locals=None, fromlist=(),
+                      level=0):
+        if level or name in sys.modules or \
+                threading.get_ident() != self.thread_id:
+            return self.original(name, globals, locals, fromlist, level)
+        depth = len(self.stack)
+        self.stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self.stack.pop()
+            self.stack[-1] += elapsed
+            self.records.append((depth, name, elapsed - children, elapsed))
+
+    def format(self):
+        lines = ['import time: self [us] | cumulative | imported package']
+        for depth, name, self_time, cumulative in self.records:
+            lines.append(f'import time: {self_time * 1e6:9.0f} | '
+                         f'{cumulative * 1e6:10.0f} | '
+                         f'{"  " * (depth - 1)}{name}')
+        return '\n'.join(lines) + '\n'
+
+
+class Profile:
+    def __init__(self, mode=TIMINGS, start=PROCESS_START,
+                 data_path=PROFILE_DATA_PATH):
+        self.mode = mode
+        self.start = start
+        self.data_path = data_path
+        self.phases = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.profiler = None
+        self.import_tracer = None
+        self.malloc_peak = None
+        self.finished = False
+
+    def run(self):
+        if self.mode == FULL:
+            import cProfile
+            import tracemalloc
+            tracemalloc.start()
+            self.import_tracer = ImportTracer()
+            self.import_tracer.install()
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Nested phases with the same name are counted once"""
+        active = self.local.__dict__.setdefault('active', set())
+        if name in active:
+            yield
+            return
+        active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            active.discard(name)
+            self.add(name, time.perf_counter() - start)
+
+    def summary(self):
+        self.phases['total'] = time.perf_counter() - self.start
+        phases = {
+            name: round(self.phases[name] * 1000, 3)
+            for name in sorted(self.phases, key=phase_order)
+        }
+        summary = {
+            'argv': sys.argv,
+            'mode': self.mode,
+            'phases_ms': phases
+        }
+        try:
+            import resource
+            summary['max_rss_kb'] = \
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            pass
+        if self.malloc_peak is not None:
+            summary['tracemalloc_peak_bytes'] = self.malloc_peak
+        return summary
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+        if self.import_tracer:
+            self.import_tracer.uninstall()
+        if self.mode == FULL:
+            import tracemalloc
+            self.malloc_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def finish(self, out=None):
+        if self.finished:
+            return
+        self.finished = True
+        self.stop()
+        summary = self.summary()
+        print_summary(summary, out or sys.stderr)
+        try:
+            self.save(summary)
+        except OSError as err:
+            print(f'Failed to save profile: {err}', file=out or sys.stderr)
+
+    def save(self, summary, pid=None):
+        os.makedirs(self.data_path, exist_ok=True)
+        prefix = profile_prefix(pid or os.getpid(), self.data_path)
+        with open(prefix + '.json', 'w') as summary_file:
+            json.dump(summary, summary_file, indent=4)
+        if self.profiler:
+            self.profiler.dump_stats(prefix + '.prof')
+        if self.import_tracer:
+            with open(prefix + '.imports.txt', 'w') as imports_file:
+                imports_file.write(self.import_tracer.format())
+        prune_profiles(self.data_path)
+
+
+def phase_order(name):
+    return PHASES.index(name) if name in PHASES else len(PHASES) - 1
+
+
+def profile_prefix(pid, data_path=PROFILE_DATA_PATH):
+    return os.path.join(data_path, f'profile-{pid}')
+
+
+def prune_profiles(data_path=PROFILE_DATA_PATH, keep=PROFILE_KEEP):
+    """Keeps files of the last `keep` profiled runs"""
+    runs = {}
+    for filename in os.listdir(data_path):
+        run = filename.split('.', 1)[0]
+        path = os.path.join(data_path, filename)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        paths, latest = runs.get(run, ([], 0))
+        runs[run] = paths + [path], max(latest, mtime)
+    outdated = sorted(runs.values(), key=lambda item: item[1])[:-keep]
+    for paths, _ in outdated:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def print_summary(summary, out):
+    lines = [f'{name:<12} {ms:10.1f} ms'
+             for name, ms in summary['phases_ms'].items()]
+    if 'max_rss_kb' in summary:
+        lines.append(f'{"max_rss":<12} {summary["max_rss_kb"] / 1024:10.1f} MiB')
+    if 'tracemalloc_peak_bytes' in summary:
+        peak = summary['tracemalloc_peak_bytes'] / 1024 / 1024
+        lines.append(f'{"malloc_peak":<12} {peak:10.1f} MiB')
+    out.write('Profile:\n' + '\n'.join(lines) + '\n')
+
+
+def enable(mode=TIMINGS, start=PROCESS_START):
+    global _profile
+    if _profile is None:
+        import atexit
+        _profile = Profile(mode, start)
+        _profile.run()
+        atexit.register(_profile.finish)
+    return _profile
+
+
+def enable_from_env():
+    mode = MODES.get(os.environ.get(PROFILE_ENV_VAR, '').lower())
+    if mode:
+        enable(mode)
+
+
+def get_profile():
+    return _profile
+
+
+def add(name, seconds):
+    if _profile is not None:
+        _profile.add(name, seconds)
+
+
+@contextmanager
+def phase(name):
+    if _profile is None:
+        yield
+        return
+    with _profile.phase(name):
+        yield
+
+
+def timed(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def instrument(namespace, prefix, name):
+    """Times functions from the module namespace which names start with prefix"""
+    if _profile is None:
+        return
+    for attr, value in list(namespace.items()):
+        if attr.startswith(prefix) and callable(value):
+            namespace[attr] = timed(name, value)
@@ -0,0 +1,98 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Waits until every component reports it's ready. Lagging components are
+probed again with exponentially growing intervals till the overall
+deadline, ready ones aren't probed anymore. The report tells how long
+each component took and what the lagging ones were doing at the end
+"""
+
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class Check:
+    """
+    Probe returns (ready, state), where state is a short description
+    shown while the component is lagging. Exception means not ready
+    """
+
+    def __init__(self, name, probe):
+        self.name = name
+        self.probe = probe
+        self.state = 'not checked'
+
+    def run(self):
+        try:
+            ready, state = self.probe()
+        except Exception as err:
+            logger.debug(f'{self.name} probe failed', exc_info=True)
+            ready, state = False, str(err) or type(err).__name__
+        if state != self.state:
+            logger.info(f'{self.name}: {state}')
+        self.state = state
+        return ready
+
+
+class ReadinessReport:
+    def __init__(self):
+        self.ready = {}
+        self.lagging = {}
+        self.elapsed = 0
+
+    @property
+    def ok(self):
+        return not self.lagging
+
+    def describe_lagging(self):
+        return ', '.join(f'{name} ({state})'
+                         for name, state in self.lagging.items())
+
+
+def wait_ready(checks, timeout, initial_interval=0.5, max_interval=5,
+               clock=time.monotonic, sleep=time.sleep):
+    report = ReadinessReport()
+    start = clock()
+    deadline = start + timeout
+    pending = list(checks)
+    interval = initial_interval
+    while True:
+        for check in list(pending):
+            if check.run():
+                report.ready[check.name] = clock() - start
+                pending.remove(check)
+        remaining = deadline - clock()
+        if not pending or remaining <= 0:
+            break
+        sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+    report.lagging = {check.name: check.state for check in pending}
+    report.elapsed = clock() - start
+    if report.ok:
+        logger.info(f'Ready in {report.elapsed:.1f}s: ' + ', '.join(
+            f'{name} {elapsed:.1f}s'
+            for name, elapsed in report.ready.items()))
+    else:
+        logger.warning(f'Not ready after {report.elapsed:.1f}s: '
+                       f'{report.describe_lagging()}')
+    return report
@@ -0,0 +1,286 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Resident CLI process. It imports command modules and heavy libraries
+once, then forks a child for every command sent by the thin client, so
+commands start warm but can't leak state (env, cwd, globals) into each
+other. Process exits after being idle for idle_timeout seconds
+"""
+
+import array
+import fcntl
+import importlib
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+import click
+
+from cli.info import VERSION
+from configs import RESIDENT_IDLE_TIMEOUT, RESIDENT_SOCKET_PATH
+from tools.helper import exit_code_of, log_synchronously
+from tools.resident_client import (ENV_KEYS, ENV_MISMATCH, STD_FDS,
+                                   VERSION_MISMATCH)
+
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1
+MAX_REQUEST_SIZE = 1024 * 1024
+WARM_MODULES = (
+    'docker', 'psutil', 'jinja2', 'requests', 'dateutil.parser', 'texttable',
+    'terminaltables', 'dotenv', 'readsettings', 'yaml'
+)
+
+
+class ResidentError(Exception):
+    pass
+
+
+def read_request(conn):
+    """Returns request and file descriptors sent along with it"""
+    fds = array.array('i')
+    data, ancdata, _, _ = conn.recvmsg(
+        65536, socket.CMSG_SPACE(len(STD_FDS) * fds.itemsize))
+    for level, kind, fd_data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(fd_data[:len(fd_data) - len(fd_data) % fds.itemsize])
+    while data and not data.endswith(b'\n'):
+        if len(data) > MAX_REQUEST_SIZE:
+            raise ValueError('Request is too large')
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data.decode('utf-8')), list(fds)
+
+
+def reply(conn, message):
+    try:
+        conn.sendall(json.dumps(message).encode('utf-8') + b'\n')
+    except OSError:
+        logger.debug('Failed to reply to resident client', exc_info=True)
+
+
+def reopen_std_streams():
+    """Streams of the resident process point to /dev/null, rebind them"""
+    sys.stdin = os.fdopen(0, 'r', closefd=False)
+    buffering = 1 if os.isatty(1) else -1
+    sys.stdout = os.fdopen(1, 'w', buffering=buffering, closefd=False)
+    sys.stderr = os.fdopen(2, 'w', buffering=1, closefd=False)
+
+
+def watch_interrupts(conn, done):
+    """Client sends a byte on Ctrl-C and closes connection if killed"""
+    try:
+        conn.recv(1)
+    except OSError:
+        pass
+    if not done.is_set():
+        os.kill(os.getpid(), signal.SIGINT)
+
+
+class ResidentServer:
+    def __init__(self, command, socket_path=RESIDENT_SOCKET_PATH,
+                 idle_timeout=RESIDENT_IDLE_TIMEOUT):
+        self.command = command
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.listener = None
+        self.lock_file = None
+        self.children = set()
+        self.running = False
+        self.started_at = time.time()
+        self.last_active = time.monotonic()
+
+    def warm_up(self):
+        with click.Context(self.command) as ctx:
+            for name in self.command.list_commands(ctx):
+                self.command.get_command(ctx, name)
+        for module in WARM_MODULES:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                logger.debug(f'{module} is not available')
+        from tools.api_client import get_api_client
+        from tools.texts import get_texts
+        get_texts()
+        get_api_client()
+
+    def bind(self):
+        self.lock_file = open(f'{self.socket_path}.lock', 'w')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.lock_file.close()
+            raise ResidentError('Resident process is already running')
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)  # left by killed process
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self.listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        self.listener.listen(16)
+
+    def unbind(self):
+        if self.listener is None:
+            return
+        self.listener.close()
+        self.listener = None
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+        self.lock_file.close()
+
+    def serve_forever(self):
+        self.bind()
+        self.warm_up()
+        logger.info(f'Resident process {os.getpid()} is listening on '
+                    f'{self.socket_path}')
+        self.running = True
+        try:
+            while self.running:
+                self.reap_children()
+                if self.is_idle():
+                    logger.info('Resident process is idle, exiting')
+                    break
+                readable, _, _ = select.select([self.listener], [], [],
+                                               POLL_INTERVAL)
+                if readable:
+                    conn, _ = self.listener.accept()
+                    self.last_active = time.monotonic()
+                    with conn:
+                        self.handle(conn)
+        finally:
+            self.unbind()
+
+    def is_idle(self):
+        return not self.children and \
+            time.monotonic() - self.last_active > self.idle_timeout
+
+    def reap_children(self):
+        for pid in list(self.children):
+            try:
+                reaped, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                reaped = pid
+            if reaped:
+                self.children.discard(pid)
+                self.last_active = time.monotonic()
+
+    def handle(self, conn):
+        fds = []
+        try:
+            request, fds = read_request(conn)
+            self.dispatch(conn, request, fds)
+        except (OSError, ValueError, KeyError):
+            logger.exception('Failed to handle resident request')
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def dispatch(self, conn, request, fds):
+        command = request.get('command')
+        if command == 'stop':
+            self.running = False
+            reply(conn, {'status': 'stopped'})
+        elif command == 'status':
+            reply(conn, self.status())
+        elif request['version'] != VERSION:
+            logger.info(f'Client version {request["version"]} differs '
+                        f'from {VERSION}, exiting')
+            self.running = False
+            self.unbind()
+            reply(conn, {'error': VERSION_MISMATCH})
+        elif any(request['env'].get(key) != os.environ.get(key)
+                 for key in ENV_KEYS):
+            reply(conn, {'error': ENV_MISMATCH})
+        elif len(fds) != len(STD_FDS):
+            raise ValueError('Standard streams were not passed')
+        else:
+            self.fork_command(conn, request, fds)
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'version': VERSION,
+            'uptime': int(time.time() - self.started_at),
+            'running_commands': len(self.children)
+        }
+
+    def fork_command(self, conn, request, fds):
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+        exit_code = 1
+        try:
+            self.listener.close()
+            self.lock_file.close()
+            log_synchronously()
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            for target, fd in zip(STD_FDS, fds):
+                os.dup2(fd, target)
+            reopen_std_streams()
+            exit_code = self.run_command(conn, request)
+        finally:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+            reply(conn, {'exit_code': exit_code})
+            os._exit(0)
+
+    def run_command(self, conn, request):
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        argv = request['argv']
+        sys.argv = argv
+        logger.info(f'cmd: {" ".join(str(x) for x in argv)}, resident')
+        done = threading.Event()
+        threading.Thread(target=watch_interrupts, args=(conn, done),
+                         daemon=True).start()
+        try:
+            self.command.main(args=argv[1:],
+                              prog_name=os.path.basename(argv[0]))
+        except SystemExit as exc:
+            return exit_code_of(exc.code)
+        except Exception as err:
+            print(f'Command execution failed with {err}. '
+                  'Recheck your inputs')
+            traceback.print_exc()
+            logger.error(err)
+            return 0
+        finally:
+            done.set()
+        return 0
@@ -0,0 +1,169 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Thin client of the resident CLI process. It's imported before anything
+else by main.py, so it must stay free of heavy imports. Client passes its
+stdin, stdout and stderr to the resident process along with argv, env and
+cwd, so the command reads and writes the caller's terminal directly
+"""
+
+import array
+import json
+import os
+import socket
+import sys
+import time
+
+from cli.info import VERSION
+from configs import (RESIDENT_ENV_VAR, RESIDENT_SOCKET_PATH,
+                     RESIDENT_SPAWN_TIMEOUT)
+
+
+STD_FDS = (0, 1, 2)
+SPAWN_POLL_INTERVAL = 0.02
+INTERRUPT = b'i'
+# resident process must run with the same import-time configuration
+ENV_KEYS = ('HOME', 'HOME_DIR', 'CONFIG_FILEPATH', 'ADMIN_SOCKET_PATH')
+VERSION_MISMATCH = 'version'
+ENV_MISMATCH = 'env'
+
+
+class ResidentUnavailable(Exception):
+    pass
+
+
+def connect(socket_path=RESIDENT_SOCKET_PATH):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise ResidentUnavailable(f'Nothing listens on {socket_path}')
+    return sock
+
+
+def send_message(sock, message, fds=()):
+    data = json.dumps(message).encode('utf-8') + b'\n'
+    ancdata = []
+    if fds:
+        ancdata = [(socket.SOL_SOCKET, socket.SCM_RIGHTS,
+                    array.array('i', fds).tobytes())]
+    sent = sock.sendmsg([data], ancdata)
+    if sent < len(data):
+        sock.sendall(data[sent:])
+
+
+def read_line(sock, data=b''):
+    while not data.endswith(b'\n'):
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ResidentUnavailable('Resident process closed connection')
+        data += chunk
+    return json.loads(data.decode('utf-8'))
+
+
+def read_response(sock):
+    """Waits for the response, Ctrl-C is forwarded to the command"""
+    while True:
+        try:
+            return read_line(sock)
+        except KeyboardInterrupt:
+            sock.sendall(INTERRUPT)
+
+
+def compose_spawn_cmd(argv):
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, 'resident', 'serve']
+    return [sys.executable, os.path.abspath(argv[0]), 'resident', 'serve']
+
+
+def spawn(argv, socket_path=RESIDENT_SOCKET_PATH,
+          timeout=RESIDENT_SPAWN_TIMEOUT):
+    import subprocess
+    env = dict(os.environ)
+    env.pop(RESIDENT_ENV_VAR, None)
+    subprocess.Popen(
+        compose_spawn_cmd(argv), env=env, start_new_session=True,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return connect(socket_path)
+        except ResidentUnavailable:
+            time.sleep(SPAWN_POLL_INTERVAL)
+    raise ResidentUnavailable(f'Resident process did not start in {timeout}s')
+
+
+def compose_request(argv):
+    return {
+        'version': VERSION,
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'env': dict(os.environ)
+    }
+
+
+def forward(argv, socket_path=RESIDENT_SOCKET_PATH):
+    """
+    Runs the command in the resident process, spawns it if needed.
+    Returns exit code or None if the command should be run locally
+    """
+    for attempt in range(2):
+        try:
+            sock = connect(socket_path)
+        except ResidentUnavailable:
+            try:
+                sock = spawn(argv, socket_path)
+            except ResidentUnavailable:
+                return None
+        with sock:
+            try:
+                send_message(sock, compose_request(argv), STD_FDS)
+            except OSError:
+                return None
+            try:
+                response = read_response(sock)
+            except (OSError, ValueError, ResidentUnavailable) as err:
+                # command may have been started, it must not run twice
+                print(f'Resident command failed: {err}', file=sys.stderr)
+                return 1
+        if response.get('error') == VERSION_MISMATCH:
+            continue  # outdated resident process exits, spawn a new one
+        if response.get('error'):
+            return None
+        return response['exit_code']
+    return None
+
+
+def run_resident(argv):
+    """Exits with the command exit code unless it has to be run locally"""
+    if len(argv) > 1 and argv[1] == 'resident':
+        return
+    exit_code = forward(argv)
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+
+def send_control(command, socket_path=RESIDENT_SOCKET_PATH):
+    with connect(socket_path) as sock:
+        send_message(sock, {'command': command})
+        return read_line(sock)
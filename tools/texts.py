@@ -1,26 +1,111 @@
 #   -*- coding: utf-8 -*-
 #
 #   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
 #   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 #   GNU Affero General Public License for more details.
 #
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import yaml
-from configs import TEXT_FILE
+
+"""
+Process-wide text catalog. text.yml is parsed on the first access only,
+parsed catalog is kept in the marshal cache next to the file (bundled
+into the executable by build.sh) and reused while the yml hash matches
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import threading
+
+from configs import TEXT_CACHE_FILE, TEXT_FILE
+from tools import profiler
+
+
+logger = logging.getLogger(__name__)
+
+_texts = None
+_texts_lock = threading.Lock()
+
+
+def cache_key(source):
+    """Marshal format depends on the interpreter, so it's a part of the key"""
+    digest = hashlib.sha256(source).hexdigest()
+    return f'{digest}:{sys.implementation.cache_tag}:{marshal.version}'
+
+
+def read_cache(cache_path, key):
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cached_key, texts = marshal.load(cache_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return texts if cached_key == key else None
+
+
+def write_cache(cache_path, key, texts):
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as tmp_file:
+            marshal.dump((key, texts), tmp_file)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        logger.debug('Failed to save texts cache', exc_info=True)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def parse_texts(source):
+    import yaml
+    try:
+        return yaml.safe_load(source)
+    except yaml.YAMLError as exc:
+        print(exc)
+
+
+def load_texts(path=TEXT_FILE, cache_path=TEXT_CACHE_FILE):
+    with open(path, 'rb') as text_file:
+        source = text_file.read()
+    key = cache_key(source)
+    texts = read_cache(cache_path, key)
+    if texts is None:
+        texts = parse_texts(source)
+        if texts is not None:
+            write_cache(cache_path, key, texts)
+    return texts
+
+
+def get_texts():
+    global _texts
+    with _texts_lock:
+        if _texts is None:
+            with profiler.phase('texts'):
+                _texts = load_texts()
+        return _texts
 
 
 class Texts():
-    def __init__(self):
-        self._texts = self._load()
+    """View of the process-wide catalog, texts are loaded on first lookup"""
 
     def __getitem__(self, key):
-        return self._texts.get(key)
-
-    def _load(self):
-        with open(TEXT_FILE, 'r') as stream:
-            try:
-                return yaml.safe_load(stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        return get_texts().get(key)
+
+
+if __name__ == '__main__':
+    load_texts()
+    print(f'Texts cache is saved to {TEXT_CACHE_FILE}')
@@ -0,0 +1,116 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of node-cli
+#
+#   Copyright (C) 2021 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import socket
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from tools.api_stats import add_timing
+from tools.content_decoding import DecodingHTTPResponse
+
+
+UNIX_SCHEME = 'http+unix://'
+UNIX_PROBE_TIMEOUT = 0.1
+
+
+def is_socket_listening(path, timeout=UNIX_PROBE_TIMEOUT):
+    """
+    Socket file is left behind when skale-admin stops, so only a successful
+    connect tells that somebody is listening on it
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class UnixSocketConnection(HTTPConnection):
+    def __init__(self, socket_path, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.socket_path = socket_path
+
+    def connect(self):
+        """Failures are raised as by TCP connections, as connect errors"""
+        start = time.perf_counter()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except socket.timeout:
+            sock.close()
+            raise ConnectTimeoutError(
+                self, f'Connection to {self.socket_path} timed out')
+        except OSError as err:
+            sock.close()
+            raise NewConnectionError(
+                self, f'Failed to establish a new connection: {err}')
+        self.sock = sock
+        add_timing('connect', time.perf_counter() - start)
+
+
+class UnixSocketConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixSocketConnection
+    ResponseCls = DecodingHTTPResponse
+
+    def __init__(self, socket_path, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        self.num_connections += 1
+        return self.ConnectionCls(
+            self.socket_path,
+            timeout=self.timeout.connect_timeout
+        )
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """
+    Sends every request mounted on http+unix:// to the single keep-alive
+    connection pool of the unix socket, host part of the url is ignored
+    """
+
+    def __init__(self, socket_path, pool_maxsize=10, max_retries=0):
+        self.socket_path = socket_path
+        self.pool = UnixSocketConnectionPool(socket_path, maxsize=pool_maxsize)
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize,
+                         max_retries=max_retries)
+
+    def get_connection(self, url, proxies=None):
+        return self.pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None,
+                                        cert=None):
+        return self.pool
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        self.pool.close()
+        super().close()